@@ -99,7 +99,8 @@ def dashboard_view(request):
     
     # Get real data
     total_vehicles = Vehicle.objects.count()
-    available_vehicles = Vehicle.objects.filter(status='available').count()
+    # Same set as vehicles:api_available_vehicles, which keeps this figure live
+    available_vehicles = Vehicle.objects.filter(status='available', is_active=True).count()
     on_trip_vehicles = Vehicle.objects.filter(status='on_trip').count()
     in_shop_vehicles = Vehicle.objects.filter(status='in_shop').count()
     
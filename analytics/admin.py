@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DashboardKPI, Report, Alert, SystemMetric, Notification
+from .models import DashboardKPI, KPISnapshot, Report, Alert, SystemMetric, Notification
 
 
 @admin.register(DashboardKPI)
@@ -10,10 +10,18 @@ class DashboardKPIAdmin(admin.ModelAdmin):
     readonly_fields = ('last_updated',)
 
 
+@admin.register(KPISnapshot)
+class KPISnapshotAdmin(admin.ModelAdmin):
+    list_display = ('kpi_type', 'granularity', 'bucket_start', 'value', 'unit', 'updated_at')
+    list_filter = ('kpi_type', 'granularity')
+    readonly_fields = ('created_at', 'updated_at')
+    date_hierarchy = 'bucket_start'
+
+
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
-    list_display = ('title', 'report_type', 'period', 'start_date', 'end_date', 'file_format', 'is_generated', 'generated_at', 'created_at')
-    list_filter = ('report_type', 'period', 'file_format', 'is_generated', 'created_at')
+    list_display = ('title', 'report_type', 'period', 'start_date', 'end_date', 'file_format', 'status', 'generated_at', 'created_at')
+    list_filter = ('report_type', 'period', 'file_format', 'status', 'created_at')
     search_fields = ('title', 'description')
     readonly_fields = ('created_at', 'updated_at', 'generated_at')
     
@@ -25,7 +33,7 @@ class ReportAdmin(admin.ModelAdmin):
             'fields': ('start_date', 'end_date')
         }),
         ('Generation', {
-            'fields': ('file_format', 'is_generated', 'generated_by', 'generated_at', 'file_path')
+            'fields': ('file_format', 'status', 'error_message', 'is_generated', 'generated_by', 'generated_at', 'file_path')
         }),
         ('Configuration', {
             'fields': ('parameters', 'data')
@@ -0,0 +1,359 @@
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from vehicles.models import Vehicle
+from drivers.models import Driver
+from drivers.performance import recompute_performance
+from trips.models import Trip
+from trips.numbering import allocate_trip_numbers
+from fuel.efficiency import chain_values
+from fuel.models import FuelLog, Expense
+from maintenance.models import MaintenanceSchedule, MaintenanceType
+from search.index import rebuild_index
+from .versions import VERSIONED_MODELS, bump_version
+import random
+
+CENTS = Decimal('0.01')
+
+
+def seed_fleet(size, trips_per_vehicle=3, fuel_logs_per_vehicle=3, expenses_per_vehicle=0, maintenance_per_vehicle=0):
+    """Bulk insert a throwaway fleet of `size` vehicles and drivers"""
+    now = timezone.now()
+    prefix = f'BENCH{size}-'
+
+    vehicles = Vehicle.objects.bulk_create([
+        Vehicle(
+            name=f'{prefix}V{i}', model='Benchmark', license_plate=f'{prefix}{i}',
+            capacity=Decimal('5000'), fuel_capacity=Decimal('200'),
+        )
+        for i in range(size)
+    ], batch_size=500)
+    drivers = Driver.objects.bulk_create([
+        Driver(
+            first_name='Bench', last_name=f'{prefix}{i}', email=f'{prefix.lower()}{i}@bench.local',
+            phone='+10000000000', address='-', date_of_birth=now.date().replace(year=1980),
+            hire_date=now.date(), license_number=f'{prefix}{i}', license_type='Commercial',
+            license_expiry=now.date() + timedelta(days=365), status='on_duty',
+            emergency_contact='-', emergency_phone='-',
+        )
+        for i in range(size)
+    ], batch_size=500)
+
+    # Trip.save() is bypassed by bulk_create, so trip numbers are assigned here
+    Trip.objects.bulk_create([
+        Trip(
+            trip_number=f'B{size}-{i}-{j}', origin='A', destination='B',
+            driver=drivers[i], vehicle=vehicle, cargo_weight=Decimal('100'),
+            estimated_distance=Decimal('100'), estimated_duration=2,
+            status='completed' if j % 2 == 0 else 'cancelled',
+            actual_distance=Decimal('95') if j % 2 == 0 else None,
+        )
+        for i, vehicle in enumerate(vehicles)
+        for j in range(trips_per_vehicle)
+    ], batch_size=500)
+    FuelLog.objects.bulk_create([
+        FuelLog(
+            vehicle=vehicle, driver=drivers[i], fuel_liters=Decimal('40'),
+            cost_per_liter=Decimal('1.500'), total_cost=Decimal('60'),
+            odometer_reading=Decimal(1000 + j * 300), fuel_date=now - timedelta(days=j),
+        )
+        for i, vehicle in enumerate(vehicles)
+        for j in range(fuel_logs_per_vehicle)
+    ], batch_size=500)
+    Expense.objects.bulk_create([
+        Expense(
+            vehicle=vehicle, driver=drivers[i], expense_type='toll', description='Benchmark toll',
+            amount=Decimal('12.50'), expense_date=(now - timedelta(days=j)).date(),
+        )
+        for i, vehicle in enumerate(vehicles)
+        for j in range(expenses_per_vehicle)
+    ], batch_size=500)
+    if maintenance_per_vehicle:
+        maintenance_type, _ = MaintenanceType.objects.get_or_create(name='Benchmark service')
+        MaintenanceSchedule.objects.bulk_create([
+            MaintenanceSchedule(
+                vehicle=vehicle, maintenance_type=maintenance_type, title='Benchmark service',
+                description='-', scheduled_date=now + timedelta(days=j), estimated_duration_hours=2,
+            )
+            for vehicle in vehicles
+            for j in range(maintenance_per_vehicle)
+        ], batch_size=500)
+
+
+# Synthetic fleets (generate_fleet) ------------------------------------------
+
+SYNTHETIC_PREFIX = 'SYN-'
+
+FLEET_PROFILES = {
+    'small': {'vehicles': 200, 'drivers': 400, 'trips': 50000, 'fuel_logs': 200000, 'expenses': 20000, 'maintenance': 2000},
+    'medium': {'vehicles': 2000, 'drivers': 4000, 'trips': 500000, 'fuel_logs': 2000000, 'expenses': 200000, 'maintenance': 20000},
+    'large': {'vehicles': 10000, 'drivers': 20000, 'trips': 5000000, 'fuel_logs': 20000000, 'expenses': 2000000, 'maintenance': 100000},
+}
+
+LOCATIONS = ['Depot North', 'Depot South', 'Harbour', 'Airport', 'City Centre', 'Rail Yard', 'Industrial Park', 'Distribution Hub']
+
+FUEL_PRICES = {'diesel': 1.55, 'petrol': 1.70, 'electric': 0.35, 'hybrid': 1.60, 'cng': 1.10, 'lpg': 0.90}
+
+# Vehicle fuel types map onto the fuel log choices
+LOG_FUEL_TYPES = {'diesel': 'diesel', 'petrol': 'gasoline', 'electric': 'electric', 'hybrid': 'hybrid', 'cng': 'propane', 'lpg': 'propane'}
+
+
+@contextmanager
+def historic_timestamps(*models):
+    """Let bulk_create keep the created_at values set on instances instead of stamping now()"""
+    fields = [model._meta.get_field('created_at') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def _weighted(rng, choices):
+    """Pick a key of ``choices`` with probability proportional to its value"""
+    return rng.choices(list(choices), weights=list(choices.values()))[0]
+
+
+def _batched(objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def synthetic_vehicles():
+    return Vehicle.objects.filter(license_plate__startswith=SYNTHETIC_PREFIX)
+
+
+def synthetic_drivers():
+    return Driver.objects.filter(license_number__startswith=SYNTHETIC_PREFIX)
+
+
+def synthetic_fleet_exists():
+    return synthetic_vehicles().exists() or synthetic_drivers().exists()
+
+
+def delete_synthetic_fleet(batch_size=5000, progress=None):
+    """Delete every row a previous generate_fleet run wrote, including one that stopped part way
+
+    Rows are deleted through the ORM ``batch_size`` at a time, so cascades
+    and signals run as for any other delete. Returns {label: rows deleted}.
+    """
+    progress = progress or (lambda label, done, total: None)
+    vehicles, drivers = synthetic_vehicles(), synthetic_drivers()
+    targets = [
+        ('fuel logs', FuelLog.objects.filter(vehicle__in=vehicles)),
+        ('expenses', Expense.objects.filter(vehicle__in=vehicles)),
+        ('maintenance', MaintenanceSchedule.objects.filter(vehicle__in=vehicles)),
+        ('trips', Trip.objects.filter(Q(vehicle__in=vehicles) | Q(driver__in=drivers))),
+        ('vehicles', vehicles),
+        ('drivers', drivers),
+    ]
+    counts = {}
+    for label, queryset in targets:
+        total = queryset.count()
+        deleted = 0
+        while True:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            queryset.model.objects.filter(pk__in=pks).delete()
+            deleted += len(pks)
+            progress(f'deleting {label}', deleted, total)
+        counts[label] = deleted
+    return counts
+
+
+class FleetGenerator:
+    """Build a realistic synthetic fleet with batched bulk_create calls
+
+    Rows are generated lazily and written ``batch_size`` at a time, so memory
+    stays flat whatever the fleet size. Trips and fuel logs are spread over
+    the last ``days`` days, fuel log chains carry consistent odometer,
+    distance and efficiency values, and trip numbers are reserved from the
+    per-day sequence. Driver performance is rebuilt from the generated history.
+
+    Each table is written in its own transaction, so a failure leaves whole
+    tables behind; delete_synthetic_fleet() clears them for another run.
+    """
+
+    def __init__(self, days=365, batch_size=5000, seed=1, progress=None):
+        self.days = days
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.progress = progress or (lambda label, done, total: None)
+        self.now = timezone.now()
+
+    def _write(self, label, model, objects, total):
+        done = 0
+        with transaction.atomic():
+            for batch in _batched(objects, self.batch_size):
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                done += len(batch)
+                self.progress(label, done, total)
+
+    def _moment(self):
+        return self.now - timedelta(seconds=self.rng.uniform(0, self.days * 86400))
+
+    def vehicles(self, count):
+        fuel_types = list(FUEL_PRICES)
+        for i in range(count):
+            yield Vehicle(
+                name=f'{SYNTHETIC_PREFIX}Truck {i}', make=self.rng.choice(['Volvo', 'Scania', 'MAN', 'Ford', 'Isuzu']),
+                model='Synthetic', year=self.rng.randint(2012, 2024), license_plate=f'{SYNTHETIC_PREFIX}{i:07d}',
+                fuel_type=self.rng.choice(fuel_types), fuel_efficiency=Decimal(self.rng.randint(25, 140)) / 10,
+                capacity=Decimal(self.rng.choice([1000, 3500, 7500, 12000, 26000])), fuel_capacity=Decimal('300'),
+                odometer=Decimal(self.rng.randint(5000, 250000)), current_location=self.rng.choice(LOCATIONS),
+                status=_weighted(self.rng, {'available': 90, 'in_shop': 7, 'retired': 3}),
+            )
+
+    def drivers(self, count):
+        today = self.now.date()
+        for i in range(count):
+            yield Driver(
+                first_name=self.rng.choice(['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Robin', 'Jamie']),
+                last_name=f'{SYNTHETIC_PREFIX}{i:07d}', email=f'syn{i}@synthetic.local', phone='+10000000000',
+                address='-', date_of_birth=today.replace(year=today.year - self.rng.randint(21, 64), day=1),
+                hire_date=today - timedelta(days=self.rng.randint(30, 5000)), license_number=f'{SYNTHETIC_PREFIX}{i:07d}',
+                license_type=self.rng.choice(['Commercial', 'Heavy Vehicle']),
+                license_expiry=today + timedelta(days=self.rng.randint(-60, 1800)),
+                status=_weighted(self.rng, {'on_duty': 60, 'off_duty': 30, 'on_leave': 5, 'suspended': 5}),
+                emergency_contact='-', emergency_phone='-',
+            )
+
+    def _trips_per_day(self, count):
+        """Split ``count`` trips over the last ``days`` days with some day-to-day variation"""
+        today = timezone.localdate(self.now)
+        weights = [self.rng.uniform(0.5, 1.5) for _ in range(self.days)]
+        total = sum(weights)
+        counts = [int(count * weight / total) for weight in weights]
+        for index in self.rng.sample(range(self.days), count - sum(counts)):
+            counts[index] += 1
+        return [(today - timedelta(days=offset), day_count) for offset, day_count in enumerate(counts) if day_count]
+
+    def trips(self, count, vehicle_ids, driver_ids):
+        """Completed, cancelled and draft trips; none are left active, so vehicle statuses stay consistent
+
+        Trip numbers are reserved from each day's sequence in one allocation.
+        """
+        for day, day_count in self._trips_per_day(count):
+            day_start = timezone.make_aware(datetime.combine(day, time.min))
+            seconds = min(86400, (self.now - day_start).total_seconds())
+            for trip_number in allocate_trip_numbers(day_count, day=day):
+                created_at = day_start + timedelta(seconds=self.rng.uniform(0, seconds))
+                yield self._trip(trip_number, created_at, vehicle_ids, driver_ids)
+
+    def _trip(self, trip_number, created_at, vehicle_ids, driver_ids):
+        status = _weighted(self.rng, {'completed': 80, 'cancelled': 8, 'draft': 12})
+        distance = Decimal(self.rng.randint(5, 900))
+        duration = max(1, int(distance) // 60)
+        trip = Trip(
+            trip_number=trip_number,
+            origin=self.rng.choice(LOCATIONS), destination=self.rng.choice(LOCATIONS),
+            vehicle_id=self.rng.choice(vehicle_ids), driver_id=self.rng.choice(driver_ids),
+            cargo_weight=Decimal(self.rng.randint(50, 20000)), estimated_distance=distance,
+            estimated_duration=duration, priority=_weighted(self.rng, {'low': 20, 'medium': 50, 'high': 22, 'urgent': 8}),
+            status=status, created_at=created_at,
+        )
+        if status != 'draft':
+            trip.start_date = created_at + timedelta(hours=self.rng.randint(1, 24))
+            trip.end_date = trip.start_date + timedelta(hours=duration)
+        if status == 'completed':
+            trip.actual_start_time = trip.start_date
+            trip.actual_end_time = trip.end_date
+            trip.actual_distance = (distance * Decimal(self.rng.uniform(0.9, 1.15))).quantize(CENTS)
+            trip.actual_duration = max(1, duration + self.rng.randint(-1, 2))
+        elif status == 'cancelled':
+            trip.cancellation_reason = 'Synthetic cancellation'
+        return trip
+
+    def fuel_logs(self, count, vehicles, driver_ids):
+        """Each vehicle's logs in date order with chained odometer readings"""
+        self.final_odometers = {}
+        per_vehicle, extra = divmod(count, len(vehicles))
+        for index, vehicle in enumerate(vehicles):
+            logs = per_vehicle + (1 if index < extra else 0)
+            if not logs:
+                continue
+            dates = sorted(self._moment() for _ in range(logs))
+            odometer = vehicle.odometer
+            previous = None
+            price = FUEL_PRICES[vehicle.fuel_type]
+            for fuel_date in dates:
+                odometer += Decimal(self.rng.randint(150, 700))
+                liters = ((odometer - previous) / vehicle.fuel_efficiency if previous else Decimal(self.rng.randint(40, 200)))
+                liters = (liters * Decimal(self.rng.uniform(0.9, 1.1))).quantize(CENTS)
+                cost_per_liter = Decimal(price * self.rng.uniform(0.9, 1.1)).quantize(Decimal('0.001'))
+                previous_odometer, distance, efficiency = chain_values(odometer, liters, previous)
+                yield FuelLog(
+                    vehicle_id=vehicle.pk, driver_id=self.rng.choice(driver_ids),
+                    fuel_type=LOG_FUEL_TYPES[vehicle.fuel_type], fuel_liters=liters, cost_per_liter=cost_per_liter,
+                    total_cost=(liters * cost_per_liter).quantize(CENTS), odometer_reading=odometer,
+                    previous_odometer=previous_odometer, distance_traveled=distance, fuel_efficiency=efficiency,
+                    fuel_date=fuel_date,
+                )
+                previous = odometer
+            self.final_odometers[vehicle.pk] = odometer
+
+    def expenses(self, count, vehicle_ids, driver_ids):
+        expense_types = [expense_type for expense_type, _ in Expense.EXPENSE_TYPES]
+        for _ in range(count):
+            yield Expense(
+                vehicle_id=self.rng.choice(vehicle_ids), driver_id=self.rng.choice(driver_ids),
+                expense_type=self.rng.choice(expense_types), description='Synthetic expense',
+                amount=Decimal(self.rng.randint(500, 250000)) / 100, expense_date=self._moment().date(),
+            )
+
+    def maintenance(self, count, vehicle_ids):
+        maintenance_types = [
+            MaintenanceType.objects.get_or_create(name=name)[0]
+            for name in ['Oil change', 'Tyre rotation', 'Brake service', 'Annual inspection']
+        ]
+        for _ in range(count):
+            # Mostly history, with a tail of upcoming work
+            scheduled_date = self._moment() + timedelta(days=self.rng.choice([0, 0, 0, 30]))
+            status = 'scheduled' if scheduled_date > self.now else _weighted(self.rng, {'completed': 90, 'cancelled': 10})
+            cost = Decimal(self.rng.randint(5000, 300000)) / 100
+            yield MaintenanceSchedule(
+                vehicle_id=self.rng.choice(vehicle_ids), maintenance_type=self.rng.choice(maintenance_types),
+                title='Synthetic service', description='-', status=status, scheduled_date=scheduled_date,
+                estimated_duration_hours=self.rng.randint(1, 8), estimated_cost=cost,
+                actual_cost=cost if status == 'completed' else None,
+            )
+
+    def generate(self, vehicles, drivers, trips, fuel_logs, expenses=0, maintenance=0):
+        """Write the whole fleet and return {label: rows written}"""
+        self._write('vehicles', Vehicle, self.vehicles(vehicles), vehicles)
+        self._write('drivers', Driver, self.drivers(drivers), drivers)
+        fleet = list(synthetic_vehicles().only('id', 'odometer', 'fuel_type', 'fuel_efficiency'))
+        vehicle_ids = [vehicle.pk for vehicle in fleet]
+        driver_ids = list(synthetic_drivers().values_list('id', flat=True))
+
+        with historic_timestamps(Trip):
+            self._write('trips', Trip, self.trips(trips, vehicle_ids, driver_ids), trips)
+
+        with transaction.atomic():
+            self._write('fuel logs', FuelLog, self.fuel_logs(fuel_logs, fleet, driver_ids), fuel_logs)
+            for vehicle in fleet:
+                vehicle.odometer = self.final_odometers.get(vehicle.pk, vehicle.odometer)
+            Vehicle.objects.bulk_update(fleet, ['odometer'], batch_size=self.batch_size)
+
+        self._write('expenses', Expense, self.expenses(expenses, vehicle_ids, driver_ids), expenses)
+        self._write('maintenance', MaintenanceSchedule, self.maintenance(maintenance, vehicle_ids), maintenance)
+
+        recompute_performance(driver_ids)
+        rebuild_index(batch_size=self.batch_size)
+        bump_version(*VERSIONED_MODELS.values())
+        return {
+            'vehicles': vehicles, 'drivers': drivers, 'trips': trips, 'fuel logs': fuel_logs,
+            'expenses': expenses, 'maintenance': maintenance,
+        }
@@ -0,0 +1,91 @@
+from django.http import StreamingHttpResponse
+import csv
+
+# Rows fetched per database round-trip when streaming querysets
+EXPORT_CHUNK_SIZE = 2000
+
+TRIP_EXPORT_COLUMNS = [
+    ('Trip Number', 'trip_number'),
+    ('Origin', 'origin'),
+    ('Destination', 'destination'),
+    ('Vehicle', 'vehicle__name'),
+    ('License Plate', 'vehicle__license_plate'),
+    ('Driver First Name', 'driver__first_name'),
+    ('Driver Last Name', 'driver__last_name'),
+    ('Cargo Weight (kg)', 'cargo_weight'),
+    ('Estimated Distance (km)', 'estimated_distance'),
+    ('Actual Distance (km)', 'actual_distance'),
+    ('Estimated Duration (h)', 'estimated_duration'),
+    ('Actual Duration (h)', 'actual_duration'),
+    ('Priority', 'priority'),
+    ('Status', 'status'),
+    ('Start Date', 'start_date'),
+    ('End Date', 'end_date'),
+    ('Created At', 'created_at'),
+]
+
+FUEL_LOG_EXPORT_COLUMNS = [
+    ('Fuel Date', 'fuel_date'),
+    ('Vehicle', 'vehicle__name'),
+    ('License Plate', 'vehicle__license_plate'),
+    ('Driver First Name', 'driver__first_name'),
+    ('Driver Last Name', 'driver__last_name'),
+    ('Fuel Station', 'fuel_station__name'),
+    ('Trip Number', 'trip__trip_number'),
+    ('Fuel Type', 'fuel_type'),
+    ('Liters', 'fuel_liters'),
+    ('Cost per Liter', 'cost_per_liter'),
+    ('Total Cost', 'total_cost'),
+    ('Odometer', 'odometer_reading'),
+    ('Distance Traveled (km)', 'distance_traveled'),
+    ('Fuel Efficiency (km/l)', 'fuel_efficiency'),
+]
+
+EXPENSE_EXPORT_COLUMNS = [
+    ('Expense Date', 'expense_date'),
+    ('Expense Type', 'expense_type'),
+    ('Description', 'description'),
+    ('Amount', 'amount'),
+    ('Payment Method', 'payment_method'),
+    ('Vendor', 'vendor'),
+    ('Category', 'category'),
+    ('Vehicle', 'vehicle__name'),
+    ('License Plate', 'vehicle__license_plate'),
+    ('Driver First Name', 'driver__first_name'),
+    ('Driver Last Name', 'driver__last_name'),
+    ('Trip Number', 'trip__trip_number'),
+    ('Reimbursable', 'is_reimbursable'),
+    ('Approved', 'is_approved'),
+]
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """Yield each row as an encoded CSV line"""
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def queryset_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a header row and then one row per object without loading the queryset
+
+    ``columns`` is a list of ``(header, field_path)`` pairs; field paths may
+    follow relations (``vehicle__license_plate``).
+    """
+    yield [header for header, _ in columns]
+    values = queryset.values_list(*[path for _, path in columns])
+    yield from values.iterator(chunk_size=chunk_size)
+
+
+def csv_response(rows, filename):
+    """Stream rows to the client as a CSV attachment"""
+    response = StreamingHttpResponse(stream_csv(rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,201 @@
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Sum, Q
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from .models import DashboardKPI, KPISnapshot
+from vehicles.models import Vehicle
+from drivers.models import Driver
+from trips.models import Trip
+from fuel.models import FuelLog, Expense
+
+
+KPI_UNITS = {
+    'total_vehicles': 'vehicles',
+    'available_vehicles': 'vehicles',
+    'vehicles_on_trip': 'vehicles',
+    'vehicles_in_maintenance': 'vehicles',
+    'total_drivers': 'drivers',
+    'available_drivers': 'drivers',
+    'active_trips': 'trips',
+    'completed_trips': 'trips',
+    'total_revenue': '$',
+    'total_expenses': '$',
+    'fleet_utilization': '%',
+}
+
+# KPIs that count rows; stored as decimals but shown as whole numbers
+COUNT_KPIS = {kpi_type for kpi_type, unit in KPI_UNITS.items() if unit in ('vehicles', 'drivers', 'trips')}
+
+# Trends are stored in DecimalField(max_digits=8, decimal_places=2), so must stay below this
+TREND_LIMIT = Decimal('1000000')
+
+
+def compute_dashboard_kpis():
+    """Compute all dashboard KPIs with one aggregate query per model"""
+    vehicle_counts = Vehicle.objects.filter(is_active=True).aggregate(
+        total_vehicles=Count('id'),
+        available_vehicles=Count('id', filter=Q(status='available')),
+        vehicles_on_trip=Count('id', filter=Q(status='on_trip')),
+        vehicles_in_maintenance=Count('id', filter=Q(status='in_shop')),
+    )
+
+    driver_counts = Driver.objects.filter(is_active=True).aggregate(
+        total_drivers=Count('id'),
+        available_drivers=Count('id', filter=Q(status='on_duty')),
+    )
+
+    trip_counts = Trip.objects.aggregate(
+        active_trips=Count('id', filter=Q(status__in=['dispatched', 'in_progress'])),
+        completed_trips=Count('id', filter=Q(status='completed')),
+    )
+
+    total_fuel_cost = FuelLog.objects.aggregate(total=Sum('total_cost'))['total'] or 0
+    total_expenses = Expense.objects.aggregate(total=Sum('amount'))['total'] or 0
+
+    kpis = {**vehicle_counts, **driver_counts, **trip_counts}
+
+    # Fleet utilization
+    if kpis['total_vehicles'] > 0:
+        kpis['fleet_utilization'] = round((kpis['vehicles_on_trip'] / kpis['total_vehicles']) * 100, 2)
+    else:
+        kpis['fleet_utilization'] = 0
+
+    kpis['total_fuel_cost'] = total_fuel_cost
+    kpis['total_expenses'] = total_expenses
+    kpis['total_operational_cost'] = total_fuel_cost + total_expenses
+
+    return kpis
+
+
+def kpi_values(kpis):
+    """Map computed KPIs onto DashboardKPI.kpi_type values"""
+    return {
+        'total_vehicles': kpis['total_vehicles'],
+        'available_vehicles': kpis['available_vehicles'],
+        'vehicles_on_trip': kpis['vehicles_on_trip'],
+        'vehicles_in_maintenance': kpis['vehicles_in_maintenance'],
+        'total_drivers': kpis['total_drivers'],
+        'available_drivers': kpis['available_drivers'],
+        'active_trips': kpis['active_trips'],
+        'completed_trips': kpis['completed_trips'],
+        'total_revenue': 0,  # Would be calculated from actual revenue
+        'total_expenses': kpis['total_operational_cost'],
+        'fleet_utilization': kpis['fleet_utilization'],
+    }
+
+
+def upsert(model, rows, unique_fields, update_fields):
+    """Insert ``rows``, updating ``update_fields`` of rows that clash on ``unique_fields``
+
+    MySQL's ON DUPLICATE KEY UPDATE takes no conflict target, and Django
+    refuses ``unique_fields`` on backends that cannot use one.
+    """
+    features = connections[router.db_for_write(model)].features
+    model.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=unique_fields if features.supports_update_conflicts_with_target else None,
+        update_fields=update_fields,
+    )
+
+
+def persist_dashboard_kpis(kpis, trends=None):
+    """Upsert the DashboardKPI rows in a single statement"""
+    trends = trends or {}
+    rows = [
+        DashboardKPI(
+            kpi_type=kpi_type,
+            value=Decimal(str(value)),
+            unit=KPI_UNITS[kpi_type],
+            trend=trends.get(kpi_type),
+        )
+        for kpi_type, value in kpi_values(kpis).items()
+    ]
+
+    upsert(DashboardKPI, rows, ['kpi_type'], ['value', 'unit', 'trend', 'last_updated'])
+
+
+def bucket_start(moment, granularity):
+    """Truncate a datetime to the start of its hourly or daily bucket"""
+    moment = timezone.localtime(moment)
+    if granularity == 'daily':
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def compute_trend(current, previous):
+    """Percentage change between two bucket values; None when there is nothing meaningful to compare"""
+    if previous is None or previous == 0:
+        return None
+    trend = round((Decimal(str(current)) - previous) / previous * Decimal('100'), 2)
+    # A change this large only comes from a near-zero previous value
+    return trend if abs(trend) < TREND_LIMIT else None
+
+
+def snapshot_kpis(now=None):
+    """Compute KPIs once and record them in the hourly/daily snapshot store"""
+    now = now or timezone.now()
+    kpis = compute_dashboard_kpis()
+    values = kpi_values(kpis)
+
+    hour = bucket_start(now, 'hourly')
+    day = bucket_start(now, 'daily')
+
+    # Trend is the change against the previous daily bucket
+    previous = dict(KPISnapshot.objects.filter(
+        granularity='daily',
+        bucket_start=day - timedelta(days=1),
+    ).values_list('kpi_type', 'value'))
+    trends = {
+        kpi_type: compute_trend(value, previous.get(kpi_type))
+        for kpi_type, value in values.items()
+    }
+
+    snapshots = []
+    for granularity, start in (('hourly', hour), ('daily', day)):
+        snapshots.extend(
+            KPISnapshot(
+                kpi_type=kpi_type,
+                granularity=granularity,
+                bucket_start=start,
+                value=Decimal(str(value)),
+                unit=KPI_UNITS[kpi_type],
+            )
+            for kpi_type, value in values.items()
+        )
+
+    with transaction.atomic():
+        upsert(KPISnapshot, snapshots, ['kpi_type', 'granularity', 'bucket_start'], ['value', 'unit', 'updated_at'])
+        persist_dashboard_kpis(kpis, trends)
+
+    return kpis
+
+
+def get_dashboard_kpis():
+    """Read precomputed KPIs, refreshing them if the snapshot job has not run recently"""
+    # Rows of KPI types no longer computed would never be refreshed, so they must not count
+    current = DashboardKPI.objects.filter(kpi_type__in=KPI_UNITS)
+    rows = list(current)
+    max_age = timedelta(seconds=getattr(settings, 'KPI_SNAPSHOT_MAX_AGE', 3600))
+
+    if len(rows) < len(KPI_UNITS) or min(row.last_updated for row in rows) < timezone.now() - max_age:
+        snapshot_kpis()
+        rows = list(current.all())
+
+    kpis = {row.kpi_type: int(row.value) if row.kpi_type in COUNT_KPIS else row.value for row in rows}
+    kpis['total_operational_cost'] = kpis.get('total_expenses', 0)
+    kpis['kpi_trends'] = {row.kpi_type: row.trend for row in rows}
+    return kpis
+
+
+def get_kpi_history(kpi_type, days=90, granularity='daily', now=None):
+    """Return [(bucket_start, value), ...] for a KPI from the snapshot store"""
+    now = now or timezone.now()
+    since = bucket_start(now - timedelta(days=days), granularity)
+    return list(KPISnapshot.objects.filter(
+        kpi_type=kpi_type,
+        granularity=granularity,
+        bucket_start__gte=since,
+    ).order_by('bucket_start').values_list('bucket_start', 'value'))
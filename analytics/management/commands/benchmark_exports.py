@@ -0,0 +1,65 @@
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from analytics.benchmarks import seed_fleet
+from analytics.models import Report
+from analytics.reports import REPORT_WRITERS, build_report_data
+
+
+class Command(BaseCommand):
+    help = 'Measure peak Python memory and runtime of report file writers on a large seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Number of fuel logs to seed')
+        parser.add_argument('--formats', default='excel', help='Comma-separated file formats to benchmark')
+        parser.add_argument('--max-peak-mb', type=float, default=None, help='Fail if any writer exceeds this peak')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        formats = options['formats'].split(',')
+        logs_per_vehicle = 100
+        vehicles = max(1, rows // logs_per_vehicle)
+        today = timezone.now().date()
+
+        report = Report(
+            report_type='fuel_consumption', title='Benchmark', period='custom',
+            start_date=today - timedelta(days=logs_per_vehicle), end_date=today,
+        )
+        failures = []
+
+        # Seed inside a transaction that is always rolled back
+        with transaction.atomic(), tempfile.TemporaryDirectory() as tmp_dir:
+            seed_fleet(vehicles, trips_per_vehicle=1, fuel_logs_per_vehicle=logs_per_vehicle)
+            data = build_report_data(report)
+
+            for file_format in formats:
+                report.file_format = file_format
+                path = os.path.join(tmp_dir, report.file_name)
+
+                tracemalloc.start()
+                started = time.perf_counter()
+                REPORT_WRITERS[file_format](report, data, path)
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                peak_mb = peak / (1024 * 1024)
+                size_mb = os.path.getsize(path) / (1024 * 1024)
+                self.stdout.write(
+                    f'{file_format:<6} rows={vehicles * logs_per_vehicle:<9} peak={peak_mb:.1f}MB '
+                    f'file={size_mb:.1f}MB time={elapsed:.1f}s'
+                )
+                if options['max_peak_mb'] is not None and peak_mb > options['max_peak_mb']:
+                    failures.append(file_format)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'Peak memory above {options["max_peak_mb"]}MB for: {", ".join(failures)}')
+
+        self.stdout.write(self.style.SUCCESS('Export benchmark finished'))
@@ -0,0 +1,50 @@
+import os
+import re
+import tempfile
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from analytics.benchmarks import seed_fleet
+from analytics.models import Report
+from analytics.reports import build_report_data, write_pdf_report
+
+
+class Command(BaseCommand):
+    help = 'Time PDF rendering of a large vehicle performance report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vehicles', type=int, default=2000, help='Fleet size to seed (2000 renders about 50 pages)')
+        parser.add_argument('--max-seconds', type=float, default=10.0, help='Fail if rendering takes longer')
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        report = Report(
+            report_type='vehicle_performance', title='Benchmark', period='custom',
+            file_format='pdf', start_date=today - timedelta(days=30), end_date=today,
+        )
+
+        # Seed inside a transaction that is always rolled back
+        with transaction.atomic(), tempfile.TemporaryDirectory() as tmp_dir:
+            seed_fleet(options['vehicles'], trips_per_vehicle=1, fuel_logs_per_vehicle=1)
+            data = build_report_data(report)
+            path = os.path.join(tmp_dir, report.file_name)
+
+            started = time.perf_counter()
+            write_pdf_report(report, data, path)
+            elapsed = time.perf_counter() - started
+
+            with open(path, 'rb') as output:
+                pages = len(re.findall(rb'/Type /Page\b', output.read()))
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f'vehicle_performance vehicles={options["vehicles"]} pages={pages} '
+            f'file={size_mb:.1f}MB time={elapsed:.2f}s'
+        )
+        if elapsed > options['max_seconds']:
+            raise CommandError(f'PDF rendering took {elapsed:.2f}s, limit is {options["max_seconds"]}s')
+
+        self.stdout.write(self.style.SUCCESS('PDF benchmark finished'))
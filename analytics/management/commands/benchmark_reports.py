@@ -0,0 +1,44 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from analytics.benchmarks import seed_fleet
+from analytics.reports import REPORT_GENERATORS
+
+
+class Command(BaseCommand):
+    help = 'Measure query count and runtime of each report generator across fleet sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000', help='Comma-separated fleet sizes to seed')
+        parser.add_argument('--days', type=int, default=30, help='Report window in days')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        end_date = timezone.now().date()
+        start_date = end_date - timedelta(days=options['days'])
+        results = {name: {} for name in REPORT_GENERATORS}
+
+        for size in sizes:
+            # Seed inside a transaction that is always rolled back
+            with transaction.atomic():
+                seed_fleet(size)
+                for name, generator in REPORT_GENERATORS.items():
+                    started = time.perf_counter()
+                    with CaptureQueriesContext(connection) as queries:
+                        generator(start_date, end_date)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    results[name][size] = (len(queries), elapsed)
+                    self.stdout.write(f'{name:<22} fleet={size:<7} queries={len(queries):<5} time={elapsed:.1f}ms')
+                transaction.set_rollback(True)
+
+        growing = [
+            name for name, runs in results.items()
+            if len({query_count for query_count, _ in runs.values()}) > 1
+        ]
+        if growing:
+            raise CommandError(f'Query count grows with fleet size for: {", ".join(growing)}')
+
+        self.stdout.write(self.style.SUCCESS('Query count is constant in fleet size for every report'))
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.template import TemplateDoesNotExist
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from analytics.benchmarks import seed_fleet
+
+# List pages whose query count must not depend on how many rows they show
+LIST_VIEWS = [
+    'drivers:driver_list',
+    'trips:trip_list',
+    'fuel:fuel_log_list',
+    'fuel:expense_list',
+    'maintenance:maintenance_list',
+    'vehicles:vehicle_list',
+]
+
+
+def seed_rows(count):
+    """``count`` vehicles and drivers, each with one trip, fuel log, expense and maintenance entry"""
+    seed_fleet(count, trips_per_vehicle=1, fuel_logs_per_vehicle=1, expenses_per_vehicle=1, maintenance_per_vehicle=1)
+
+
+class Command(BaseCommand):
+    help = 'Render every list view with few and many rows and fail if the query count grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows of each kind for the large render')
+        parser.add_argument('--baseline-rows', type=int, default=2, help='Rows of each kind for the small render')
+
+    def handle(self, *args, **options):
+        if options['rows'] <= options['baseline_rows']:
+            raise CommandError('--rows must be larger than --baseline-rows')
+
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and host != '*']
+        client = Client(HTTP_HOST=hosts[0].lstrip('.') if hosts else 'localhost')
+        failures = []
+
+        # Seed inside a transaction that is always rolled back
+        with transaction.atomic():
+            user = get_user_model().objects.create_superuser('query-count-check', 'query-count@check.local', None)
+            client.force_login(user)
+
+            seed_rows(options['baseline_rows'])
+            baseline = self.measure(client)
+            seed_rows(options['rows'] - options['baseline_rows'])
+            loaded = self.measure(client)
+            transaction.set_rollback(True)
+
+        for name in LIST_VIEWS:
+            few, many = baseline[name], loaded[name]
+            if isinstance(few, str) or isinstance(many, str):
+                self.stdout.write(self.style.WARNING(f'skip {name:<30} {few if isinstance(few, str) else many}'))
+                continue
+            grows = many > few
+            self.stdout.write(
+                f'{"FAIL" if grows else "ok  "} {name:<30} '
+                f'{few} queries at {options["baseline_rows"]} rows, {many} at {options["rows"]}'
+            )
+            if grows:
+                failures.append(f'{name}: {few} -> {many} queries')
+
+        if failures:
+            raise CommandError('Query count grows with row count:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('No list view query count grows with its rows'))
+
+    def measure(self, client):
+        """{url name: query count, or the reason the page could not be rendered}"""
+        counts = {}
+        for name in LIST_VIEWS:
+            try:
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(reverse(name))
+            except TemplateDoesNotExist:
+                counts[name] = 'template missing'
+                continue
+            if response.status_code != 200:
+                counts[name] = f'status {response.status_code}'
+                continue
+            counts[name] = len(queries)
+        return counts
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+from analytics.models import Notification
+from analytics.periods import day_range
+from analytics.views import filtered_alerts
+from drivers.models import Driver
+from drivers.views import DriverListView
+from fleetflow.pagination import KeysetPaginator
+from fuel.efficiency import logs_after, logs_before
+from fuel.models import FuelLog, Expense, FuelBudget
+from fuel.views import ExpenseListView, FuelLogListView
+from maintenance.models import MaintenanceSchedule
+from maintenance.views import MaintenanceListView
+from trips.models import Trip
+from trips.views import TripListView
+from vehicles.models import Vehicle
+from vehicles.views import VehicleListView
+
+PAGE_SIZE = 20
+
+
+def list_queryset(view_class, **params):
+    """The queryset ``view_class`` builds for a GET with ``params``"""
+    view = view_class()
+    view.setup(RequestFactory().get('/', params))
+    return view.get_queryset()
+
+
+def keyset_query(queryset, after=None):
+    """The query a cursor-paged list runs for its first page, or for the page after the row ``after``"""
+    paginator = KeysetPaginator(queryset, PAGE_SIZE)
+    return paginator.page_queryset(paginator.cursor(after, 'next') if after is not None else None)
+
+
+def hot_queries():
+    """(description, queryset, index it should use) for the list, dashboard and report queries
+
+    List queries are built by the views and paginators themselves, so the
+    checked SQL is the SQL those pages run.
+    """
+    now = timezone.now()
+    today = now.date()
+    month_ago = today - timedelta(days=30)
+
+    trips = list_queryset(TripListView)
+    fuel_logs = list_queryset(FuelLogListView)
+    expenses = list_queryset(ExpenseListView)
+    maintenance = list_queryset(MaintenanceListView)
+    alerts = filtered_alerts({})
+
+    return [
+        ('trip list', keyset_query(trips), 'trip_created_idx'),
+        ('trip list next page', keyset_query(trips, Trip(id=1, created_at=now)), 'trip_created_idx'),
+        ('trip list by status', keyset_query(list_queryset(TripListView, status='completed')), 'trip_status_created_idx'),
+        ('trip overdue', Trip.objects.filter(status='dispatched', start_date__lt=now), 'trip_status_start_idx'),
+        ('vehicle recent trips', Trip.objects.filter(vehicle_id=1).order_by('-created_at')[:5], 'trip_vehicle_created_idx'),
+        ('trip report window', Trip.objects.filter(**day_range('created_at', month_ago, today)), 'trip_created_idx'),
+        ('fuel log list', keyset_query(fuel_logs), 'fuellog_date_idx'),
+        ('fuel log list next page', keyset_query(fuel_logs, FuelLog(id=1, fuel_date=now)), 'fuellog_date_idx'),
+        ('fuel log list by dates', keyset_query(list_queryset(FuelLogListView, start_date=month_ago.isoformat(), end_date=today.isoformat())), 'fuellog_date_idx'),
+        ('fuel log list by vehicle', keyset_query(list_queryset(FuelLogListView, vehicle='1')), 'fuellog_vehicle_date_idx'),
+        ('fuel log previous reading', logs_before(1, now, 1)[:1], 'fuellog_vehicle_date_idx'),
+        ('fuel log new reading', logs_before(1, now)[:1], 'fuellog_vehicle_date_idx'),
+        ('fuel log next reading', logs_after(1, now, 1)[:1], 'fuellog_vehicle_date_idx'),
+        ('fuel report window', FuelLog.objects.filter(**day_range('fuel_date', month_ago, today)), 'fuellog_date_idx'),
+        ('expense list', keyset_query(expenses), 'expense_date_idx'),
+        ('expense list next page', keyset_query(expenses, Expense(id=1, expense_date=today)), 'expense_date_idx'),
+        ('expense list by type', keyset_query(list_queryset(ExpenseListView, expense_type='toll')), 'expense_type_date_idx'),
+        ('expense report window', Expense.objects.filter(expense_date__gte=month_ago, expense_date__lte=today), 'expense_date_idx'),
+        ('active fuel budgets', FuelBudget.objects.filter(is_active=True).order_by('-start_date'), 'fuelbudget_start_active_idx'),
+        ('maintenance list', keyset_query(maintenance), 'maint_date_idx'),
+        ('maintenance list next page', keyset_query(maintenance, MaintenanceSchedule(id=1, scheduled_date=now)), 'maint_date_idx'),
+        ('maintenance list by status', keyset_query(list_queryset(MaintenanceListView, status='scheduled')), 'maint_status_date_idx'),
+        ('maintenance overdue', MaintenanceSchedule.objects.filter(status='scheduled', scheduled_date__lt=now), 'maint_status_date_idx'),
+        ('vehicle maintenance', MaintenanceSchedule.objects.filter(vehicle_id=1).order_by('-scheduled_date')[:5], 'maint_vehicle_date_idx'),
+        ('vehicle list', list_queryset(VehicleListView)[:PAGE_SIZE], 'vehicle_created_active_idx'),
+        ('available vehicles', Vehicle.objects.filter(is_active=True, status='available'), 'vehicle_status_active_idx'),
+        ('driver list', list_queryset(DriverListView)[:PAGE_SIZE], 'driver_name_active_idx'),
+        ('available drivers', Driver.objects.filter(is_active=True, status='on_duty'), 'driver_status_active_idx'),
+        ('expired licenses', Driver.objects.filter(is_active=True, license_expiry__lte=today).order_by(), 'driver_license_active_idx'),
+        ('active alerts', filtered_alerts({'status': 'active'})[:10], 'alert_status_created_idx'),
+        ('alert list', keyset_query(alerts), 'alert_created_idx'),
+        ('alert list next page', keyset_query(alerts, alerts.model(id=1, created_at=now)), 'alert_created_idx'),
+        ('unread notifications', Notification.objects.filter(recipient_id=1, is_read=False).order_by('-created_at')[:5], 'notif_recipient_created_idx'),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot list/dashboard/report queries and check they use their indexes without sorting (SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every query plan')
+
+    def handle(self, *args, **options):
+        check = connection.vendor == 'sqlite'
+        if not check:
+            self.stdout.write(self.style.WARNING(
+                f'Plans are only checked on SQLite; printing {connection.vendor} plans instead'
+            ))
+
+        failures = []
+        for description, queryset, index in hot_queries():
+            plan = queryset.explain()
+            # A page sorted in a temp B-tree reads every matching row before its first one;
+            # whole-set filters may sort the few rows they match
+            sorts_page = queryset.query.is_sliced and 'USE TEMP B-TREE' in plan
+            ok = index in plan and not sorts_page
+            if options['verbose_plans'] or not check:
+                self.stdout.write(f'{description}:\n{plan}\n')
+            if check:
+                self.stdout.write(f'{"ok  " if ok else "FAIL"} {description:<28} {index}')
+                if not ok:
+                    failures.append(f'{description} ({plan})')
+
+        if failures:
+            raise CommandError('Queries not using their index, or sorting past it:\n' + '\n'.join(failures))
+
+        if check:
+            self.stdout.write(self.style.SUCCESS('All hot queries use their indexes'))
@@ -0,0 +1,56 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from analytics.benchmarks import (
+    FLEET_PROFILES, SYNTHETIC_PREFIX, FleetGenerator, delete_synthetic_fleet, synthetic_fleet_exists,
+)
+
+FLEET_SIZE_OPTIONS = ['vehicles', 'drivers', 'trips', 'fuel_logs', 'expenses', 'maintenance']
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic fleet with history for load testing (rows are kept)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=sorted(FLEET_PROFILES), default='small',
+                            help='Preset fleet size; "large" is 10k vehicles, 20k drivers, 5M trips, 20M fuel logs')
+        for option in FLEET_SIZE_OPTIONS:
+            parser.add_argument(f'--{option.replace("_", "-")}', type=int, help=f'Override the profile\'s {option.replace("_", " ")} count')
+        parser.add_argument('--days', type=int, default=365, help='Days of history to spread trips and fuel logs over')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create call')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed')
+        parser.add_argument('--replace', action='store_true',
+                            help=f'Delete an existing synthetic fleet ({SYNTHETIC_PREFIX}*), complete or not, before generating')
+
+    def handle(self, *args, **options):
+        sizes = dict(FLEET_PROFILES[options['profile']])
+        sizes.update({option: options[option] for option in FLEET_SIZE_OPTIONS if options[option] is not None})
+        if not sizes['vehicles'] or not sizes['drivers']:
+            raise CommandError('A fleet needs at least one vehicle and one driver')
+
+        if synthetic_fleet_exists() and not options['replace']:
+            raise CommandError(
+                f'A synthetic fleet ({SYNTHETIC_PREFIX}*) already exists in this database; pass --replace to delete it first'
+            )
+
+        started = time.perf_counter()
+        reported = {}
+
+        def progress(label, done, total):
+            # Roughly every 10% of each table
+            step = max(1, total // 10)
+            if done == total or done // step > reported.get(label, 0):
+                reported[label] = done // step
+                self.stdout.write(f'{label}: {done}/{total} ({time.perf_counter() - started:.0f}s)')
+
+        if options['replace']:
+            deleted = delete_synthetic_fleet(batch_size=options['batch_size'], progress=progress)
+            if any(deleted.values()):
+                self.stdout.write('Deleted ' + ', '.join(f'{count} {label}' for label, count in deleted.items()))
+
+        generator = FleetGenerator(days=options['days'], batch_size=options['batch_size'], seed=options['seed'], progress=progress)
+        written = generator.generate(**sizes)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Generated ' + ', '.join(f'{count} {label}' for label, count in written.items())
+            + f' in {time.perf_counter() - started:.0f}s'
+        ))
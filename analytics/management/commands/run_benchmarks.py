@@ -0,0 +1,205 @@
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.template import TemplateDoesNotExist
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from analytics.models import Report
+from analytics.reports import REPORT_WRITERS, build_report_data
+from drivers.models import Driver
+from fuel.models import FuelLog, Expense
+from maintenance.models import MaintenanceSchedule
+from trips.models import Trip
+from vehicles.models import Vehicle
+
+# (group, URL name, query string) of every read-only page and API endpoint
+BENCHMARK_PAGES = [
+    ('dashboard', 'analytics:dashboard', {}),
+    ('dashboard', 'accounts:dashboard', {}),
+    ('dashboard', 'trips:dashboard', {}),
+    ('dashboard', 'drivers:dashboard', {}),
+    ('dashboard', 'fuel:dashboard', {}),
+    ('dashboard', 'maintenance:dashboard', {}),
+    ('list', 'vehicles:vehicle_list', {}),
+    ('list', 'drivers:driver_list', {}),
+    ('list', 'trips:trip_list', {}),
+    ('list', 'fuel:fuel_log_list', {}),
+    ('list', 'fuel:expense_list', {}),
+    ('list', 'fuel:fuel_budget_list', {}),
+    ('list', 'maintenance:maintenance_list', {}),
+    ('list', 'analytics:reports', {}),
+    ('list', 'analytics:alerts', {}),
+    ('report', 'fuel:fuel_efficiency_report', {}),
+    ('api', 'analytics:api_kpi_history', {}),
+    ('api', 'trips:api_stats', {}),
+    ('api', 'fuel:api_fuel_stats', {}),
+    ('api', 'drivers:api_available_drivers', {}),
+    ('api', 'vehicles:api_available_vehicles', {}),
+    ('api', 'vehicles:api_check_capacity', {'vehicle_id': 'first_vehicle', 'cargo_weight': '1000'}),
+    ('api', 'search:search', {'q': 'harbour jordan'}),
+    ('api', 'v1:vehicle-list', {}),
+    ('api', 'v1:driver-list', {}),
+    ('api', 'v1:trip-list', {}),
+    ('api', 'v1:fuel_log-list', {}),
+    ('api', 'v1:expense-list', {}),
+    ('api', 'v1:maintenance-list', {}),
+]
+
+BENCHMARK_GROUPS = sorted({group for group, _, _ in BENCHMARK_PAGES} | {'generator'})
+
+# Slowdowns smaller than this are treated as noise when comparing to a baseline
+NOISE_FLOOR_MS = 5.0
+
+
+def _summary(timings, queries):
+    timings = sorted(timings)
+    return {
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        'min_ms': round(timings[0], 2),
+        'queries': queries,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Time every dashboard, list view, report generator and API endpoint against the current data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per target (after one warm-up run)')
+        parser.add_argument('--groups', default=','.join(BENCHMARK_GROUPS), help='Comma-separated groups to run')
+        parser.add_argument('--report-days', type=int, default=30, help='Report period length for report generators')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--baseline', help='Compare against a previous --output file')
+        parser.add_argument('--max-regression', type=float, default=1.25,
+                            help='Fail when a median is this many times slower than the baseline')
+
+    def handle(self, *args, **options):
+        groups = set(options['groups'].split(','))
+        unknown = groups - set(BENCHMARK_GROUPS)
+        if unknown:
+            raise CommandError(f'Unknown groups: {", ".join(sorted(unknown))}')
+
+        results = {}
+        skipped = []
+
+        # Runs in a transaction that is rolled back, so the throwaway login leaves nothing behind
+        with transaction.atomic():
+            if groups - {'generator'}:
+                self.run_pages(groups, options['repeat'], results, skipped)
+            if 'generator' in groups:
+                self.run_report_generators(options['repeat'], options['report_days'], results)
+            transaction.set_rollback(True)
+
+        for name in skipped:
+            self.stdout.write(self.style.WARNING(f'skip {name}'))
+
+        document = {
+            'generated_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'rows': {
+                model._meta.label: model.objects.count()
+                for model in [Vehicle, Driver, Trip, FuelLog, Expense, MaintenanceSchedule]
+            },
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(document, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['max_regression'])
+        self.stdout.write(self.style.SUCCESS(f'Benchmarked {len(results)} targets'))
+
+    def time_target(self, name, run, repeat, results):
+        run()
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+        results[name] = _summary(timings, len(queries))
+        summary = results[name]
+        self.stdout.write(
+            f'{name:<48} median={summary["median_ms"]:>9.1f}ms p95={summary["p95_ms"]:>9.1f}ms '
+            f'queries={summary["queries"]}'
+        )
+
+    def run_pages(self, groups, repeat, results, skipped):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and host != '*']
+        client = Client(HTTP_HOST=hosts[0].lstrip('.') if hosts else 'localhost')
+        user = get_user_model().objects.create_superuser('benchmark-runner', 'benchmark@runner.local', None)
+        client.force_login(user)
+        first_vehicle = Vehicle.objects.order_by('pk').values_list('pk', flat=True).first()
+        needs_vehicle = any(group in groups and 'first_vehicle' in query.values() for group, _, query in BENCHMARK_PAGES)
+        if first_vehicle is None and needs_vehicle:
+            raise CommandError('There are no vehicles to benchmark against; run generate_fleet first')
+
+        for group, url_name, query in BENCHMARK_PAGES:
+            if group not in groups:
+                continue
+            name = f'{group}:{url_name}'
+            params = {key: first_vehicle if value == 'first_vehicle' else value for key, value in query.items()}
+            url = reverse(url_name)
+
+            def run():
+                response = client.get(url, params)
+                if response.status_code != 200:
+                    raise CommandError(f'{url_name} returned {response.status_code}')
+
+            try:
+                self.time_target(name, run, repeat, results)
+            except TemplateDoesNotExist:
+                skipped.append(f'{name} (template missing)')
+
+    def run_report_generators(self, repeat, report_days, results):
+        today = timezone.now().date()
+        with tempfile.TemporaryDirectory() as tmp_dir, override_settings(REPORT_CACHE_BACKEND=''):
+            for report_type, _ in Report.REPORT_TYPES:
+                report = Report(
+                    report_type=report_type, title='Benchmark', period='custom',
+                    start_date=today - timedelta(days=report_days), end_date=today,
+                )
+                self.time_target(f'generator:{report_type}:data', lambda: build_report_data(report), repeat, results)
+
+                data = build_report_data(report)
+                for file_format, writer in REPORT_WRITERS.items():
+                    report.file_format = file_format
+                    path = os.path.join(tmp_dir, report.file_name)
+                    self.time_target(
+                        f'generator:{report_type}:{file_format}',
+                        lambda: writer(report, data, path), repeat, results,
+                    )
+
+    def compare(self, results, baseline_path, max_regression):
+        try:
+            with open(baseline_path) as baseline_file:
+                baseline = json.load(baseline_file)['results']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Cannot read baseline {baseline_path}: {exc}')
+
+        regressions = []
+        for name, summary in sorted(results.items()):
+            before = baseline.get(name)
+            if before is None:
+                continue
+            slower = summary['median_ms'] > before['median_ms'] * max_regression
+            if slower and summary['median_ms'] - before['median_ms'] > NOISE_FLOOR_MS:
+                regressions.append(f'{name}: {before["median_ms"]}ms -> {summary["median_ms"]}ms')
+            if summary['queries'] > before['queries']:
+                regressions.append(f'{name}: {before["queries"]} -> {summary["queries"]} queries')
+
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(f'No regressions against {baseline_path} (limit x{max_regression})')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from analytics.kpis import snapshot_kpis
+
+
+class Command(BaseCommand):
+    help = 'Record hourly and daily dashboard KPI snapshots (run from cron every few minutes)'
+
+    def handle(self, *args, **options):
+        kpis = snapshot_kpis()
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot recorded: {kpis['total_vehicles']} vehicles, "
+            f"{kpis['fleet_utilization']}% utilization"
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KPISnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kpi_type', models.CharField(choices=[('total_vehicles', 'Total Vehicles'), ('active_vehicles', 'Active Vehicles'), ('vehicles_on_trip', 'Vehicles on Trip'), ('vehicles_in_maintenance', 'Vehicles in Maintenance'), ('total_drivers', 'Total Drivers'), ('available_drivers', 'Available Drivers'), ('active_trips', 'Active Trips'), ('completed_trips', 'Completed Trips'), ('total_revenue', 'Total Revenue'), ('total_expenses', 'Total Expenses'), ('fuel_efficiency', 'Fuel Efficiency'), ('fleet_utilization', 'Fleet Utilization')], max_length=50)),
+                ('granularity', models.CharField(choices=[('hourly', 'Hourly'), ('daily', 'Daily')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('unit', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'KPI Snapshot',
+                'verbose_name_plural': 'KPI Snapshots',
+                'ordering': ['-bucket_start'],
+                'unique_together': {('kpi_type', 'granularity', 'bucket_start')},
+            },
+        ),
+    ]
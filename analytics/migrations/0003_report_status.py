@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:33
+
+from django.db import migrations, models
+
+
+def mark_generated_reports_done(apps, schema_editor):
+    Report = apps.get_model('analytics', 'Report')
+    Report.objects.filter(is_generated=True).update(status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_kpisnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('queued', 'Queued'), ('running', 'Running'), ('done', 'Generated'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.RunPython(mark_generated_reports_done, migrations.RunPython.noop),
+    ]
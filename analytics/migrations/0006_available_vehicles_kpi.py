@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_dataversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dashboardkpi',
+            name='kpi_type',
+            field=models.CharField(choices=[('total_vehicles', 'Total Vehicles'), ('active_vehicles', 'Active Vehicles'), ('available_vehicles', 'Available Vehicles'), ('vehicles_on_trip', 'Vehicles on Trip'), ('vehicles_in_maintenance', 'Vehicles in Maintenance'), ('total_drivers', 'Total Drivers'), ('available_drivers', 'Available Drivers'), ('active_trips', 'Active Trips'), ('completed_trips', 'Completed Trips'), ('total_revenue', 'Total Revenue'), ('total_expenses', 'Total Expenses'), ('fuel_efficiency', 'Fuel Efficiency'), ('fleet_utilization', 'Fleet Utilization')], max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='kpisnapshot',
+            name='kpi_type',
+            field=models.CharField(choices=[('total_vehicles', 'Total Vehicles'), ('active_vehicles', 'Active Vehicles'), ('available_vehicles', 'Available Vehicles'), ('vehicles_on_trip', 'Vehicles on Trip'), ('vehicles_in_maintenance', 'Vehicles in Maintenance'), ('total_drivers', 'Total Drivers'), ('available_drivers', 'Available Drivers'), ('active_trips', 'Active Trips'), ('completed_trips', 'Completed Trips'), ('total_revenue', 'Total Revenue'), ('total_expenses', 'Total Expenses'), ('fuel_efficiency', 'Fuel Efficiency'), ('fleet_utilization', 'Fleet Utilization')], max_length=50),
+        ),
+    ]
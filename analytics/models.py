@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
+from datetime import timedelta
 from decimal import Decimal
 import json
 
@@ -8,6 +10,7 @@ class DashboardKPI(models.Model):
     KPI_TYPES = [
         ('total_vehicles', 'Total Vehicles'),
         ('active_vehicles', 'Active Vehicles'),
+        ('available_vehicles', 'Available Vehicles'),
         ('vehicles_on_trip', 'Vehicles on Trip'),
         ('vehicles_in_maintenance', 'Vehicles in Maintenance'),
         ('total_drivers', 'Total Drivers'),
@@ -34,6 +37,30 @@ class DashboardKPI(models.Model):
         return f"{self.get_kpi_type_display()}: {self.value} {self.unit}"
 
 
+class KPISnapshot(models.Model):
+    GRANULARITY_CHOICES = [
+        ('hourly', 'Hourly'),
+        ('daily', 'Daily'),
+    ]
+    
+    kpi_type = models.CharField(max_length=50, choices=DashboardKPI.KPI_TYPES)
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    value = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    unit = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "KPI Snapshot"
+        verbose_name_plural = "KPI Snapshots"
+        ordering = ['-bucket_start']
+        unique_together = ['kpi_type', 'granularity', 'bucket_start']
+    
+    def __str__(self):
+        return f"{self.get_kpi_type_display()} @ {self.bucket_start} ({self.granularity}): {self.value} {self.unit}"
+
+
 class Report(models.Model):
     REPORT_TYPES = [
         ('trip_summary', 'Trip Summary'),
@@ -56,6 +83,22 @@ class Report(models.Model):
         ('custom', 'Custom'),
     ]
     
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Generated'),
+        ('failed', 'Failed'),
+    ]
+    
+    IN_PROGRESS_STATUSES = ['queued', 'running']
+    
+    FILE_EXTENSIONS = {
+        'pdf': 'pdf',
+        'excel': 'xlsx',
+        'csv': 'csv',
+    }
+    
     report_type = models.CharField(max_length=30, choices=REPORT_TYPES)
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -67,6 +110,8 @@ class Report(models.Model):
     file_path = models.CharField(max_length=500, blank=True)  # Path to generated file
     file_format = models.CharField(max_length=10, choices=[('pdf', 'PDF'), ('excel', 'Excel'), ('csv', 'CSV')], default='pdf')
     is_generated = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    error_message = models.TextField(blank=True)
     generated_at = models.DateTimeField(null=True, blank=True)
     generated_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, related_name='generated_reports')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -82,14 +127,26 @@ class Report(models.Model):
     
     @property
     def file_name(self):
-        return f"{self.report_type}_{self.period}_{self.start_date}_{self.end_date}.{self.file_format}"
+        extension = self.FILE_EXTENSIONS.get(self.file_format, self.file_format)
+        return f"{self.report_type}_{self.period}_{self.start_date}_{self.end_date}.{extension}"
     
     def get_status_display(self):
         """Return human-readable status"""
-        if self.is_generated:
-            return "Generated"
-        else:
-            return "Pending"
+        return dict(self.STATUS_CHOICES).get(self.status, "Pending")
+    
+    @staticmethod
+    def _stale_before():
+        return timezone.now() - timedelta(seconds=settings.REPORT_STALE_AFTER)
+    
+    @classmethod
+    def in_progress_filter(cls):
+        """Reports queued or running within REPORT_STALE_AFTER; older ones were lost by their worker or broker"""
+        return models.Q(status__in=cls.IN_PROGRESS_STATUSES, updated_at__gte=cls._stale_before())
+    
+    @property
+    def is_in_progress(self):
+        """Whether a generation is still expected to finish, so another must not be queued"""
+        return self.status in self.IN_PROGRESS_STATUSES and self.updated_at >= self._stale_before()
 
 
 class Alert(models.Model):
@@ -141,6 +198,10 @@ class Alert(models.Model):
         verbose_name = "Alert"
         verbose_name_plural = "Alerts"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='alert_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='alert_status_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.severity.upper()}"
@@ -224,6 +285,9 @@ class Notification(models.Model):
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at', 'is_read'], name='notif_recipient_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.recipient.username} - {self.title}"
@@ -234,3 +298,18 @@ class Notification(models.Model):
             self.is_read = True
             self.read_at = timezone.now()
             self.save()
+
+
+class DataVersion(models.Model):
+    """Change counter of one polled resource (see analytics.versions)"""
+    resource = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = "Data Version"
+        verbose_name_plural = "Data Versions"
+        ordering = ['resource']
+    
+    def __str__(self):
+        return f"{self.resource}: {self.version}"
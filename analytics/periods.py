@@ -0,0 +1,25 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from datetime import datetime, time, timedelta
+
+
+def parse_day(value):
+    """A YYYY-MM-DD query parameter as a date, or None when it is missing or not a real date"""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def day_start(day):
+    """Aware midnight at the start of ``day``"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def day_range(field, start_date, end_date):
+    """Filter kwargs for rows whose ``field`` falls on start_date..end_date (inclusive)
+
+    Unlike ``field__date__gte`` this compares the raw column against datetime
+    bounds, so the database can use an index on ``field``.
+    """
+    return {f'{field}__gte': day_start(start_date), f'{field}__lt': day_start(end_date + timedelta(days=1))}
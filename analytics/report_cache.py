@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.utils import timezone
+from .models import Alert
+from .periods import day_range
+from vehicles.models import Vehicle
+from drivers.models import Driver, DriverPerformance
+from trips.models import Trip
+from fuel.models import FuelLog, Expense
+from maintenance.models import MaintenanceSchedule, MaintenancePart
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger('fleetflow')
+
+# Tables each report reads: (queryset builder, date field bounding the report
+# window or None when the report reads the whole table)
+REPORT_SOURCES = {
+    'trip_summary': [
+        (Trip.objects.all, 'created_at'),
+    ],
+    'vehicle_performance': [
+        (Vehicle.objects.all, None),
+        (Trip.objects.all, 'created_at'),
+        (FuelLog.objects.all, 'fuel_date'),
+    ],
+    'driver_performance': [
+        (Driver.objects.all, None),
+        (Trip.objects.all, 'created_at'),
+    ],
+    'fuel_consumption': [
+        (FuelLog.objects.all, 'fuel_date'),
+    ],
+    'expense_report': [
+        (Expense.objects.all, 'expense_date'),
+    ],
+    'maintenance_summary': [
+        (MaintenanceSchedule.objects.all, 'scheduled_date'),
+        (MaintenancePart.objects.all, 'maintenance_schedule__scheduled_date'),
+    ],
+    'revenue_report': [
+        (FuelLog.objects.all, 'fuel_date'),
+        (Expense.objects.all, 'expense_date'),
+        (MaintenanceSchedule.objects.all, 'scheduled_date'),
+        (Trip.objects.all, 'created_at'),
+    ],
+    'fleet_utilization': [
+        (Vehicle.objects.all, None),
+        (Trip.objects.all, 'created_at'),
+    ],
+    'safety_report': [
+        (DriverPerformance.objects.all, None),
+        (Driver.objects.all, None),
+        (Alert.objects.all, 'created_at'),
+    ],
+}
+
+# Reports whose figures depend on today's date (license expiry windows)
+DATE_DEPENDENT_REPORTS = {'safety_report'}
+
+
+def data_watermark(report_type, start_date, end_date):
+    """Row count and latest update of every source table within the report window
+
+    Any insert, delete or save() inside the window changes the watermark.
+    Bulk ``QuerySet.update()`` calls skip ``auto_now`` and are not detected.
+    """
+    watermark = []
+    for queryset, date_field in REPORT_SOURCES.get(report_type, []):
+        rows = queryset()
+        if date_field:
+            rows = rows.filter(**day_range(date_field, start_date, end_date))
+        totals = rows.order_by().aggregate(count=Count('id'), latest=Max('updated_at'))
+        watermark.append([rows.model._meta.label, totals['count'], totals['latest']])
+
+    if report_type in DATE_DEPENDENT_REPORTS:
+        watermark.append(['today', timezone.now().date()])
+    return watermark
+
+
+def report_cache_key(report):
+    """Hash of the report inputs and the current data watermark"""
+    inputs = {
+        'report_type': report.report_type,
+        'start_date': report.start_date,
+        'end_date': report.end_date,
+        'parameters': report.parameters or {},
+        'watermark': data_watermark(report.report_type, report.start_date, report.end_date),
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return 'report-data:' + hashlib.sha256(encoded).hexdigest()
+
+
+class DjangoCacheBackend:
+    """Store report data in a configured Django cache"""
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'REPORT_CACHE_ALIAS', 'default')]
+        self.timeout = getattr(settings, 'REPORT_CACHE_TIMEOUT', None)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, data):
+        self.cache.set(key, data, self.timeout)
+
+
+class FileCacheBackend:
+    """Store report data as JSON files named after the cache key"""
+
+    def __init__(self):
+        self.directory = getattr(settings, 'REPORT_CACHE_DIR', os.path.join(settings.BASE_DIR, 'cache', 'reports'))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key.replace(':', '_') + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key)) as cached:
+                return json.load(cached)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as cached:
+            json.dump(data, cached)
+        os.replace(tmp_path, path)
+
+
+REPORT_CACHE_BACKENDS = {
+    'django': DjangoCacheBackend,
+    'file': FileCacheBackend,
+}
+
+
+def get_report_cache():
+    """Configured cache backend, or None when report caching is disabled"""
+    backend = getattr(settings, 'REPORT_CACHE_BACKEND', 'django')
+    if not backend:
+        return None
+    return REPORT_CACHE_BACKENDS[backend]()
+
+
+def cached_report_data(report, compute):
+    """Return cached data for the report's inputs, computing and storing it on a miss"""
+    cache = get_report_cache()
+    if cache is None:
+        return compute()
+
+    key = report_cache_key(report)
+    data = cache.get(key)
+    if data is not None:
+        logger.info('Report %s served from cache (%s)', report.pk, key)
+        return data
+
+    data = compute()
+    cache.set(key, data)
+    return data
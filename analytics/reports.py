@@ -0,0 +1,710 @@
+from django.conf import settings
+from django.db.models import Count, Sum, Avg, Q
+from django.utils import timezone
+from datetime import datetime, timedelta
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from .exports import (
+    TRIP_EXPORT_COLUMNS, FUEL_LOG_EXPORT_COLUMNS, EXPENSE_EXPORT_COLUMNS, queryset_rows,
+)
+from .models import Alert
+from .periods import day_range
+from .report_cache import cached_report_data
+from vehicles.models import Vehicle
+from drivers.models import Driver, DriverPerformance
+from trips.models import Trip
+from fuel.models import FuelLog, Expense
+from maintenance.models import MaintenanceSchedule, MaintenancePart
+import csv
+import logging
+import os
+
+logger = logging.getLogger('fleetflow')
+
+# Generated files live under MEDIA_ROOT/<REPORTS_DIR>/
+REPORTS_DIR = 'reports'
+
+VEHICLE_PERFORMANCE_COLUMNS = [
+    ('Vehicle', 'vehicle_name'),
+    ('License Plate', 'license_plate'),
+    ('Total Trips', 'total_trips'),
+    ('Completed Trips', 'completed_trips'),
+    ('Total Distance (km)', 'total_distance'),
+    ('Total Fuel (L)', 'total_fuel'),
+    ('Fuel Efficiency (km/l)', 'fuel_efficiency'),
+]
+
+DRIVER_PERFORMANCE_COLUMNS = [
+    ('Driver', 'driver_name'),
+    ('Total Trips', 'total_trips'),
+    ('Completed Trips', 'completed_trips'),
+    ('Cancelled Trips', 'cancelled_trips'),
+    ('Total Distance (km)', 'total_distance'),
+    ('Completion Rate (%)', 'completion_rate'),
+]
+
+LOW_SCORE_DRIVER_COLUMNS = [
+    ('Driver', 'driver_name'),
+    ('Safety Score', 'safety_score'),
+    ('Accidents', 'accidents_count'),
+    ('Violations', 'violations_count'),
+]
+
+# Drivers below this safety score are listed in the safety report
+LOW_SAFETY_SCORE = 70
+
+
+def generate_trip_summary_report(start_date, end_date):
+    """Generate trip summary report data"""
+    trips = Trip.objects.filter(
+        **day_range('created_at', start_date, end_date)
+    )
+    
+    data = {
+        'total_trips': trips.count(),
+        'completed_trips': trips.filter(status='completed').count(),
+        'cancelled_trips': trips.filter(status='cancelled').count(),
+        'active_trips': trips.filter(status__in=['dispatched', 'in_progress']).count(),
+        'trips_by_status': dict(trips.values('status').annotate(count=Count('id')).values_list('status', 'count')),
+        'trips_by_priority': dict(trips.values('priority').annotate(count=Count('id')).values_list('priority', 'count')),
+    }
+    
+    return data
+
+
+def generate_vehicle_performance_report(start_date, end_date):
+    """Generate vehicle performance report data"""
+    vehicles = Vehicle.objects.filter(is_active=True).values('id', 'name', 'license_plate')
+    
+    # One grouped query per source table instead of several queries per vehicle
+    trip_stats = {
+        row['vehicle_id']: row
+        for row in Trip.objects.filter(
+            vehicle__is_active=True,
+            **day_range('created_at', start_date, end_date)
+        ).order_by().values('vehicle_id').annotate(
+            total_trips=Count('id'),
+            completed_trips=Count('id', filter=Q(status='completed')),
+            total_distance=Sum('actual_distance', filter=Q(status='completed')),
+        )
+    }
+    
+    fuel_totals = dict(
+        FuelLog.objects.filter(
+            vehicle__is_active=True,
+            **day_range('fuel_date', start_date, end_date)
+        ).order_by().values('vehicle_id').annotate(
+            total=Sum('fuel_liters')
+        ).values_list('vehicle_id', 'total')
+    )
+    
+    vehicle_data = []
+    
+    for vehicle in vehicles:
+        trips = trip_stats.get(vehicle['id'], {})
+        total_distance = trips.get('total_distance') or 0
+        total_fuel = fuel_totals.get(vehicle['id']) or 0
+        
+        fuel_efficiency = (float(total_distance) / float(total_fuel)) if total_fuel > 0 else 0
+        
+        vehicle_data.append({
+            'vehicle_name': vehicle['name'],
+            'license_plate': vehicle['license_plate'],
+            'total_trips': trips.get('total_trips', 0),
+            'completed_trips': trips.get('completed_trips', 0),
+            'total_distance': float(total_distance),
+            'total_fuel': float(total_fuel),
+            'fuel_efficiency': round(fuel_efficiency, 2),
+        })
+    
+    return {'vehicles': vehicle_data}
+
+
+def generate_driver_performance_report(start_date, end_date):
+    """Generate driver performance report data"""
+    in_period = Q(
+        **day_range('trips__created_at', start_date, end_date)
+    )
+    
+    drivers = Driver.objects.filter(is_active=True).annotate(
+        total_trips=Count('trips', filter=in_period),
+        completed_trips=Count('trips', filter=in_period & Q(trips__status='completed')),
+        cancelled_trips=Count('trips', filter=in_period & Q(trips__status='cancelled')),
+        total_distance=Sum('trips__actual_distance', filter=in_period & Q(trips__status='completed')),
+    ).values(
+        'first_name', 'last_name', 'total_trips', 'completed_trips',
+        'cancelled_trips', 'total_distance'
+    ).order_by('last_name', 'first_name')  # GROUP BY queries drop Meta.ordering
+    
+    driver_data = []
+    
+    for driver in drivers:
+        total_trips = driver['total_trips']
+        completed_trips = driver['completed_trips']
+        
+        driver_data.append({
+            'driver_name': f"{driver['first_name']} {driver['last_name']}",
+            'total_trips': total_trips,
+            'completed_trips': completed_trips,
+            'cancelled_trips': driver['cancelled_trips'],
+            'total_distance': float(driver['total_distance'] or 0),
+            'completion_rate': round((completed_trips / total_trips * 100) if total_trips > 0 else 0, 2),
+        })
+    
+    return {'drivers': driver_data}
+
+
+def generate_fuel_consumption_report(start_date, end_date):
+    """Generate fuel consumption report data"""
+    fuel_logs = FuelLog.objects.filter(
+        **day_range('fuel_date', start_date, end_date)
+    )
+    
+    data = {
+        'total_fuel_consumed': float(fuel_logs.aggregate(total=Sum('fuel_liters'))['total'] or 0),
+        'total_fuel_cost': float(fuel_logs.aggregate(total=Sum('total_cost'))['total'] or 0),
+        'average_cost_per_liter': float(fuel_logs.aggregate(avg=Avg('cost_per_liter'))['avg'] or 0),
+        'fuel_by_type': {
+            fuel_type: {'total_liters': float(total_liters or 0), 'total_cost': float(total_cost or 0)}
+            for fuel_type, total_liters, total_cost in fuel_logs.values('fuel_type').annotate(
+                total_liters=Sum('fuel_liters'),
+                total_cost=Sum('total_cost')
+            ).values_list('fuel_type', 'total_liters', 'total_cost')
+        },
+    }
+    
+    return data
+
+
+def generate_expense_report(start_date, end_date):
+    """Generate expense report data"""
+    expenses = Expense.objects.filter(
+        expense_date__gte=start_date,
+        expense_date__lte=end_date
+    )
+    
+    data = {
+        'total_expenses': float(expenses.aggregate(total=Sum('amount'))['total'] or 0),
+        'expenses_by_type': {
+            expense_type: {'total_amount': float(total_amount or 0), 'count': count}
+            for expense_type, total_amount, count in expenses.values('expense_type').annotate(
+                total_amount=Sum('amount'),
+                count=Count('id')
+            ).values_list('expense_type', 'total_amount', 'count')
+        },
+    }
+    
+    return data
+
+
+def generate_maintenance_summary_report(start_date, end_date):
+    """Generate maintenance summary report data"""
+    schedules = MaintenanceSchedule.objects.filter(
+        **day_range('scheduled_date', start_date, end_date)
+    )
+    
+    totals = schedules.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        scheduled=Count('id', filter=Q(status='scheduled')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        cancelled=Count('id', filter=Q(status='cancelled')),
+        estimated_cost=Sum('estimated_cost'),
+        actual_cost=Sum('actual_cost'),
+    )
+    
+    parts_cost = MaintenancePart.objects.filter(
+        maintenance_schedule__in=schedules
+    ).aggregate(total=Sum('total_cost'))['total'] or 0
+    
+    data = {
+        'total_maintenance': totals['total'],
+        'completed_maintenance': totals['completed'],
+        'scheduled_maintenance': totals['scheduled'],
+        'in_progress_maintenance': totals['in_progress'],
+        'cancelled_maintenance': totals['cancelled'],
+        'total_estimated_cost': float(totals['estimated_cost'] or 0),
+        'total_actual_cost': float(totals['actual_cost'] or 0),
+        'total_parts_cost': float(parts_cost),
+        'maintenance_by_type': {
+            type_name: {'count': count, 'actual_cost': float(actual_cost or 0)}
+            for type_name, count, actual_cost in schedules.values('maintenance_type__name').annotate(
+                count=Count('id'),
+                actual_cost=Sum('actual_cost')
+            ).values_list('maintenance_type__name', 'count', 'actual_cost')
+        },
+    }
+    
+    return data
+
+
+def generate_revenue_report(start_date, end_date):
+    """Generate revenue and operating cost report data"""
+    fuel_cost = FuelLog.objects.filter(
+        **day_range('fuel_date', start_date, end_date)
+    ).aggregate(total=Sum('total_cost'))['total'] or 0
+    
+    expenses = Expense.objects.filter(
+        expense_date__gte=start_date,
+        expense_date__lte=end_date
+    ).aggregate(total=Sum('amount'))['total'] or 0
+    
+    maintenance_cost = MaintenanceSchedule.objects.filter(
+        status='completed',
+        **day_range('scheduled_date', start_date, end_date)
+    ).aggregate(total=Sum('actual_cost'))['total'] or 0
+    
+    total_distance = Trip.objects.filter(
+        status='completed',
+        **day_range('created_at', start_date, end_date)
+    ).aggregate(total=Sum('actual_distance'))['total'] or 0
+    
+    total_revenue = 0  # Revenue is not tracked on trips yet
+    total_cost = float(fuel_cost) + float(expenses) + float(maintenance_cost)
+    
+    data = {
+        'total_revenue': float(total_revenue),
+        'total_fuel_cost': float(fuel_cost),
+        'total_expenses': float(expenses),
+        'total_maintenance_cost': float(maintenance_cost),
+        'total_operational_cost': total_cost,
+        'total_distance': float(total_distance),
+        'cost_per_km': round(total_cost / float(total_distance), 2) if total_distance else 0,
+        'net_result': float(total_revenue) - total_cost,
+    }
+    
+    return data
+
+
+def generate_fleet_utilization_report(start_date, end_date):
+    """Generate fleet utilization report data"""
+    vehicles_by_status = dict(
+        Vehicle.objects.filter(is_active=True).order_by().values('status').annotate(
+            count=Count('id')
+        ).values_list('status', 'count')
+    )
+    total_vehicles = sum(vehicles_by_status.values())
+    
+    trip_totals = Trip.objects.filter(
+        vehicle__is_active=True,
+        **day_range('created_at', start_date, end_date)
+    ).aggregate(
+        total_trips=Count('id'),
+        vehicles_used=Count('vehicle', distinct=True),
+    )
+    
+    data = {
+        'total_vehicles': total_vehicles,
+        'vehicles_by_status': vehicles_by_status,
+        'total_trips': trip_totals['total_trips'],
+        'vehicles_used': trip_totals['vehicles_used'],
+        'utilization_rate': round(trip_totals['vehicles_used'] / total_vehicles * 100, 2) if total_vehicles else 0,
+        'trips_per_vehicle': round(trip_totals['total_trips'] / total_vehicles, 2) if total_vehicles else 0,
+    }
+    
+    return data
+
+
+def generate_safety_report(start_date, end_date):
+    """Generate driver safety report data"""
+    today = timezone.now().date()
+    
+    performance = DriverPerformance.objects.filter(driver__is_active=True)
+    totals = performance.aggregate(
+        average_safety_score=Avg('safety_score'),
+        total_accidents=Sum('accidents_count'),
+        total_violations=Sum('violations_count'),
+    )
+    
+    licenses = Driver.objects.filter(is_active=True).aggregate(
+        expired=Count('id', filter=Q(license_expiry__lte=today)),
+        expiring=Count('id', filter=Q(license_expiry__gt=today, license_expiry__lte=today + timedelta(days=30))),
+    )
+    
+    safety_incidents = Alert.objects.filter(
+        alert_type='safety_incident',
+        **day_range('created_at', start_date, end_date)
+    ).count()
+    
+    data = {
+        'average_safety_score': round(float(totals['average_safety_score'] or 0), 2),
+        'total_accidents': totals['total_accidents'] or 0,
+        'total_violations': totals['total_violations'] or 0,
+        'safety_incidents': safety_incidents,
+        'expired_licenses': licenses['expired'],
+        'expiring_licenses': licenses['expiring'],
+        'low_score_drivers': [
+            {
+                'driver_name': f"{row['driver__first_name']} {row['driver__last_name']}",
+                'safety_score': float(row['safety_score']),
+                'accidents_count': row['accidents_count'],
+                'violations_count': row['violations_count'],
+            }
+            for row in performance.filter(safety_score__lt=LOW_SAFETY_SCORE).order_by('safety_score').values(
+                'driver__first_name', 'driver__last_name', 'safety_score',
+                'accidents_count', 'violations_count'
+            )
+        ],
+    }
+    
+    return data
+
+
+def build_report_data(report):
+    """Compute the data payload for a report, reusing cached results for unchanged inputs"""
+    generator = REPORT_GENERATORS.get(report.report_type)
+    if generator is None:
+        return {}
+    return cached_report_data(report, lambda: generator(report.start_date, report.end_date))
+
+
+def _metric_rows(data, metrics):
+    """Rows for a Metric/Value summary block"""
+    yield ['Metric', 'Value']
+    for label, key in metrics:
+        yield [label, data.get(key, 0)]
+
+
+def _breakdown_rows(breakdown, headers, fields):
+    """Rows for a {key: {field: value}} or {key: value} breakdown block"""
+    yield headers
+    for key, values in breakdown.items():
+        if isinstance(values, dict):
+            yield [key] + [values.get(field, 0) for field in fields]
+        else:
+            yield [key, values]
+
+
+def _table_rows(records, columns):
+    """Rows for a list of dicts, one row per record"""
+    yield [header for header, _ in columns]
+    for record in records:
+        yield [record.get(key, '') for _, key in columns]
+
+
+def report_csv_rows(report, data):
+    """Yield CSV rows for any report type"""
+    yield [report.get_report_type_display() + ' Report']
+    yield ['Period', f'{report.start_date} to {report.end_date}']
+    yield []
+    
+    if report.report_type == 'trip_summary':
+        yield from _metric_rows(data, [
+            ('Total Trips', 'total_trips'),
+            ('Completed Trips', 'completed_trips'),
+            ('Cancelled Trips', 'cancelled_trips'),
+            ('Active Trips', 'active_trips'),
+        ])
+        yield []
+        yield from _breakdown_rows(data.get('trips_by_status', {}), ['Status', 'Trips'], [])
+        yield []
+        yield from _breakdown_rows(data.get('trips_by_priority', {}), ['Priority', 'Trips'], [])
+    
+    elif report.report_type == 'vehicle_performance':
+        yield from _table_rows(data.get('vehicles', []), VEHICLE_PERFORMANCE_COLUMNS)
+    
+    elif report.report_type == 'driver_performance':
+        yield from _table_rows(data.get('drivers', []), DRIVER_PERFORMANCE_COLUMNS)
+    
+    elif report.report_type == 'fuel_consumption':
+        yield from _metric_rows(data, [
+            ('Total Fuel Consumed (L)', 'total_fuel_consumed'),
+            ('Total Fuel Cost', 'total_fuel_cost'),
+            ('Average Cost per Liter', 'average_cost_per_liter'),
+        ])
+        yield []
+        yield from _breakdown_rows(
+            data.get('fuel_by_type', {}),
+            ['Fuel Type', 'Liters', 'Cost'],
+            ['total_liters', 'total_cost'],
+        )
+    
+    elif report.report_type == 'expense_report':
+        yield from _metric_rows(data, [('Total Expenses', 'total_expenses')])
+        yield []
+        yield from _breakdown_rows(
+            data.get('expenses_by_type', {}),
+            ['Expense Type', 'Amount', 'Count'],
+            ['total_amount', 'count'],
+        )
+    
+    elif report.report_type == 'maintenance_summary':
+        yield from _metric_rows(data, [
+            ('Total Maintenance', 'total_maintenance'),
+            ('Completed', 'completed_maintenance'),
+            ('Scheduled', 'scheduled_maintenance'),
+            ('In Progress', 'in_progress_maintenance'),
+            ('Cancelled', 'cancelled_maintenance'),
+            ('Estimated Cost', 'total_estimated_cost'),
+            ('Actual Cost', 'total_actual_cost'),
+            ('Parts Cost', 'total_parts_cost'),
+        ])
+        yield []
+        yield from _breakdown_rows(
+            data.get('maintenance_by_type', {}),
+            ['Maintenance Type', 'Count', 'Actual Cost'],
+            ['count', 'actual_cost'],
+        )
+    
+    elif report.report_type == 'revenue_report':
+        yield from _metric_rows(data, [
+            ('Total Revenue', 'total_revenue'),
+            ('Fuel Cost', 'total_fuel_cost'),
+            ('Expenses', 'total_expenses'),
+            ('Maintenance Cost', 'total_maintenance_cost'),
+            ('Total Operational Cost', 'total_operational_cost'),
+            ('Total Distance (km)', 'total_distance'),
+            ('Cost per km', 'cost_per_km'),
+            ('Net Result', 'net_result'),
+        ])
+    
+    elif report.report_type == 'fleet_utilization':
+        yield from _metric_rows(data, [
+            ('Total Vehicles', 'total_vehicles'),
+            ('Vehicles Used', 'vehicles_used'),
+            ('Total Trips', 'total_trips'),
+            ('Utilization Rate (%)', 'utilization_rate'),
+            ('Trips per Vehicle', 'trips_per_vehicle'),
+        ])
+        yield []
+        yield from _breakdown_rows(data.get('vehicles_by_status', {}), ['Status', 'Vehicles'], [])
+    
+    elif report.report_type == 'safety_report':
+        yield from _metric_rows(data, [
+            ('Average Safety Score', 'average_safety_score'),
+            ('Accidents', 'total_accidents'),
+            ('Violations', 'total_violations'),
+            ('Safety Incidents', 'safety_incidents'),
+            ('Expired Licenses', 'expired_licenses'),
+            ('Licenses Expiring in 30 Days', 'expiring_licenses'),
+        ])
+        yield []
+        yield from _table_rows(data.get('low_score_drivers', []), LOW_SCORE_DRIVER_COLUMNS)
+
+
+def write_csv_report(report, data, path):
+    """Write CSV report"""
+    with open(path, 'w', newline='') as output:
+        writer = csv.writer(output)
+        for row in report_csv_rows(report, data):
+            writer.writerow(row)
+
+
+def _trips_in_period(start_date, end_date):
+    return Trip.objects.filter(
+        **day_range('created_at', start_date, end_date)
+    ).order_by('created_at')
+
+
+def _fuel_logs_in_period(start_date, end_date):
+    return FuelLog.objects.filter(
+        **day_range('fuel_date', start_date, end_date)
+    ).order_by('fuel_date')
+
+
+def _expenses_in_period(start_date, end_date):
+    return Expense.objects.filter(
+        expense_date__gte=start_date,
+        expense_date__lte=end_date
+    ).order_by('expense_date')
+
+
+# Raw rows appended as an extra sheet: (sheet title, queryset builder, columns)
+REPORT_DETAIL_SHEETS = {
+    'trip_summary': ('Trips', _trips_in_period, TRIP_EXPORT_COLUMNS),
+    'fuel_consumption': ('Fuel Logs', _fuel_logs_in_period, FUEL_LOG_EXPORT_COLUMNS),
+    'expense_report': ('Expenses', _expenses_in_period, EXPENSE_EXPORT_COLUMNS),
+}
+
+SUMMARY_SHEET_TITLES = {
+    'vehicle_performance': 'Vehicles',
+    'driver_performance': 'Drivers',
+}
+
+
+def report_sheets(report, data):
+    """Yield (sheet title, rows) pairs describing a report's workbook"""
+    yield SUMMARY_SHEET_TITLES.get(report.report_type, 'Summary'), report_csv_rows(report, data)
+    
+    detail = REPORT_DETAIL_SHEETS.get(report.report_type)
+    if detail:
+        title, queryset, columns = detail
+        yield title, queryset_rows(queryset(report.start_date, report.end_date), columns)
+
+
+def _excel_value(value):
+    """Excel cannot store timezone-aware datetimes"""
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+def write_excel_report(report, data, path):
+    """Write XLSX report with a write-only (streaming) workbook"""
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    
+    for title, rows in report_sheets(report, data):
+        sheet = workbook.create_sheet(title=title[:31])
+        sheet.freeze_panes = 'A2'
+        rows = iter(rows)
+        
+        header = []
+        for value in next(rows, []):
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.font = header_font
+            header.append(cell)
+        sheet.append(header)
+        for row in rows:
+            sheet.append([_excel_value(value) for value in row])
+    
+    workbook.save(path)
+
+
+# Long tables are split into fixed-size chunks so platypus never has to
+# re-split one huge table on every page
+PDF_TABLE_CHUNK_ROWS = 100
+
+PDF_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e9ecef')),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+])
+
+
+def _row_blocks(rows):
+    """Split report rows into the blocks separated by blank rows"""
+    block = []
+    for row in rows:
+        if row:
+            block.append(row)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _pdf_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return f'{value:,.2f}'
+    return str(value)
+
+
+def _pdf_tables(block, width):
+    """Yield one or more tables for a header + rows block, repeating the header"""
+    header, body = block[0], block[1:]
+    col_widths = [width / len(header)] * len(header)
+    
+    for start in range(0, max(len(body), 1), PDF_TABLE_CHUNK_ROWS):
+        rows = [header] + [[_pdf_value(value) for value in row] for row in body[start:start + PDF_TABLE_CHUNK_ROWS]]
+        yield Table(rows, colWidths=col_widths, repeatRows=1, style=PDF_TABLE_STYLE, hAlign='LEFT')
+
+
+def _draw_page_number(canvas, doc):
+    canvas.saveState()
+    canvas.setFont('Helvetica', 8)
+    canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 10 * mm, f'Page {doc.page}')
+    canvas.restoreState()
+
+
+def write_pdf_report(report, data, path):
+    """Write PDF report with reportlab platypus, one table per summary block"""
+    doc = SimpleDocTemplate(
+        path, pagesize=A4, title=report.title,
+        leftMargin=15 * mm, rightMargin=15 * mm, topMargin=15 * mm, bottomMargin=20 * mm,
+    )
+    styles = getSampleStyleSheet()
+    rows = report_csv_rows(report, data)
+    
+    # The first two rows are the report heading and period
+    title = next(rows)[0]
+    period = next(rows)
+    story = [
+        Paragraph(title, styles['Title']),
+        Paragraph(f'{period[0]}: {period[1]}', styles['Normal']),
+        Spacer(1, 6 * mm),
+    ]
+    
+    for block in _row_blocks(rows):
+        story.extend(_pdf_tables(block, doc.width))
+        story.append(Spacer(1, 6 * mm))
+    
+    doc.build(story, onFirstPage=_draw_page_number, onLaterPages=_draw_page_number)
+
+
+REPORT_GENERATORS = {
+    'trip_summary': generate_trip_summary_report,
+    'vehicle_performance': generate_vehicle_performance_report,
+    'driver_performance': generate_driver_performance_report,
+    'fuel_consumption': generate_fuel_consumption_report,
+    'expense_report': generate_expense_report,
+    'maintenance_summary': generate_maintenance_summary_report,
+    'revenue_report': generate_revenue_report,
+    'fleet_utilization': generate_fleet_utilization_report,
+    'safety_report': generate_safety_report,
+}
+
+REPORT_WRITERS = {
+    'csv': write_csv_report,
+    'excel': write_excel_report,
+    'pdf': write_pdf_report,
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'excel': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+
+def report_file_path(report):
+    """Absolute path of a report's generated file"""
+    return os.path.join(settings.MEDIA_ROOT, report.file_path)
+
+
+def run_report(report):
+    """Generate a report's data and file, tracking its status on the model"""
+    report.status = 'running'
+    report.error_message = ''
+    report.save(update_fields=['status', 'error_message', 'updated_at'])
+    
+    tmp_path = None
+    try:
+        data = build_report_data(report)
+        
+        relative_path = os.path.join(REPORTS_DIR, f'{report.pk}_{report.file_name}')
+        path = os.path.join(settings.MEDIA_ROOT, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Write to a temporary file so a half-written report is never served
+        tmp_path = f'{path}.tmp'
+        REPORT_WRITERS[report.file_format](report, data, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        logger.exception('Report %s generation failed', report.pk)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        report.status = 'failed'
+        report.error_message = str(exc)
+        report.save(update_fields=['status', 'error_message', 'updated_at'])
+        return report
+    
+    report.data = data
+    report.file_path = relative_path
+    report.status = 'done'
+    report.is_generated = True
+    report.generated_at = timezone.now()
+    report.save()
+    return report
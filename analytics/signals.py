@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from .versions import VERSIONED_MODELS, bump_version
+
+
+def bump_model_version(sender, instance, using=None, **kwargs):
+    bump_version(VERSIONED_MODELS[sender._meta.label], using=using)
+
+
+for model_label in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model_label, dispatch_uid=f'versions_save_{model_label}')
+    post_delete.connect(bump_model_version, sender=model_label, dispatch_uid=f'versions_delete_{model_label}')
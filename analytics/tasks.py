@@ -0,0 +1,11 @@
+from celery import shared_task
+from .models import Report
+from .reports import run_report
+
+
+@shared_task
+def generate_report_task(report_id):
+    """Generate a report's data and file in the background"""
+    report = Report.objects.get(pk=report_id)
+    run_report(report)
+    return report.file_path
@@ -0,0 +1,58 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from analytics.kpis import compute_trend, get_dashboard_kpis
+from analytics.models import DashboardKPI
+from analytics.periods import parse_day
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are only checked on SQLite')
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_their_indexes(self):
+        call_command('check_query_plans', stdout=StringIO())
+
+
+class ListQueryCountTests(TestCase):
+    def test_list_view_query_counts_do_not_grow(self):
+        # More rows than a page, so the large render also builds its next link
+        call_command('check_list_queries', rows=25, baseline_rows=2, stdout=StringIO())
+
+
+class ParseDayTests(TestCase):
+    def test_parses_iso_dates(self):
+        self.assertEqual(parse_day('2026-02-28').isoformat(), '2026-02-28')
+
+    def test_rejects_missing_and_invalid_dates(self):
+        for value in (None, '', 'yesterday', '2026-02-30'):
+            self.assertIsNone(parse_day(value))
+
+
+class KPITrendTests(TestCase):
+    def test_percentage_change(self):
+        self.assertEqual(compute_trend(150, Decimal('100')), Decimal('50.00'))
+
+    def test_no_trend_without_a_previous_value(self):
+        self.assertIsNone(compute_trend(10, None))
+        self.assertIsNone(compute_trend(10, Decimal('0')))
+
+    def test_no_trend_beyond_the_stored_precision(self):
+        self.assertIsNone(compute_trend(Decimal('50000'), Decimal('0.01')))
+
+
+class DashboardKPITests(TestCase):
+    def test_retired_kpi_rows_are_ignored(self):
+        get_dashboard_kpis()
+        # A row nothing refreshes any more must neither show up nor force a recompute
+        DashboardKPI.objects.create(kpi_type='retired_kpi', value=Decimal('1'))
+        DashboardKPI.objects.filter(kpi_type='retired_kpi').update(last_updated=timezone.now() - timedelta(days=365))
+        DashboardKPI.objects.exclude(kpi_type='retired_kpi').update(value=Decimal('7'))
+
+        kpis = get_dashboard_kpis()
+
+        self.assertNotIn('retired_kpi', kpis)
+        self.assertEqual(kpis['total_vehicles'], 7)
@@ -0,0 +1,121 @@
+"""
+Change versions of the data behind the polled JSON endpoints.
+
+Every resource has a DataVersion row whose counter goes up once after each
+committed transaction that wrote to it. Ordinary saves and deletes bump it
+through analytics.signals. Code that writes with bulk_create, bulk_update or
+update() calls bump_version() itself. The endpoints are wrapped in
+conditional_on(), which builds the ETag and Last-Modified headers from the
+counters with one query and answers ``304 Not Modified`` without calling the
+view while they still match the client's copy.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import DataVersion
+
+# Resource each model's writes change
+VERSIONED_MODELS = {
+    'trips.Trip': 'trips',
+    'vehicles.Vehicle': 'vehicles',
+    'drivers.Driver': 'drivers',
+    'fuel.FuelLog': 'fuel_logs',
+}
+
+
+def _pending(using):
+    connection = transaction.get_connection(using)
+    if not hasattr(connection, 'pending_data_versions'):
+        connection.pending_data_versions = set()
+    return connection.pending_data_versions
+
+
+def _increment(resource, using):
+    now = timezone.now()
+    versions = DataVersion.objects.using(using).filter(resource=resource)
+    if versions.update(version=F('version') + 1, changed_at=now):
+        return
+    try:
+        with transaction.atomic(using=using):
+            DataVersion.objects.using(using).create(resource=resource, version=1, changed_at=now)
+    except IntegrityError:
+        # Another writer created the row first
+        versions.update(version=F('version') + 1, changed_at=now)
+
+
+def _flush(using):
+    pending = _pending(using)
+    while pending:
+        _increment(pending.pop(), using)
+
+
+def bump_version(*resources, using=None):
+    """Move ``resources`` to a new version once the current transaction commits
+
+    Bumping after the commit keeps the counter rows out of the writers' locks,
+    and a transaction that saves many rows still bumps each resource once: the
+    first of its callbacks writes every pending resource.
+    """
+    using = using or router.db_for_write(DataVersion)
+    _pending(using).update(resources)
+    transaction.on_commit(lambda: _flush(using), using=using)
+
+
+def current_versions(resources):
+    """{resource: (version, changed_at)} of ``resources`` that were ever bumped"""
+    rows = DataVersion.objects.filter(resource__in=resources).values_list('resource', 'version', 'changed_at')
+    return {resource: (version, changed_at) for resource, version, changed_at in rows}
+
+
+def current_minute(request=None):
+    """Now, rounded down to the minute, for views whose window slides with the clock"""
+    return timezone.now().replace(second=0, microsecond=0)
+
+
+def start_of_today(request=None):
+    """Local midnight, for views that compare against today's date"""
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def conditional_on(*resources, as_of=None):
+    """Serve GET requests of a view with validators built from ``resources``' versions
+
+    ``as_of(request)`` returns the moment the view's clock-dependent inputs
+    last moved (such as ``start_of_today``); it is folded into both headers so
+    the response also changes when the clock does.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            versions = current_versions(resources)
+            parts = [f'{resource}:{versions.get(resource, (0, None))[0]}' for resource in resources]
+            moments = [changed_at for _, changed_at in versions.values()]
+            if as_of is not None:
+                moment = as_of(request)
+                parts.append(moment.isoformat())
+                moments.append(moment)
+            etag = quote_etag(hashlib.sha1(';'.join(parts).encode()).hexdigest())
+            last_modified = int(max(moments).timestamp()) if moments else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.headers.setdefault('ETag', etag)
+                if last_modified is not None:
+                    response.headers.setdefault('Last-Modified', http_date(last_modified))
+                # Make browsers revalidate every poll instead of guessing a lifetime
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
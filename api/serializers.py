@@ -0,0 +1,201 @@
+"""
+Serializers of the REST API.
+
+Relations are written as primary keys and read back beside a display field
+(``vehicle`` and ``vehicle_plate``) that the viewsets' select_related
+querysets load in the same query. On reads, ``?fields=id,status`` trims the
+representation to the listed fields.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from drivers.models import Driver
+from fuel.imports import CENTS
+from fuel.models import Expense, FuelLog, FuelStation
+from maintenance.models import MaintenanceSchedule
+from trips.models import Trip
+from vehicles.models import Vehicle
+
+FIELDS_PARAM = 'fields'
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key relation that first looks in the objects a bulk request preloaded
+
+    The view puts them in the serializer context as
+    ``related_objects[field name][pk]``; keys it did not load fall back to
+    the usual query.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('related_objects', {}).get(self.field_name)
+        if preloaded is not None and not isinstance(data, bool):
+            try:
+                obj = preloaded.get(self.get_queryset().model._meta.pk.to_python(data))
+            except DjangoValidationError:
+                obj = None
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
+
+
+class FleetSerializer(serializers.ModelSerializer):
+    """Base serializer of the API models"""
+
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        requested = request.query_params.get(FIELDS_PARAM)
+        if requested:
+            names = {name.strip() for name in requested.split(',')} | {'id'}
+            fields = {name: field for name, field in fields.items() if name in names}
+        return fields
+
+
+class VehicleSerializer(FleetSerializer):
+    vehicle_type_name = serializers.CharField(source='vehicle_type.name', read_only=True)
+    assigned_driver_name = serializers.CharField(source='assigned_driver.full_name', read_only=True)
+
+    class Meta:
+        model = Vehicle
+        fields = [
+            'id', 'name', 'vehicle_type', 'vehicle_type_name', 'make', 'model', 'year', 'color', 'interior_color',
+            'license_plate', 'vin', 'engine_type', 'fuel_type', 'transmission', 'drive_type',
+            'fuel_efficiency', 'body_type', 'wheelbase', 'gross_vehicle_weight', 'curb_weight',
+            'number_of_doors', 'number_of_seats', 'capacity', 'odometer', 'fuel_capacity', 'status',
+            'purchase_date', 'purchase_cost', 'current_value', 'loan_amount', 'loan_interest_rate',
+            'loan_tenure_months', 'monthly_emi', 'insurance_expiry', 'registration_expiry',
+            'warranty_expiry', 'road_tax_expiry', 'fitness_expiry', 'pollution_expiry',
+            'last_service_date', 'next_service_due', 'current_location', 'assigned_driver', 'assigned_driver_name',
+            'chassis_number', 'engine_number', 'notes', 'is_active', 'created_at', 'updated_at',
+        ]
+        # Status follows trip transitions and maintenance completion
+        read_only_fields = ['status', 'is_active']
+
+
+class DriverSerializer(FleetSerializer):
+    full_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Driver
+        fields = [
+            'id', 'first_name', 'last_name', 'full_name', 'email', 'phone', 'address', 'date_of_birth',
+            'hire_date', 'license_number', 'license_type', 'license_expiry',
+            'status', 'emergency_contact', 'emergency_phone', 'salary', 'is_active', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['is_active']
+
+
+class TripSerializer(FleetSerializer):
+    driver_name = serializers.CharField(source='driver.full_name', read_only=True)
+    vehicle_plate = serializers.CharField(source='vehicle.license_plate', read_only=True)
+
+    class Meta:
+        model = Trip
+        fields = [
+            'id', 'trip_number', 'status', 'origin', 'destination', 'driver', 'driver_name', 'vehicle', 'vehicle_plate',
+            'cargo_weight', 'cargo_description', 'estimated_distance', 'estimated_duration',
+            'actual_distance', 'actual_duration', 'priority', 'start_date', 'end_date',
+            'actual_start_time', 'actual_end_time', 'notes', 'created_at', 'updated_at',
+        ]
+        # Status and actuals only change through the dispatch/start/complete/cancel transitions
+        read_only_fields = ['status', 'actual_distance', 'actual_duration', 'actual_start_time', 'actual_end_time']
+        # The same choices as TripForm
+        extra_kwargs = {
+            'vehicle': {'queryset': Vehicle.objects.filter(status='available', is_active=True)},
+            'driver': {'queryset': Driver.objects.filter(status='on_duty', is_active=True)},
+        }
+
+    def validate_driver(self, driver):
+        if driver.license_expiry <= timezone.now().date():
+            raise serializers.ValidationError("The driver's license has expired.")
+        return driver
+
+    def reassigns(self, attrs):
+        """Whether ``attrs`` change the vehicle or driver of the trip being updated"""
+        return self.instance is not None and any(
+            name in attrs and attrs[name] != getattr(self.instance, name) for name in ('vehicle', 'driver')
+        )
+
+    def validate(self, attrs):
+        if self.reassigns(attrs) and self.instance.status != 'draft':
+            raise serializers.ValidationError(
+                f'Trip {self.instance.trip_number} is {self.instance.get_status_display().lower()}; only draft trips can be reassigned.'
+            )
+        vehicle = attrs.get('vehicle', getattr(self.instance, 'vehicle', None))
+        cargo_weight = attrs.get('cargo_weight', getattr(self.instance, 'cargo_weight', None))
+        if vehicle and cargo_weight and cargo_weight > vehicle.capacity:
+            raise serializers.ValidationError(
+                f'Cargo weight ({cargo_weight} kg) exceeds vehicle capacity ({vehicle.capacity} kg)'
+            )
+        return attrs
+
+
+class FuelLogSerializer(FleetSerializer):
+    vehicle_plate = serializers.CharField(source='vehicle.license_plate', read_only=True)
+    fuel_station_name = serializers.CharField(source='fuel_station.name', read_only=True)
+    driver_name = serializers.CharField(source='driver.full_name', read_only=True)
+
+    class Meta:
+        model = FuelLog
+        fields = [
+            'id', 'vehicle', 'vehicle_plate', 'trip', 'fuel_station', 'fuel_station_name', 'fuel_type',
+            'fuel_liters', 'cost_per_liter', 'total_cost', 'odometer_reading', 'previous_odometer',
+            'distance_traveled', 'fuel_efficiency', 'fuel_date', 'driver', 'driver_name', 'notes',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = ['previous_odometer', 'distance_traveled', 'fuel_efficiency']
+        # The same choices as FuelLogForm
+        extra_kwargs = {
+            'vehicle': {'queryset': Vehicle.objects.filter(is_active=True)},
+            'driver': {'queryset': Driver.objects.filter(is_active=True)},
+            'fuel_station': {'queryset': FuelStation.objects.filter(is_active=True)},
+            'total_cost': {'required': False},
+        }
+
+    def validate(self, attrs):
+        if self.instance is None and 'total_cost' not in attrs:
+            attrs['total_cost'] = (attrs['fuel_liters'] * attrs['cost_per_liter']).quantize(CENTS)
+        return attrs
+
+
+class ExpenseSerializer(FleetSerializer):
+    vehicle_plate = serializers.CharField(source='vehicle.license_plate', read_only=True)
+    driver_name = serializers.CharField(source='driver.full_name', read_only=True)
+
+    class Meta:
+        model = Expense
+        fields = [
+            'id', 'vehicle', 'vehicle_plate', 'driver', 'driver_name', 'trip', 'expense_type', 'description',
+            'amount', 'payment_method', 'expense_date', 'vendor', 'category', 'notes',
+            'is_reimbursable', 'is_approved', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['is_approved']
+        # The same choices as ExpenseForm
+        extra_kwargs = {
+            'vehicle': {'queryset': Vehicle.objects.filter(is_active=True)},
+            'driver': {'queryset': Driver.objects.filter(is_active=True)},
+        }
+
+
+class MaintenanceScheduleSerializer(FleetSerializer):
+    vehicle_plate = serializers.CharField(source='vehicle.license_plate', read_only=True)
+    maintenance_type_name = serializers.CharField(source='maintenance_type.name', read_only=True)
+
+    class Meta:
+        model = MaintenanceSchedule
+        fields = [
+            'id', 'vehicle', 'vehicle_plate', 'maintenance_type', 'maintenance_type_name', 'title', 'description',
+            'priority', 'status', 'scheduled_date', 'estimated_duration_hours', 'estimated_cost',
+            'actual_duration_hours', 'actual_cost', 'odometer_reading', 'performed_by', 'notes',
+            'created_at', 'updated_at',
+        ]
+        # Completion goes through MaintenanceSchedule.complete_maintenance
+        read_only_fields = ['status', 'actual_duration_hours', 'actual_cost']
@@ -0,0 +1,14 @@
+from rest_framework.routers import DefaultRouter
+from . import views
+
+app_name = 'api'
+
+router = DefaultRouter()
+router.register('vehicles', views.VehicleViewSet, basename='vehicle')
+router.register('drivers', views.DriverViewSet, basename='driver')
+router.register('trips', views.TripViewSet, basename='trip')
+router.register('fuel-logs', views.FuelLogViewSet, basename='fuel_log')
+router.register('expenses', views.ExpenseViewSet, basename='expense')
+router.register('maintenance', views.MaintenanceScheduleViewSet, basename='maintenance')
+
+urlpatterns = router.urls
@@ -0,0 +1,217 @@
+"""
+Viewsets of the REST API.
+
+Every collection pages with cursors in a fixed order and takes ``?fields=``
+to trim the representation and ``?search=`` to match through the search
+index. Its ``bulk/`` route creates (POST) or partially updates (PATCH, each
+item carrying its ``id``) up to MAX_BULK_ITEMS objects in one transaction:
+either every item is saved, or none is and the 400 response lists each
+item's errors in request order. Objects the items refer to are loaded with
+one query per relation rather than one per item.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.response import Response
+from drivers.models import Driver
+from fuel.imports import write_fuel_logs
+from fuel.models import Expense, FuelLog
+from maintenance.models import MaintenanceSchedule
+from search.index import filter_by_search, index_objects
+from trips.models import Trip
+from trips.numbering import allocate_trip_numbers
+from vehicles.models import Vehicle
+from .serializers import (
+    DriverSerializer, ExpenseSerializer, FuelLogSerializer, MaintenanceScheduleSerializer,
+    PreloadedPrimaryKeyRelatedField, TripSerializer, VehicleSerializer,
+)
+
+MAX_BULK_ITEMS = 500
+
+
+class SearchIndexFilter(BaseFilterBackend):
+    """``?search=`` through the full-text index, on viewsets with a ``search_kind``"""
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get('search', '').strip()
+        if query and view.search_kind:
+            return filter_by_search(queryset, view.search_kind, query)
+        return queryset
+
+
+class BulkModelViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.CreateModelMixin,
+                       mixins.UpdateModelMixin, viewsets.GenericViewSet):
+    """List, retrieve, create and update, one object at a time or in bulk"""
+
+    filter_backends = [DjangoFilterBackend, SearchIndexFilter]
+    search_kind = None
+    related_objects = None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.related_objects is not None:
+            context['related_objects'] = self.related_objects
+        return context
+
+    def creation_kwargs(self):
+        """Values set on every object this request creates"""
+        if any(field.name == 'created_by' for field in self.queryset.model._meta.fields):
+            return {'created_by': self.request.user}
+        return {}
+
+    def perform_create(self, serializer):
+        serializer.save(**self.creation_kwargs())
+
+    def _bulk_items(self):
+        items = self.request.data
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValidationError('Expected a list of objects.')
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValidationError(f'At most {MAX_BULK_ITEMS} objects can be sent at once.')
+        return items
+
+    def _preload_related(self, items):
+        """Load the objects ``items`` refer to, one query per relation field"""
+        self.related_objects = {}
+        for name, field in self.get_serializer().fields.items():
+            if field.read_only or not isinstance(field, PreloadedPrimaryKeyRelatedField):
+                continue
+            queryset = field.get_queryset()
+            keys = set()
+            for item in items:
+                try:
+                    keys.add(queryset.model._meta.pk.to_python(item.get(name)))
+                except DjangoValidationError:
+                    pass
+            keys.discard(None)
+            self.related_objects[name] = queryset.in_bulk(keys)
+
+    def _save_all(self, save):
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            raise ValidationError('The objects conflict with each other or with existing ones.')
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """Create every object in the request body, or none of them"""
+        items = self._bulk_items()
+        self._preload_related(items)
+        serializer = self.get_serializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        instances = self._save_all(lambda: self.perform_bulk_create(serializer))
+        return Response(self.get_serializer(instances, many=True).data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, serializer):
+        """Save the validated objects of a bulk create and return them"""
+        return serializer.save(**self.creation_kwargs())
+
+    @bulk.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        """Apply every partial update in the request body, or none of them"""
+        items = self._bulk_items()
+        pk_field = self.queryset.model._meta.pk
+        keys = []
+        for item in items:
+            try:
+                keys.append(pk_field.to_python(item.get('id')))
+            except DjangoValidationError:
+                keys.append(None)
+        instances = self.get_queryset().in_bulk([key for key in keys if key is not None])
+        self._preload_related(items)
+
+        serializers = []
+        errors = []
+        seen = set()
+        for item, key in zip(items, keys):
+            if key not in instances:
+                errors.append({'id': ['No object has this id.']})
+            elif key in seen:
+                errors.append({'id': ['This id appears more than once.']})
+            else:
+                seen.add(key)
+                serializer = self.get_serializer(instances[key], data=item, partial=True)
+                errors.append({} if serializer.is_valid() else serializer.errors)
+                serializers.append(serializer)
+        if any(errors):
+            raise ValidationError(errors)
+
+        self._save_all(lambda: [self.perform_update(serializer) for serializer in serializers])
+        return Response([serializer.data for serializer in serializers])
+
+
+class VehicleViewSet(BulkModelViewSet):
+    queryset = Vehicle.objects.select_related('vehicle_type', 'assigned_driver').order_by('-created_at', '-id')
+    serializer_class = VehicleSerializer
+    filterset_fields = ['status', 'vehicle_type', 'fuel_type', 'is_active']
+    search_kind = 'vehicle'
+
+
+class DriverViewSet(BulkModelViewSet):
+    queryset = Driver.objects.order_by('last_name', 'first_name', 'id')
+    serializer_class = DriverSerializer
+    filterset_fields = ['status', 'license_type', 'is_active']
+    search_kind = 'driver'
+
+
+class TripViewSet(BulkModelViewSet):
+    queryset = Trip.objects.select_related('driver', 'vehicle').order_by('-created_at', '-id')
+    serializer_class = TripSerializer
+    filterset_fields = ['status', 'priority', 'vehicle', 'driver']
+    search_kind = 'trip'
+
+    def perform_bulk_create(self, serializer):
+        # One sequence update numbers the whole batch
+        items = serializer.validated_data
+        if items:
+            for attrs, trip_number in zip(items, allocate_trip_numbers(len(items))):
+                attrs['trip_number'] = trip_number
+        return super().perform_bulk_create(serializer)
+
+    def perform_update(self, serializer):
+        # Lock the row the transitions lock, so a trip dispatched since validation is not reassigned
+        with transaction.atomic():
+            if serializer.reassigns(serializer.validated_data):
+                status = Trip.objects.select_for_update().values_list('status', flat=True).get(pk=serializer.instance.pk)
+                if status != 'draft':
+                    raise ValidationError(f'Trip {serializer.instance.trip_number} is no longer a draft and cannot be reassigned.')
+            super().perform_update(serializer)
+
+
+class FuelLogViewSet(BulkModelViewSet):
+    queryset = FuelLog.objects.select_related('vehicle', 'fuel_station', 'driver').order_by('-fuel_date', '-id')
+    serializer_class = FuelLogSerializer
+    filterset_fields = ['vehicle', 'driver', 'trip', 'fuel_station', 'fuel_type']
+    search_kind = 'fuellog'
+
+    def perform_bulk_create(self, serializer):
+        # Without primary keys back from a bulk insert the new logs could not be returned
+        if not connections[router.db_for_write(FuelLog)].features.can_return_rows_from_bulk_insert:
+            return super().perform_bulk_create(serializer)
+
+        # Chain and insert the batch the way fuel-card imports do, instead of saving log by log
+        logs = [FuelLog(**attrs, **self.creation_kwargs()) for attrs in serializer.validated_data]
+        write_fuel_logs(logs, {})
+        index_objects('fuellog', [log.pk for log in logs])
+        return logs
+
+
+class ExpenseViewSet(BulkModelViewSet):
+    queryset = Expense.objects.select_related('vehicle', 'driver').order_by('-expense_date', '-id')
+    serializer_class = ExpenseSerializer
+    filterset_fields = ['expense_type', 'payment_method', 'vehicle', 'driver', 'trip', 'is_approved']
+    search_kind = 'expense'
+
+
+class MaintenanceScheduleViewSet(BulkModelViewSet):
+    queryset = MaintenanceSchedule.objects.select_related('vehicle', 'maintenance_type').order_by('scheduled_date', 'id')
+    serializer_class = MaintenanceScheduleSerializer
+    filterset_fields = ['status', 'priority', 'vehicle', 'maintenance_type']
+    search_kind = 'maintenance'
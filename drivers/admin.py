@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Driver, DriverPerformance, DriverDocument, DriverAttendance
+from .models import Driver, DriverPerformance, DriverDocument, DriverAttendance, PerformanceRecompute
 
 
 class DriverPerformanceInline(admin.TabularInline):
@@ -82,3 +82,9 @@ class DriverAttendanceAdmin(admin.ModelAdmin):
     search_fields = ('driver__first_name', 'driver__last_name')
     readonly_fields = ('created_at', 'updated_at')
     date_hierarchy = 'date'
+
+
+@admin.register(PerformanceRecompute)
+class PerformanceRecomputeAdmin(admin.ModelAdmin):
+    list_display = ('started_at', 'finished_at', 'full', 'drivers_checked', 'drivers_updated')
+    list_filter = ('full',)
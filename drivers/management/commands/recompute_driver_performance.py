@@ -0,0 +1,26 @@
+import time
+from django.core.management.base import BaseCommand
+from drivers.performance import recompute_performance, refresh_performance
+
+
+class Command(BaseCommand):
+    help = 'Rebuild driver performance counters from trip and fuel history (incrementally by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every driver instead of those touched since the last run')
+        parser.add_argument('--drivers', nargs='+', type=int, help='Recompute only these driver ids (not recorded as a run)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['drivers']:
+            updated = recompute_performance(options['drivers'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Updated {updated} of {len(options["drivers"])} drivers in {time.perf_counter() - started:.2f}s'
+            ))
+            return
+
+        run = refresh_performance(full=options['full'])
+        scope = 'all drivers' if run.full else f'{run.drivers_checked} drivers touched since the last run'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {scope}, updated {run.drivers_updated} in {time.perf_counter() - started:.2f}s'
+        ))
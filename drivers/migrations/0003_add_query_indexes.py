@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0002_driver_profile_picture'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driver',
+            index=models.Index(fields=['last_name', 'first_name', 'is_active'], name='driver_name_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driver',
+            index=models.Index(fields=['status', 'is_active'], name='driver_status_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driver',
+            index=models.Index(fields=['license_expiry', 'is_active'], name='driver_license_active_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0003_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerformanceRecompute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('full', models.BooleanField(default=False)),
+                ('drivers_checked', models.PositiveIntegerField(blank=True, help_text='Drivers touched since the previous run (incremental runs)', null=True)),
+                ('drivers_updated', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Performance Recompute',
+                'verbose_name_plural': 'Performance Recomputes',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
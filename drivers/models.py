@@ -43,6 +43,11 @@ class Driver(models.Model):
         verbose_name = "Driver"
         verbose_name_plural = "Drivers"
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['last_name', 'first_name', 'is_active'], name='driver_name_active_idx'),
+            models.Index(fields=['status', 'is_active'], name='driver_status_active_idx'),
+            models.Index(fields=['license_expiry', 'is_active'], name='driver_license_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -117,19 +122,28 @@ class DriverPerformance(models.Model):
             return Decimal('0.00')
         return self.total_distance / self.total_fuel_consumed
     
-    def update_performance(self, trip_completed=True, distance=0, fuel_consumed=0):
-        """Update driver performance after a trip"""
-        self.total_trips += 1
-        if trip_completed:
-            self.completed_trips += 1
-            self.total_distance += Decimal(str(distance))
-            self.total_fuel_consumed += Decimal(str(fuel_consumed))
-            self.last_trip_date = timezone.now().date()
-        else:
-            self.cancelled_trips += 1
-        
-        # Recalculate completion rate
-        self.save()
+    def recompute(self):
+        """Rebuild this driver's trip and fuel figures from history"""
+        from .performance import HISTORY_FIELDS, recompute_performance
+        recompute_performance([self.driver_id])
+        self.refresh_from_db(fields=HISTORY_FIELDS + ['updated_at'])
+
+
+class PerformanceRecompute(models.Model):
+    """A run of drivers.performance.refresh_performance; the latest start time is the next watermark"""
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    full = models.BooleanField(default=False)
+    drivers_checked = models.PositiveIntegerField(null=True, blank=True, help_text="Drivers touched since the previous run (incremental runs)")
+    drivers_updated = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Performance Recompute"
+        verbose_name_plural = "Performance Recomputes"
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"{'Full' if self.full else 'Incremental'} recompute at {self.started_at:%Y-%m-%d %H:%M}"
 
 
 class DriverDocument(models.Model):
@@ -0,0 +1,132 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from decimal import Decimal
+from .models import DriverPerformance, PerformanceRecompute
+
+# DriverPerformance fields derived from trip and fuel history; the rest
+# (safety score, ratings, incidents, bonus) are maintained by hand
+HISTORY_FIELDS = ['total_trips', 'completed_trips', 'cancelled_trips', 'total_distance', 'total_fuel_consumed', 'last_trip_date']
+
+CENTS = Decimal('0.01')
+
+
+def _empty_figures():
+    return {
+        'total_trips': 0,
+        'completed_trips': 0,
+        'cancelled_trips': 0,
+        'total_distance': Decimal('0.00'),
+        'total_fuel_consumed': Decimal('0.00'),
+        'last_trip_date': None,
+    }
+
+
+def performance_figures(driver_ids=None):
+    """{driver_id: {field: value}} for HISTORY_FIELDS, from two grouped queries
+
+    Finished trips count towards total_trips; completed trips add their
+    actual distance. Fuel logs count for their driver, or for the driver
+    of their trip when no driver was recorded.
+    """
+    from fuel.models import FuelLog
+    from trips.models import Trip
+
+    completed = Q(status='completed')
+    trips = Trip.objects.filter(status__in=['completed', 'cancelled'])
+    logs = FuelLog.objects.annotate(fuel_driver=Coalesce(F('driver_id'), F('trip__driver_id'))).filter(fuel_driver__isnull=False)
+    if driver_ids is not None:
+        trips = trips.filter(driver_id__in=driver_ids)
+        logs = logs.filter(fuel_driver__in=driver_ids)
+
+    figures = {}
+    trip_rows = trips.order_by().values('driver_id').annotate(
+        finished=Count('id'),
+        completed=Count('id', filter=completed),
+        distance=Sum('actual_distance', filter=completed),
+        last_trip=Max('end_date', filter=completed),
+    )
+    for row in trip_rows:
+        values = figures.setdefault(row['driver_id'], _empty_figures())
+        values['total_trips'] = row['finished']
+        values['completed_trips'] = row['completed']
+        values['cancelled_trips'] = row['finished'] - row['completed']
+        values['total_distance'] = (row['distance'] or Decimal('0')).quantize(CENTS)
+        values['last_trip_date'] = timezone.localtime(row['last_trip']).date() if row['last_trip'] else None
+
+    for driver_id, liters in logs.order_by().values('fuel_driver').annotate(liters=Sum('fuel_liters')).values_list('fuel_driver', 'liters'):
+        figures.setdefault(driver_id, _empty_figures())['total_fuel_consumed'] = (liters or Decimal('0')).quantize(CENTS)
+
+    return figures
+
+
+def recompute_performance(driver_ids=None, batch_size=1000):
+    """Rebuild the history fields of DriverPerformance, for all drivers or ``driver_ids``
+
+    The result only depends on the stored history, so running it again is
+    harmless. Only rows whose figures changed are written. Returns the
+    number of rows updated or created.
+    """
+    figures = performance_figures(driver_ids)
+    performances = DriverPerformance.objects.only('id', 'driver_id', *HISTORY_FIELDS)
+    if driver_ids is not None:
+        performances = performances.filter(driver_id__in=driver_ids)
+
+    now = timezone.now()
+    changed = []
+    for performance in performances.iterator(chunk_size=batch_size):
+        values = figures.pop(performance.driver_id, None) or _empty_figures()
+        if all(getattr(performance, field) == value for field, value in values.items()):
+            continue
+        for field, value in values.items():
+            setattr(performance, field, value)
+        performance.updated_at = now
+        changed.append(performance)
+
+    # Drivers with history but no performance row yet
+    created = [DriverPerformance(driver_id=driver_id, **values) for driver_id, values in figures.items()]
+
+    with transaction.atomic():
+        DriverPerformance.objects.bulk_update(changed, HISTORY_FIELDS + ['updated_at'], batch_size=batch_size)
+        DriverPerformance.objects.bulk_create(created, batch_size=batch_size, ignore_conflicts=True)
+    return len(changed) + len(created)
+
+
+def drivers_touched_since(since):
+    """Ids of drivers whose trips or fuel logs were saved at or after ``since``
+
+    Deleted rows and trips moved to another driver leave no trace for the
+    previous driver; a periodic full recompute picks those up.
+    """
+    from fuel.models import FuelLog
+    from trips.models import Trip
+
+    driver_ids = set(Trip.objects.filter(updated_at__gte=since).values_list('driver_id', flat=True))
+    for driver_id, trip_driver_id in FuelLog.objects.filter(updated_at__gte=since).values_list('driver_id', 'trip__driver_id'):
+        driver_ids.add(driver_id or trip_driver_id)
+    driver_ids.discard(None)
+    return driver_ids
+
+
+def refresh_performance(full=False):
+    """Recompute drivers touched since the last run, or everyone when ``full``
+
+    The start time of the previous run is the watermark, so changes saved
+    while that run was in progress are picked up again. The first run is
+    always full.
+    """
+    started_at = timezone.now()
+    last_run = PerformanceRecompute.objects.order_by('-started_at').first()
+    full = full or last_run is None
+
+    driver_ids = None if full else drivers_touched_since(last_run.started_at)
+    updated = recompute_performance(driver_ids) if full or driver_ids else 0
+
+    return PerformanceRecompute.objects.create(
+        started_at=started_at,
+        finished_at=timezone.now(),
+        full=full,
+        drivers_checked=None if full else len(driver_ids),
+        drivers_updated=updated,
+    )
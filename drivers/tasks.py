@@ -0,0 +1,9 @@
+from celery import shared_task
+from .performance import refresh_performance
+
+
+@shared_task
+def refresh_performance_task(full=False):
+    """Recompute driver performance for drivers touched since the last run (schedule nightly)"""
+    run = refresh_performance(full=full)
+    return run.drivers_updated
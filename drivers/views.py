@@ -4,12 +4,14 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q, Count, Avg
+from django.db.models import Count, Avg
 from django.http import JsonResponse
 from django.utils import timezone
 from datetime import timedelta
 from .models import Driver, DriverPerformance, DriverDocument, DriverAttendance
 from .forms import DriverForm, DriverDocumentForm, DriverAttendanceForm
+from analytics.versions import conditional_on, start_of_today
+from search.index import filter_by_search
 
 
 class DriverListView(LoginRequiredMixin, ListView):
@@ -19,17 +21,12 @@ class DriverListView(LoginRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = Driver.objects.filter(is_active=True)
+        queryset = Driver.objects.filter(is_active=True).select_related('performance')
         
         # Search functionality
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(email__icontains=search_query) |
-                Q(license_number__icontains=search_query)
-            )
+            queryset = filter_by_search(queryset, 'driver', search_query)
         
         # Filter by status
         status_filter = self.request.GET.get('status', '')
@@ -170,6 +167,7 @@ def driver_attendance_view(request, pk):
 
 
 @login_required
+@conditional_on('drivers', as_of=start_of_today)
 def get_available_drivers(request):
     """API endpoint to get available drivers for trip assignment"""
     drivers = Driver.objects.filter(
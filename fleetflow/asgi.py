@@ -2,6 +2,8 @@
 ASGI config for fleetflow project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``uvicorn fleetflow.asgi:application``) for the /live/ event
+streams, which hold a connection open per client.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
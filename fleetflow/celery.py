@@ -0,0 +1,16 @@
+"""
+Celery application for fleetflow.
+
+Workers are started with ``celery -A fleetflow worker``. Set
+CELERY_TASK_ALWAYS_EAGER=True to run tasks in-process (tests, local dev).
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fleetflow.settings')
+
+app = Celery('fleetflow')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -0,0 +1,130 @@
+"""
+Per-request SQL profiling.
+
+QueryProfileMiddleware records every query a request runs and reports the
+count, total SQL time, repeated statements and slowest queries as a
+``Server-Timing`` header and a ``fleetflow`` log record. It runs for every
+request when QUERY_PROFILER_ENABLED is set, and for staff users who send
+the QUERY_PROFILER_HEADER request header otherwise.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('fleetflow')
+
+
+class QueryProfile:
+    """Queries run on every database connection while installed as an execute wrapper"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, repr(params), (time.perf_counter() - started) * 1000))
+
+    @property
+    def sql_ms(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def duplicates(self):
+        """[(sql, times)] for statements run more than once with the same parameters"""
+        counts = Counter((sql, params) for sql, params, _ in self.queries)
+        return [(sql, times) for (sql, _), times in counts.most_common() if times > 1]
+
+    def slowest(self, limit):
+        return sorted(((duration, sql) for sql, _, duration in self.queries), reverse=True)[:limit]
+
+
+def query_budget(request):
+    """(max queries, max SQL milliseconds) for the request's URL name or longest matching path prefix"""
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    budget = dict(getattr(settings, 'QUERY_BUDGET_DEFAULT', {}))
+
+    view_name = request.resolver_match.view_name if request.resolver_match else None
+    if view_name in budgets:
+        budget.update(budgets[view_name])
+    else:
+        prefixes = [key for key in budgets if key.startswith('/') and request.path.startswith(key)]
+        if prefixes:
+            budget.update(budgets[max(prefixes, key=len)])
+    return budget.get('queries'), budget.get('sql_ms')
+
+
+class QueryProfileMiddleware:
+    """Report per-request query counts and SQL time, warning when a view exceeds its budget"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_PROFILER_ENABLED', False)
+        self.header = 'HTTP_' + getattr(settings, 'QUERY_PROFILER_HEADER', 'X-Query-Profile').upper().replace('-', '_')
+        self.slowest = getattr(settings, 'QUERY_PROFILER_SLOWEST', 5)
+
+    def should_profile(self, request):
+        if self.enabled:
+            return True
+        if self.header not in request.META:
+            return False
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_authenticated and user.is_staff)
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profile = QueryProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        self.report(request, response, profile, total_ms)
+        return response
+
+    def report(self, request, response, profile, total_ms):
+        duplicates = profile.duplicates()
+        duplicated = sum(times - 1 for _, times in duplicates)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={profile.sql_ms:.1f};desc="{len(profile.queries)} queries"',
+            f'dbdup;desc="{duplicated} duplicated"',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': len(profile.queries),
+            'sql_ms': round(profile.sql_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'duplicated': duplicated,
+            'duplicates': [{'sql': sql, 'times': times} for sql, times in duplicates[:self.slowest]],
+            'slowest': [{'sql': sql, 'ms': round(duration, 1)} for duration, sql in profile.slowest(self.slowest)],
+        }
+        logger.info('Query profile %s', json.dumps(record), extra={'query_profile': record})
+
+        max_queries, max_sql_ms = query_budget(request)
+        over = []
+        if max_queries is not None and len(profile.queries) > max_queries:
+            over.append(f'{len(profile.queries)} queries (budget {max_queries})')
+        if max_sql_ms is not None and profile.sql_ms > max_sql_ms:
+            over.append(f'{profile.sql_ms:.1f}ms SQL (budget {max_sql_ms}ms)')
+        if over:
+            logger.warning(
+                'Query budget exceeded by %s %s: %s', request.method, view_name or request.path, ', '.join(over),
+                extra={'query_profile': record},
+            )
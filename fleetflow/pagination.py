@@ -0,0 +1,211 @@
+"""
+Keyset (cursor) pagination for long lists.
+
+Offset pagination counts every matching row and skips all earlier rows to
+reach a page, so deep pages get slower the further in they are. A keyset
+page starts after the ordering values of the previous page's last row
+(``WHERE fuel_date < ... OR (fuel_date = ... AND id < ...)``), which an
+index on the ordering columns answers directly at any depth. Rows inserted
+while someone pages through never shift the pages after their cursor.
+
+Cursors are signed tokens holding those ordering values. Counts are exact
+up to COUNT_LIMIT; past it they are the database's row estimate for an
+unfiltered list, or COUNT_LIMIT as a lower bound.
+"""
+
+from decimal import Decimal
+
+from django.core import signing
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_PARAM = 'cursor'
+
+CURSOR_SALT = 'fleetflow.pagination.cursor'
+
+# Matching rows counted exactly before falling back to an estimate
+COUNT_LIMIT = 10000
+
+
+def _encode(value):
+    # isoformat keeps microseconds, which the cursor must match exactly
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def estimated_row_count(model, using='default'):
+    """The database's own estimate of the rows in ``model``'s table, or None where it keeps none"""
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'mysql':
+        sql = 'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s'
+    elif connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class KeysetPaginator:
+    """Pages of ``queryset`` in its own ordering, with the primary key added as the final tie-breaker
+
+    The ordering must name concrete fields of the model itself (no
+    relations or expressions), and they should not be nullable.
+    """
+
+    def __init__(self, queryset, per_page, count_limit=COUNT_LIMIT):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_limit = count_limit
+        self.ordering = self._ordering()
+
+    def _ordering(self):
+        """[(field name, descending)]"""
+        meta = self.queryset.model._meta
+        ordering = []
+        for entry in self.queryset.query.order_by or meta.ordering:
+            if not isinstance(entry, str) or '__' in entry or entry == '?':
+                raise ValueError(f'Keyset pagination needs plain field ordering, not {entry!r}')
+            name = entry.lstrip('-')
+            ordering.append((meta.pk.name if name == 'pk' else meta.get_field(name).name, entry.startswith('-')))
+        if not ordering or ordering[-1][0] != meta.pk.name:
+            ordering.append((meta.pk.name, ordering[0][1] if ordering else False))
+        return ordering
+
+    def _order_by(self, reverse=False):
+        return [f'{"-" if descending != reverse else ""}{name}' for name, descending in self.ordering]
+
+    def _beyond(self, values, reverse=False):
+        """Rows after ``values`` in the ordering, or before them when ``reverse``"""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        # The redundant bound on the first column lets the database range-scan its index
+        name, descending = self.ordering[0]
+        return Q(**{f'{name}__{"lte" if descending != reverse else "gte"}': values[0]}) & condition
+
+    def cursor(self, obj, direction):
+        values = [_encode(getattr(obj, name)) for name, _ in self.ordering]
+        return signing.dumps({'d': direction, 'v': values}, salt=CURSOR_SALT)
+
+    def decode(self, cursor):
+        """(direction, ordering values) of a cursor; (None, None) for a missing or unusable one"""
+        if not cursor:
+            return None, None
+        try:
+            payload = signing.loads(cursor, salt=CURSOR_SALT)
+            direction, values = payload['d'], payload['v']
+            if direction not in ('next', 'previous') or len(values) != len(self.ordering):
+                return None, None
+            meta = self.queryset.model._meta
+            return direction, [meta.get_field(name).to_python(value) for (name, _), value in zip(self.ordering, values)]
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None, None
+
+    def _page_queryset(self, values, backwards):
+        queryset = self.queryset.order_by(*self._order_by(reverse=backwards))
+        if values is not None:
+            queryset = queryset.filter(self._beyond(values, reverse=backwards))
+        return queryset[:self.per_page + 1]
+
+    def page_queryset(self, cursor=None):
+        """The query page() runs for ``cursor``, one row longer than a page so it can tell whether more follow"""
+        direction, values = self.decode(cursor)
+        return self._page_queryset(values, direction == 'previous')
+
+    def page(self, cursor=None):
+        """The page after (or before) ``cursor``; the first page without one"""
+        direction, values = self.decode(cursor)
+        backwards = direction == 'previous'
+
+        rows = list(self._page_queryset(values, backwards))
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=more)
+        return KeysetPage(rows, self, has_next=more, has_previous=values is not None)
+
+    @cached_property
+    def _count(self):
+        queryset = self.queryset.order_by()
+        capped = queryset[:self.count_limit + 1].count()
+        if capped <= self.count_limit:
+            return capped, True
+        estimate = None if queryset.query.where else estimated_row_count(queryset.model, queryset.db)
+        return max(estimate or 0, self.count_limit), False
+
+    @property
+    def count(self):
+        """Matching rows; see count_is_exact"""
+        return self._count[0]
+
+    @property
+    def count_is_exact(self):
+        """False when count is the database's estimate or a lower bound"""
+        return self._count[1]
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, with cursors for its neighbours"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next and bool(object_list)
+        self._has_previous = has_previous and bool(object_list)
+        self.next_cursor = paginator.cursor(object_list[-1], 'next') if self._has_next else None
+        self.previous_cursor = paginator.cursor(object_list[0], 'previous') if self._has_previous else None
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+def _link(request, cursor):
+    query = request.GET.copy()
+    query.pop('page', None)
+    query.pop(CURSOR_PARAM, None)
+    if cursor:
+        query[CURSOR_PARAM] = cursor
+    return f'?{query.urlencode()}'
+
+
+def keyset_page(request, queryset, per_page):
+    """The page of ``queryset`` named by the request's cursor, with first/previous/next links keeping its other parameters"""
+    page = KeysetPaginator(queryset, per_page).page(request.GET.get(CURSOR_PARAM))
+    page.first_link = _link(request, None)
+    page.previous_link = _link(request, page.previous_cursor) if page.previous_cursor else None
+    page.next_link = _link(request, page.next_cursor) if page.next_cursor else None
+    return page
+
+
+class KeysetPaginationMixin:
+    """ListView mixin that pages with cursors instead of page numbers"""
+
+    def paginate_queryset(self, queryset, page_size):
+        page = keyset_page(self.request, queryset, page_size)
+        return page.paginator, page, page.object_list, page.has_other_pages()
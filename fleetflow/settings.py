@@ -54,6 +54,9 @@ INSTALLED_APPS = [
     'fuel',
     'drivers',
     'analytics',
+    'search',
+    'api',
+    'live',
 ]
 
 MIDDLEWARE = [
@@ -64,6 +67,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'fleetflow.middleware.QueryProfileMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_ratelimit.middleware.RatelimitMiddleware',
 ]
@@ -175,8 +179,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetCursorPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.NamespaceVersioning',
+    'ALLOWED_VERSIONS': ['v1'],
 }
 
 # CORS Settings
@@ -200,6 +206,51 @@ DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@fleetflow.com
 RATELIMIT_ENABLE = config('RATELIMIT_ENABLE', default=True, cast=bool)
 RATELIMIT_USE_CACHE = 'default'
 
+# Dashboard KPI snapshots (seconds before the dashboard recomputes stale KPIs itself)
+KPI_SNAPSHOT_MAX_AGE = config('KPI_SNAPSHOT_MAX_AGE', default=3600, cast=int)
+
+# Report data cache ('django', 'file', or empty to disable)
+REPORT_CACHE_BACKEND = config('REPORT_CACHE_BACKEND', default='django')
+REPORT_CACHE_ALIAS = 'default'
+REPORT_CACHE_TIMEOUT = config('REPORT_CACHE_TIMEOUT', default=7 * 24 * 3600, cast=int)
+REPORT_CACHE_DIR = config('REPORT_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'reports'))
+
+# Seconds a queued or running report may go without progress before it can be generated again
+REPORT_STALE_AFTER = config('REPORT_STALE_AFTER', default=3600, cast=int)
+
+# Per-request SQL profiling: always on when enabled, otherwise for staff
+# requests carrying QUERY_PROFILER_HEADER
+QUERY_PROFILER_ENABLED = config('QUERY_PROFILER_ENABLED', default=False, cast=bool)
+QUERY_PROFILER_HEADER = 'X-Query-Profile'
+QUERY_PROFILER_SLOWEST = 5
+
+# Query budgets (max queries / SQL milliseconds) for profiled requests, by
+# URL name or path prefix; exceeding one logs a warning
+QUERY_BUDGET_DEFAULT = {
+    'queries': config('QUERY_BUDGET_QUERIES', default=50, cast=int),
+    'sql_ms': config('QUERY_BUDGET_SQL_MS', default=500, cast=int),
+}
+QUERY_BUDGETS = {
+    'drivers:driver_list': {'queries': 10},
+    'fuel:fuel_log_list': {'queries': 10},
+    'maintenance:maintenance_list': {'queries': 10},
+    '/dashboard/reports/': {'sql_ms': 5000},
+}
+
+# Live dispatch streams: a Redis URL shares events between processes,
+# empty keeps them within the process that made the change
+LIVE_BROKER_URL = config('LIVE_BROKER_URL', default='')
+LIVE_CHANNEL = 'fleetflow-live'
+LIVE_HEARTBEAT_SECONDS = 15
+LIVE_STREAM_SECONDS = 600
+
+# Celery (background report generation)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+
 # Session Security
 SESSION_COOKIE_SECURE = config('SESSION_COOKIE_SECURE', default=False, cast=lambda v: v.lower() in ('true', '1', 'yes'))
 CSRF_COOKIE_SECURE = config('CSRF_COOKIE_SECURE', default=False, cast=lambda v: v.lower() in ('true', '1', 'yes'))
@@ -30,6 +30,9 @@ urlpatterns = [
     path('maintenance/', include('maintenance.urls')),
     path('fuel/', include('fuel.urls')),
     path('drivers/', include('drivers.urls')),
+    path('search/', include('search.urls')),
+    path('live/', include('live.urls')),
+    path('api/v1/', include('api.urls', namespace='v1')),
     path('captcha/', include('captcha.urls')),
 ]
 
@@ -0,0 +1,125 @@
+from django.db import connection, transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import Lag
+from django.utils import timezone
+from decimal import Decimal
+from analytics.versions import bump_version
+
+# Each vehicle's fuel logs form a chain ordered by (fuel_date, id); a log's
+# distance and efficiency are derived from the odometer of the log before it.
+CHAIN_FIELDS = ['previous_odometer', 'distance_traveled', 'fuel_efficiency']
+
+EFFICIENCY_PLACES = Decimal('0.01')
+
+
+def chain_values(odometer_reading, fuel_liters, previous_odometer):
+    """(previous_odometer, distance_traveled, fuel_efficiency) for a log following ``previous_odometer``"""
+    if previous_odometer is None or not odometer_reading:
+        return None, None, None
+
+    distance = odometer_reading - previous_odometer
+    efficiency = None
+    if distance > 0 and fuel_liters and fuel_liters > 0:
+        efficiency = (distance / fuel_liters).quantize(EFFICIENCY_PLACES)
+    return previous_odometer, distance, efficiency
+
+
+def _chain(vehicle_id):
+    from .models import FuelLog
+    return FuelLog.objects.filter(vehicle_id=vehicle_id)
+
+
+def logs_before(vehicle_id, fuel_date, pk=None):
+    """The chain before a position, nearest first; unsaved logs sort after equal dates"""
+    if pk is None:
+        before = Q(fuel_date__lte=fuel_date)
+    else:
+        before = Q(fuel_date__lt=fuel_date) | Q(fuel_date=fuel_date, pk__lt=pk)
+    # The redundant bound lets the database range-scan fuellog_vehicle_date_idx
+    return _chain(vehicle_id).filter(Q(fuel_date__lte=fuel_date) & before).order_by('-fuel_date', '-pk')
+
+
+def logs_after(vehicle_id, fuel_date, pk):
+    """The chain after a position, nearest first"""
+    after = Q(fuel_date__gt=fuel_date) | Q(fuel_date=fuel_date, pk__gt=pk)
+    return _chain(vehicle_id).filter(Q(fuel_date__gte=fuel_date) & after).order_by('fuel_date', 'pk')
+
+
+def previous_log(vehicle_id, fuel_date, pk=None):
+    """The log directly before a chain position"""
+    return logs_before(vehicle_id, fuel_date, pk).first()
+
+
+def next_log(vehicle_id, fuel_date, pk):
+    """The log directly after a chain position"""
+    return logs_after(vehicle_id, fuel_date, pk).first()
+
+
+def link_log(log, previous_odometer):
+    """Update a saved log's chain fields in place without calling save()"""
+    values = dict(zip(CHAIN_FIELDS, chain_values(log.odometer_reading, log.fuel_liters, previous_odometer)))
+    if all(getattr(log, field) == value for field, value in values.items()):
+        return
+    _chain(log.vehicle_id).filter(pk=log.pk).update(updated_at=timezone.now(), **values)
+    bump_version('fuel_logs')
+
+
+def relink_after(vehicle_id, fuel_date, pk):
+    """Recompute the log following a position from whatever now precedes it"""
+    following = next_log(vehicle_id, fuel_date, pk)
+    if following is None:
+        return
+    previous = previous_log(vehicle_id, following.fuel_date, following.pk)
+    link_log(following, previous.odometer_reading if previous else None)
+
+
+def write_chain_values(updates):
+    """UPDATE many logs' chain fields with one executemany call
+
+    ``bulk_update`` builds a CASE expression per row and field, which costs
+    more Python time than the database write itself for large backfills.
+    """
+    from .models import FuelLog
+
+    fields = [FuelLog._meta.get_field(name) for name in CHAIN_FIELDS + ['updated_at']]
+    assignments = ', '.join(f'{connection.ops.quote_name(field.column)} = %s' for field in fields)
+    sql = f'UPDATE {connection.ops.quote_name(FuelLog._meta.db_table)} SET {assignments} WHERE id = %s'
+    params = [
+        [field.get_db_prep_save(value, connection) for field, value in zip(fields, values)] + [pk]
+        for pk, values in updates
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def recompute_chains(vehicle_ids, batch_size=1000, dry_run=False):
+    """Recompute the chain fields of every log of ``vehicle_ids`` with one LAG window query
+
+    Only rows whose stored values differ are written. Returns (scanned, stale).
+    """
+    from .models import FuelLog
+
+    rows = FuelLog.objects.filter(vehicle_id__in=vehicle_ids).annotate(
+        lag_odometer=Window(
+            Lag('odometer_reading'),
+            partition_by=[F('vehicle_id')],
+            order_by=[F('fuel_date').asc(), F('id').asc()],
+        ),
+    ).order_by().values_list('id', 'odometer_reading', 'fuel_liters', 'lag_odometer', *CHAIN_FIELDS)
+
+    scanned = 0
+    updates = []
+    now = timezone.now()
+    for pk, odometer, liters, lag_odometer, *current in rows.iterator(chunk_size=batch_size):
+        scanned += 1
+        values = chain_values(odometer, liters, lag_odometer)
+        if list(values) != current:
+            updates.append((pk, list(values) + [now]))
+
+    if updates and not dry_run:
+        with transaction.atomic():
+            for start in range(0, len(updates), batch_size):
+                write_chain_values(updates[start:start + batch_size])
+            bump_version('fuel_logs')
+
+    return scanned, len(updates)
@@ -171,3 +171,10 @@ class ExpenseFilterForm(forms.Form):
         required=False,
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
     )
+
+
+class FuelCardImportForm(forms.Form):
+    csv_file = forms.FileField(
+        label='Fuel card CSV',
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv'})
+    )
@@ -0,0 +1,224 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import DecimalValidator
+from django.db import transaction
+from django.db.models import DecimalField, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from analytics.versions import bump_version
+from search.index import index_changed_since
+from .efficiency import chain_values, recompute_chains
+from .models import FuelLog, FuelStation
+import csv
+import io
+
+FUEL_CARD_REQUIRED_COLUMNS = ['license_plate', 'fuel_date', 'fuel_liters', 'cost_per_liter', 'odometer_reading']
+FUEL_CARD_OPTIONAL_COLUMNS = ['total_cost', 'station', 'fuel_type', 'notes']
+
+# Parsed rows written per bulk_create transaction
+IMPORT_CHUNK_SIZE = 5000
+
+# Rejected rows kept with their reason; later ones are only counted
+MAX_REPORTED_REJECTIONS = 500
+
+CENTS = Decimal('0.01')
+
+
+class FuelCardImport:
+    """Outcome of a fuel-card import"""
+
+    def __init__(self):
+        self.imported = 0
+        self.rejected_count = 0
+        self.rejected = []
+
+    def reject(self, line, reason):
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REPORTED_REJECTIONS:
+            self.rejected.append((line, reason))
+
+
+def _value(row, column):
+    return (row.get(column) or '').strip()
+
+
+def _parse_decimal(row, column):
+    value = _value(row, column)
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f'{column} "{value}" is not a number')
+    if not number.is_finite() or number < 0:
+        raise ValueError(f'{column} "{value}" must be zero or more')
+    return _check_digits(column, number)
+
+
+def _check_digits(column, number):
+    """``number`` if it fits the FuelLog column's digits, so bulk_create cannot fail on it"""
+    field = FuelLog._meta.get_field(column)
+    try:
+        DecimalValidator(field.max_digits, field.decimal_places)(number)
+    except ValidationError as exc:
+        raise ValueError(f'{column} "{number}": {exc.messages[0]}')
+    return number
+
+
+def _parse_fuel_date(row):
+    value = _value(row, 'fuel_date')
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'fuel_date "{value}" is not a date')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class FuelCardParser:
+    """Turn fuel-card rows into unsaved FuelLogs using in-memory lookup maps"""
+
+    def __init__(self, created_by=None):
+        from vehicles.models import Vehicle
+
+        self.created_by = created_by
+        self.vehicles = {plate.strip().upper(): pk for pk, plate in Vehicle.objects.values_list('id', 'license_plate')}
+        self.stations = {name.strip().lower(): pk for pk, name in FuelStation.objects.values_list('id', 'name')}
+        self.fuel_types = {fuel_type for fuel_type, _ in FuelLog.FUEL_TYPES}
+
+    def parse(self, row):
+        """Build a FuelLog from a row or raise ValueError with the reason"""
+        plate = _value(row, 'license_plate').upper()
+        vehicle_id = self.vehicles.get(plate)
+        if vehicle_id is None:
+            raise ValueError(f'unknown license plate "{plate}"')
+
+        station_name = _value(row, 'station')
+        station_id = self.stations.get(station_name.lower()) if station_name else None
+        if station_name and station_id is None:
+            raise ValueError(f'unknown station "{station_name}"')
+
+        fuel_type = _value(row, 'fuel_type').lower() or 'diesel'
+        if fuel_type not in self.fuel_types:
+            raise ValueError(f'unknown fuel type "{fuel_type}"')
+
+        fuel_liters = _parse_decimal(row, 'fuel_liters')
+        cost_per_liter = _parse_decimal(row, 'cost_per_liter')
+        if _value(row, 'total_cost'):
+            total_cost = _parse_decimal(row, 'total_cost')
+        else:
+            total_cost = _check_digits('total_cost', (fuel_liters * cost_per_liter).quantize(CENTS))
+
+        return FuelLog(
+            vehicle_id=vehicle_id,
+            fuel_station_id=station_id,
+            fuel_type=fuel_type,
+            fuel_liters=fuel_liters,
+            cost_per_liter=cost_per_liter,
+            total_cost=total_cost,
+            odometer_reading=_parse_decimal(row, 'odometer_reading'),
+            fuel_date=_parse_fuel_date(row),
+            notes=_value(row, 'notes'),
+            created_by=self.created_by,
+        )
+
+
+def _latest_readings(vehicle_ids):
+    """{vehicle_id: (fuel_date, odometer_reading)} of each vehicle's latest stored log, in one query"""
+    from vehicles.models import Vehicle
+
+    latest = FuelLog.objects.filter(vehicle_id=OuterRef('pk')).order_by('-fuel_date', '-id')
+    rows = Vehicle.objects.filter(pk__in=vehicle_ids).annotate(
+        last_date=Subquery(latest.values('fuel_date')[:1]),
+        last_odometer=Subquery(latest.values('odometer_reading')[:1], output_field=DecimalField(max_digits=12, decimal_places=2)),
+    ).values_list('pk', 'last_date', 'last_odometer')
+    return {pk: (last_date, last_odometer) for pk, last_date, last_odometer in rows if last_date is not None}
+
+
+def write_fuel_logs(logs, last_readings):
+    """Link a chunk of parsed logs into their vehicle chains and bulk insert them
+
+    ``last_readings`` caches each vehicle's latest (fuel_date, odometer) across
+    chunks. Logs dated before a vehicle's latest stored log are inserted as-is
+    and that vehicle's chain is recomputed afterwards.
+    """
+    unseen = {log.vehicle_id for log in logs} - last_readings.keys()
+    if unseen:
+        last_readings.update(_latest_readings(unseen))
+
+    # Chain order; the stable sort keeps file order for equal dates
+    logs = sorted(logs, key=lambda log: (log.vehicle_id, log.fuel_date))
+    backdated = set()
+
+    for log in logs:
+        last = last_readings.get(log.vehicle_id)
+        if last and log.fuel_date < last[0]:
+            backdated.add(log.vehicle_id)
+            continue
+        log.previous_odometer, log.distance_traveled, log.fuel_efficiency = chain_values(
+            log.odometer_reading, log.fuel_liters, last[1] if last else None
+        )
+        last_readings[log.vehicle_id] = (log.fuel_date, log.odometer_reading)
+
+    with transaction.atomic():
+        FuelLog.objects.bulk_create(logs, batch_size=1000)
+        bump_version('fuel_logs')
+        if backdated:
+            recompute_chains(backdated)
+
+
+def import_fuel_card_rows(rows, created_by=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """Import an iterable of fuel-card dict rows chunk by chunk, rejecting bad rows individually"""
+    started = timezone.now()
+    parser = FuelCardParser(created_by)
+    result = FuelCardImport()
+    last_readings = {}
+    chunk = []
+
+    # Row numbers count the header as row 1
+    rows = iter(rows)
+    line = 1
+    while True:
+        line += 1
+        try:
+            row = next(rows)
+        except StopIteration:
+            break
+        except csv.Error as exc:
+            # The reader cannot resume after a malformed row (e.g. a field over csv.field_size_limit)
+            result.reject(line, f'unreadable row ({exc}); the rest of the file was not imported')
+            break
+
+        try:
+            chunk.append(parser.parse(row))
+        except ValueError as exc:
+            result.reject(line, str(exc))
+            continue
+
+        if len(chunk) >= chunk_size:
+            write_fuel_logs(chunk, last_readings)
+            result.imported += len(chunk)
+            chunk = []
+
+    if chunk:
+        write_fuel_logs(chunk, last_readings)
+        result.imported += len(chunk)
+
+    # bulk_create skips the search signals
+    if result.imported:
+        index_changed_since(started, ['fuellog'])
+    return result
+
+
+def import_fuel_card_csv(binary_file, created_by=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """Stream a fuel-card CSV file (opened in binary mode) into FuelLogs"""
+    reader = csv.DictReader(io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline=''))
+    columns = [column.strip().lower() for column in reader.fieldnames or []]
+    missing = [column for column in FUEL_CARD_REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f'Missing columns: {", ".join(missing)}')
+    reader.fieldnames = columns
+
+    return import_fuel_card_rows(reader, created_by=created_by, chunk_size=chunk_size)
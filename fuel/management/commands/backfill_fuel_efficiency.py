@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from fuel.efficiency import recompute_chains
+from fuel.models import FuelLog
+
+
+class Command(BaseCommand):
+    help = "Recompute every fuel log's distance and efficiency from its vehicle's chain using a LAG window query"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vehicle', type=int, action='append', help='Only recompute these vehicle ids')
+        parser.add_argument('--vehicles-per-query', type=int, default=200, help='Vehicles covered by each window query')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows fetched and written per round-trip')
+        parser.add_argument('--dry-run', action='store_true', help='Count stale rows without writing')
+
+    def handle(self, *args, **options):
+        vehicle_ids = options['vehicle'] or list(
+            FuelLog.objects.order_by('vehicle_id').values_list('vehicle_id', flat=True).distinct()
+        )
+        step = options['vehicles_per_query']
+        scanned = stale = 0
+        started = time.perf_counter()
+
+        for offset in range(0, len(vehicle_ids), step):
+            chunk_scanned, chunk_stale = recompute_chains(
+                vehicle_ids[offset:offset + step],
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+            scanned += chunk_scanned
+            stale += chunk_stale
+
+        elapsed = time.perf_counter() - started
+        action = 'would update' if options['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {scanned} fuel logs for {len(vehicle_ids)} vehicles, {action} {stale} in {elapsed:.1f}s'
+        ))
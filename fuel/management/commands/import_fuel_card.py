@@ -0,0 +1,39 @@
+import csv
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from fuel.imports import IMPORT_CHUNK_SIZE, import_fuel_card_csv
+
+
+class Command(BaseCommand):
+    help = 'Import a fuel-card CSV export into fuel logs, reporting rejected rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with license_plate, fuel_date, fuel_liters, cost_per_liter, odometer_reading columns')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='Rows written per transaction')
+        parser.add_argument('--user', help='Username recorded as the creator of the imported logs')
+
+    def handle(self, *args, **options):
+        created_by = None
+        if options['user']:
+            try:
+                created_by = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Unknown user "{options["user"]}"')
+
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as csv_file:
+                result = import_fuel_card_csv(csv_file, created_by=created_by, chunk_size=options['chunk_size'])
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for line, reason in result.rejected:
+            self.stderr.write(f'Row {line}: {reason}')
+        if result.rejected_count > len(result.rejected):
+            self.stderr.write(f'... and {result.rejected_count - len(result.rejected)} more rejected rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.imported} fuel logs, rejected {result.rejected_count} rows in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fuel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['-expense_date'], name='expense_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['expense_type', '-expense_date'], name='expense_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelbudget',
+            index=models.Index(fields=['-start_date', 'is_active'], name='fuelbudget_start_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuellog',
+            index=models.Index(fields=['-fuel_date'], name='fuellog_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuellog',
+            index=models.Index(fields=['vehicle', '-fuel_date'], name='fuellog_vehicle_date_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fuel', '0002_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='expense_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='expense_type_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='fuellog',
+            name='fuellog_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='fuellog',
+            name='fuellog_vehicle_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['-expense_date', '-id'], name='expense_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['expense_type', '-expense_date', '-id'], name='expense_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuellog',
+            index=models.Index(fields=['-fuel_date', '-id'], name='fuellog_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuellog',
+            index=models.Index(fields=['vehicle', '-fuel_date', '-id'], name='fuellog_vehicle_date_idx'),
+        ),
+    ]
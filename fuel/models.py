@@ -2,6 +2,7 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from decimal import Decimal
+from .efficiency import chain_values, link_log, next_log, previous_log, relink_after
 
 
 class FuelStation(models.Model):
@@ -96,6 +97,10 @@ class FuelLog(models.Model):
         verbose_name = "Fuel Log"
         verbose_name_plural = "Fuel Logs"
         ordering = ['-fuel_date']
+        indexes = [
+            models.Index(fields=['-fuel_date', '-id'], name='fuellog_date_idx'),
+            models.Index(fields=['vehicle', '-fuel_date', '-id'], name='fuellog_vehicle_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.vehicle.name} - {self.fuel_liters}L - ${self.total_cost}"
@@ -105,23 +110,35 @@ class FuelLog(models.Model):
         if self.fuel_liters and self.cost_per_liter and not self.total_cost:
             self.total_cost = self.fuel_liters * self.cost_per_liter
         
-        # Calculate distance and efficiency if odometer is provided
-        if self.odometer_reading:
-            # Get previous fuel log for this vehicle
-            previous_log = FuelLog.objects.filter(
-                vehicle=self.vehicle,
-                fuel_date__lt=self.fuel_date
-            ).order_by('-fuel_date').first()
-            
-            if previous_log:
-                self.previous_odometer = previous_log.odometer_reading
-                self.distance_traveled = self.odometer_reading - previous_log.odometer_reading
-                
-                # Calculate fuel efficiency
-                if self.distance_traveled > 0 and self.fuel_liters > 0:
-                    self.fuel_efficiency = self.distance_traveled / self.fuel_liters
+        # Position this log held in its vehicle's chain before the save
+        old = None
+        if self.pk:
+            old = FuelLog.objects.filter(pk=self.pk).values('vehicle_id', 'fuel_date', 'odometer_reading').first()
+        
+        # Calculate distance and efficiency from the previous fuel log for this vehicle
+        previous = previous_log(self.vehicle_id, self.fuel_date, self.pk)
+        self.previous_odometer, self.distance_traveled, self.fuel_efficiency = chain_values(
+            self.odometer_reading, self.fuel_liters, previous.odometer_reading if previous else None
+        )
         
         super().save(*args, **kwargs)
+        
+        # Keep the neighbouring logs consistent when the chain changes
+        moved = old is not None and (old['vehicle_id'], old['fuel_date']) != (self.vehicle_id, self.fuel_date)
+        if old is None or moved or old['odometer_reading'] != self.odometer_reading:
+            following = next_log(self.vehicle_id, self.fuel_date, self.pk)
+            if following:
+                link_log(following, self.odometer_reading)
+        if moved:
+            relink_after(old['vehicle_id'], old['fuel_date'], self.pk)
+    
+    def delete(self, *args, **kwargs):
+        vehicle_id, fuel_date, pk = self.vehicle_id, self.fuel_date, self.pk
+        result = super().delete(*args, **kwargs)
+        
+        # The log that followed this one now follows its predecessor
+        relink_after(vehicle_id, fuel_date, pk)
+        return result
 
 
 class Expense(models.Model):
@@ -178,6 +195,10 @@ class Expense(models.Model):
         verbose_name = "Expense"
         verbose_name_plural = "Expenses"
         ordering = ['-expense_date']
+        indexes = [
+            models.Index(fields=['-expense_date', '-id'], name='expense_date_idx'),
+            models.Index(fields=['expense_type', '-expense_date', '-id'], name='expense_type_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.expense_type} - {self.description} - ${self.amount}"
@@ -209,6 +230,9 @@ class FuelBudget(models.Model):
         verbose_name_plural = "Fuel Budgets"
         ordering = ['-start_date']
         unique_together = ['vehicle', 'period', 'start_date']
+        indexes = [
+            models.Index(fields=['-start_date', 'is_active'], name='fuelbudget_start_active_idx'),
+        ]
     
     def __str__(self):
         target = self.vehicle.name if self.vehicle else self.driver.full_name if self.driver else 'Fleet'
@@ -6,8 +6,11 @@ app_name = 'fuel'
 urlpatterns = [
     path('logs/', views.FuelLogListView.as_view(), name='fuel_log_list'),
     path('logs/create/', views.FuelLogCreateView.as_view(), name='fuel_log_create'),
+    path('logs/export/', views.FuelLogExportView.as_view(), name='fuel_log_export'),
+    path('logs/import/', views.FuelLogImportView.as_view(), name='fuel_log_import'),
     path('expenses/', views.ExpenseListView.as_view(), name='expense_list'),
     path('expenses/create/', views.ExpenseCreateView.as_view(), name='expense_create'),
+    path('expenses/export/', views.ExpenseExportView.as_view(), name='expense_export'),
     path('budgets/', views.FuelBudgetListView.as_view(), name='fuel_budget_list'),
     path('budgets/create/', views.FuelBudgetCreateView.as_view(), name='fuel_budget_create'),
     path('dashboard/', views.fuel_dashboard, name='dashboard'),
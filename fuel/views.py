@@ -2,35 +2,37 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, FormView
 from django.urls import reverse_lazy
-from django.db.models import Q, Sum, Avg
+from django.db.models import Count, Sum, Avg
 from django.http import JsonResponse
-from django.utils import timezone
 from datetime import timedelta
 from .models import FuelStation, FuelLog, Expense, FuelBudget
-from .forms import FuelLogForm, ExpenseForm, FuelBudgetForm, FuelStationForm
+from .forms import FuelLogForm, ExpenseForm, FuelBudgetForm, FuelStationForm, FuelCardImportForm
+from .imports import FUEL_CARD_REQUIRED_COLUMNS, FUEL_CARD_OPTIONAL_COLUMNS, import_fuel_card_csv
+from analytics.periods import day_start, parse_day
+from analytics.versions import conditional_on, current_minute
+from analytics.exports import (
+    FUEL_LOG_EXPORT_COLUMNS, EXPENSE_EXPORT_COLUMNS, csv_response, queryset_rows,
+)
+from fleetflow.pagination import KeysetPaginationMixin
+from search.index import filter_by_search
+import csv
 
 
-class FuelLogListView(LoginRequiredMixin, ListView):
+class FuelLogListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = FuelLog
     template_name = 'fuel/fuel_log_list.html'
     context_object_name = 'fuel_logs'
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = FuelLog.objects.all()
+        queryset = FuelLog.objects.select_related('vehicle', 'driver', 'fuel_station')
         
         # Search functionality
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(vehicle__name__icontains=search_query) |
-                Q(vehicle__license_plate__icontains=search_query) |
-                Q(driver__first_name__icontains=search_query) |
-                Q(driver__last_name__icontains=search_query) |
-                Q(fuel_station__name__icontains=search_query)
-            )
+            queryset = filter_by_search(queryset, 'fuellog', search_query)
         
         # Filter by vehicle
         vehicle_filter = self.request.GET.get('vehicle', '')
@@ -38,14 +40,14 @@ class FuelLogListView(LoginRequiredMixin, ListView):
             queryset = queryset.filter(vehicle_id=vehicle_filter)
         
         # Filter by date range
-        start_date = self.request.GET.get('start_date')
-        end_date = self.request.GET.get('end_date')
+        start_date = parse_day(self.request.GET.get('start_date'))
+        end_date = parse_day(self.request.GET.get('end_date'))
         if start_date:
-            queryset = queryset.filter(fuel_date__date__gte=start_date)
+            queryset = queryset.filter(fuel_date__gte=day_start(start_date))
         if end_date:
-            queryset = queryset.filter(fuel_date__date__lte=end_date)
+            queryset = queryset.filter(fuel_date__lt=day_start(end_date + timedelta(days=1)))
         
-        return queryset.order_by('-fuel_date')
+        return queryset.order_by('-fuel_date', '-id')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -54,6 +56,13 @@ class FuelLogListView(LoginRequiredMixin, ListView):
         return context
 
 
+class FuelLogExportView(FuelLogListView):
+    """Stream the filtered fuel log list as CSV"""
+    
+    def get(self, request, *args, **kwargs):
+        return csv_response(queryset_rows(self.get_queryset(), FUEL_LOG_EXPORT_COLUMNS), 'fuel_logs.csv')
+
+
 class FuelLogCreateView(LoginRequiredMixin, CreateView):
     model = FuelLog
     form_class = FuelLogForm
@@ -67,25 +76,47 @@ class FuelLogCreateView(LoginRequiredMixin, CreateView):
         return response
 
 
-class ExpenseListView(LoginRequiredMixin, ListView):
+class FuelLogImportView(LoginRequiredMixin, FormView):
+    """Bulk import fuel logs from a fuel-card CSV file"""
+    form_class = FuelCardImportForm
+    template_name = 'fuel/fuel_card_import.html'
+    success_url = reverse_lazy('fuel:fuel_log_list')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['required_columns'] = FUEL_CARD_REQUIRED_COLUMNS
+        context['optional_columns'] = FUEL_CARD_OPTIONAL_COLUMNS
+        return context
+    
+    def form_valid(self, form):
+        try:
+            result = import_fuel_card_csv(form.cleaned_data['csv_file'].file, created_by=self.request.user)
+        except (UnicodeDecodeError, ValueError, csv.Error) as exc:
+            form.add_error('csv_file', str(exc))
+            return self.form_invalid(form)
+        
+        messages.success(self.request, f'Imported {result.imported} fuel logs.')
+        if not result.rejected_count:
+            return redirect(self.get_success_url())
+        
+        # Show the rejected rows alongside a fresh upload form
+        messages.warning(self.request, f'{result.rejected_count} rows were rejected.')
+        return self.render_to_response(self.get_context_data(form=self.form_class(), result=result))
+
+
+class ExpenseListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Expense
     template_name = 'fuel/expense_list.html'
     context_object_name = 'expenses'
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = Expense.objects.all()
+        queryset = Expense.objects.select_related('vehicle', 'driver', 'trip')
         
         # Search functionality
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(description__icontains=search_query) |
-                Q(vendor__icontains=search_query) |
-                Q(vehicle__name__icontains=search_query) |
-                Q(driver__first_name__icontains=search_query) |
-                Q(driver__last_name__icontains=search_query)
-            )
+            queryset = filter_by_search(queryset, 'expense', search_query)
         
         # Filter by expense type
         type_filter = self.request.GET.get('expense_type', '')
@@ -100,7 +131,7 @@ class ExpenseListView(LoginRequiredMixin, ListView):
         if end_date:
             queryset = queryset.filter(expense_date__lte=end_date)
         
-        return queryset.order_by('-expense_date')
+        return queryset.order_by('-expense_date', '-id')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -108,6 +139,13 @@ class ExpenseListView(LoginRequiredMixin, ListView):
         return context
 
 
+class ExpenseExportView(ExpenseListView):
+    """Stream the filtered expense list as CSV"""
+    
+    def get(self, request, *args, **kwargs):
+        return csv_response(queryset_rows(self.get_queryset(), EXPENSE_EXPORT_COLUMNS), 'expenses.csv')
+
+
 class ExpenseCreateView(LoginRequiredMixin, CreateView):
     model = Expense
     form_class = ExpenseForm
@@ -128,7 +166,7 @@ class FuelBudgetListView(LoginRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = FuelBudget.objects.all()
+        queryset = FuelBudget.objects.select_related('vehicle', 'driver')
         
         # Filter by period
         period_filter = self.request.GET.get('period', '')
@@ -252,21 +290,26 @@ def fuel_efficiency_report(request):
 
 
 @login_required
+@conditional_on('fuel_logs', as_of=current_minute)
 def get_fuel_stats(request):
     """API endpoint to get fuel statistics for dashboard"""
-    from datetime import datetime
-    
-    # Get date range from request
+    # Get date range from request; the window moves by the minute so polls can be answered with 304
     days = int(request.GET.get('days', 30))
-    start_date = timezone.now() - timedelta(days=days)
+    start_date = current_minute(request) - timedelta(days=days)
     
-    fuel_logs = FuelLog.objects.filter(fuel_date__gte=start_date)
+    # Avg skips logs without an efficiency
+    totals = FuelLog.objects.filter(fuel_date__gte=start_date).aggregate(
+        total_logs=Count('id'),
+        total_liters=Sum('fuel_liters'),
+        total_cost=Sum('total_cost'),
+        avg_efficiency=Avg('fuel_efficiency'),
+    )
     
     stats = {
-        'total_logs': fuel_logs.count(),
-        'total_liters': float(fuel_logs.aggregate(total=Sum('fuel_liters'))['total'] or 0),
-        'total_cost': float(fuel_logs.aggregate(total=Sum('total_cost'))['total'] or 0),
-        'avg_efficiency': float(fuel_logs.filter(fuel_efficiency__isnull=False).aggregate(avg=Avg('fuel_efficiency'))['avg'] or 0),
+        'total_logs': totals['total_logs'],
+        'total_liters': float(totals['total_liters'] or 0),
+        'total_cost': float(totals['total_cost'] or 0),
+        'avg_efficiency': float(totals['avg_efficiency'] or 0),
     }
     
     return JsonResponse(stats)
@@ -0,0 +1,150 @@
+"""
+Fan-out of live dispatch events to the open streams.
+
+A message is a JSON list of events, published once per committed
+transaction. The in-process broker hands it to every subscriber of the same
+process; it is enough when one ASGI process serves both the pages that make
+changes and the streams. With several processes (or WSGI workers writing
+and an ASGI server streaming), set LIVE_BROKER_URL to a Redis URL and
+messages go through a Redis pub/sub channel instead.
+
+Subscribers drain their own bounded queue. One that falls behind loses its
+backlog and gets a single RESYNC message, telling the client to re-read the
+stat endpoints rather than apply a partial history.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger('fleetflow')
+
+# Messages a slow subscriber may have waiting before its backlog is dropped
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+RESYNC = json.dumps([{'type': 'resync'}])
+
+
+class InProcessSubscription:
+    def __init__(self, broker, loop):
+        self.broker = broker
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def offer(self, message):
+        """Queue ``message``; runs on the subscriber's event loop"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout):
+        """The next message, or None after ``timeout`` seconds without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Subscribers of this process, each fed on its own event loop"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def publish(self, message):
+        """Send ``message`` to every subscriber; safe to call from any thread"""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # The subscriber's loop has closed without unsubscribing
+                self.unsubscribe(subscription)
+
+    async def subscribe(self):
+        subscription = InProcessSubscription(self, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+class RedisSubscription:
+    def __init__(self, client, pubsub):
+        self.client = client
+        self.pubsub = pubsub
+
+    async def get(self, timeout):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return message['data'].decode() if message else None
+
+    async def close(self):
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBroker:
+    """Messages sent through a Redis pub/sub channel shared by every process"""
+
+    def __init__(self, url, channel):
+        import redis
+
+        self.url = url
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, message):
+        self._client.publish(self.channel, message)
+
+    async def subscribe(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel)
+        return RedisSubscription(client, pubsub)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if settings.LIVE_BROKER_URL:
+                _broker = RedisBroker(settings.LIVE_BROKER_URL, settings.LIVE_CHANNEL)
+            else:
+                _broker = InProcessBroker()
+        return _broker
+
+
+def _send(message):
+    try:
+        get_broker().publish(message)
+    except Exception:
+        # Streams are a convenience; never fail the write that produced the events
+        logger.warning('Could not publish live events', exc_info=True)
+
+
+def publish_on_commit(events):
+    """Publish ``events`` as one message once the current transaction commits"""
+    if events:
+        message = json.dumps(events, default=str)
+        transaction.on_commit(lambda: _send(message))
@@ -0,0 +1,44 @@
+"""
+The status deltas pushed to live dispatch streams.
+
+Each event is a small dict with a ``type`` and the object's ``id``; clients
+apply it to the board they loaded from the JSON endpoints.
+"""
+
+from django.utils import timezone
+from .broker import publish_on_commit
+
+
+def trip_event(trip, previous_status):
+    return {
+        'type': 'trip',
+        'id': trip.pk,
+        'trip_number': trip.trip_number,
+        'status': trip.status,
+        'previous_status': previous_status,
+        'vehicle_id': trip.vehicle_id,
+        'driver_id': trip.driver_id,
+        'at': timezone.now().isoformat(),
+    }
+
+
+def vehicle_event(vehicle_id, status):
+    return {'type': 'vehicle', 'id': vehicle_id, 'status': status}
+
+
+def driver_event(driver_id, on_trip):
+    return {'type': 'driver', 'id': driver_id, 'on_trip': on_trip}
+
+
+def maintenance_event(schedule):
+    return {'type': 'maintenance', 'id': schedule.pk, 'status': schedule.status, 'vehicle_id': schedule.vehicle_id}
+
+
+def publish_trip_change(trip, previous_status, vehicle_status=None, driver_on_trip=None):
+    """Publish a trip transition with the vehicle and driver changes it made"""
+    events = [trip_event(trip, previous_status)]
+    if vehicle_status is not None:
+        events.append(vehicle_event(trip.vehicle_id, vehicle_status))
+    if driver_on_trip is not None:
+        events.append(driver_event(trip.driver_id, driver_on_trip))
+    publish_on_commit(events)
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'live'
+
+urlpatterns = [
+    path('dispatch/', views.dispatch_stream, name='dispatch_stream'),
+]
@@ -0,0 +1,53 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from .broker import get_broker
+
+
+def _is_authenticated(request):
+    return request.user.is_authenticated
+
+
+async def _event_stream(subscription):
+    # Clients load the board after "ready", so no delta can fall between the two
+    yield 'retry: 3000\nevent: ready\ndata: {}\n\n'
+    # Django 4.2 does not notice a client going away mid-stream, so streams
+    # end after LIVE_STREAM_SECONDS and browsers reconnect by themselves
+    deadline = time.monotonic() + settings.LIVE_STREAM_SECONDS
+    try:
+        while time.monotonic() < deadline:
+            message = await subscription.get(settings.LIVE_HEARTBEAT_SECONDS)
+            if message is None:
+                # Keeps proxies from closing an idle connection
+                yield ': keepalive\n\n'
+            else:
+                yield f'event: delta\ndata: {message}\n\n'
+    finally:
+        await subscription.close()
+
+
+async def dispatch_stream(request):
+    """Server-sent events carrying trip, vehicle, driver and maintenance status deltas
+    
+    Needs the ASGI application (uvicorn fleetflow.asgi:application). Under
+    WSGI, Django 4.2 reads an async stream to its end before sending any of
+    it, so nothing would arrive until the stream closed.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(
+            'Live streams need the ASGI server: run uvicorn fleetflow.asgi:application.',
+            status=503, content_type='text/plain',
+        )
+    
+    # Loading the session user queries the database
+    if not await sync_to_async(_is_authenticated)(request):
+        return HttpResponse(status=401)
+    
+    subscription = await get_broker().subscribe()
+    response = StreamingHttpResponse(_event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
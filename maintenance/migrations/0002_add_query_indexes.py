@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['scheduled_date'], name='maint_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['status', 'scheduled_date'], name='maint_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['vehicle', '-scheduled_date'], name='maint_vehicle_date_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0002_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='maintenanceschedule',
+            name='maint_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='maintenanceschedule',
+            name='maint_status_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['scheduled_date', 'id'], name='maint_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['status', 'scheduled_date', 'id'], name='maint_status_date_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from decimal import Decimal
+from live.broker import publish_on_commit
+from live.events import maintenance_event, vehicle_event
 
 
 class MaintenanceType(models.Model):
@@ -59,6 +61,11 @@ class MaintenanceSchedule(models.Model):
         verbose_name = "Maintenance Schedule"
         verbose_name_plural = "Maintenance Schedules"
         ordering = ['scheduled_date']
+        indexes = [
+            models.Index(fields=['scheduled_date', 'id'], name='maint_date_idx'),
+            models.Index(fields=['status', 'scheduled_date', 'id'], name='maint_status_date_idx'),
+            models.Index(fields=['vehicle', '-scheduled_date'], name='maint_vehicle_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.vehicle.name} - {self.title}"
@@ -91,6 +98,7 @@ class MaintenanceSchedule(models.Model):
         self.vehicle.save()
         
         self.save()
+        publish_on_commit([maintenance_event(self), vehicle_event(self.vehicle_id, 'available')])
 
 
 class MaintenancePart(models.Model):
@@ -4,30 +4,26 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q
 from django.utils import timezone
 from .models import MaintenanceType, MaintenanceSchedule, MaintenancePart, MaintenanceDocument, MaintenanceReminder
 from .forms import MaintenanceScheduleForm, MaintenancePartForm, MaintenanceDocumentForm, MaintenanceReminderForm
+from fleetflow.pagination import KeysetPaginationMixin
+from search.index import filter_by_search
 
 
-class MaintenanceListView(LoginRequiredMixin, ListView):
+class MaintenanceListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = MaintenanceSchedule
     template_name = 'maintenance/maintenance_list.html'
     context_object_name = 'maintenance_schedules'
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = MaintenanceSchedule.objects.all()
+        queryset = MaintenanceSchedule.objects.select_related('vehicle', 'maintenance_type')
         
         # Search functionality
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(vehicle__name__icontains=search_query) |
-                Q(vehicle__license_plate__icontains=search_query) |
-                Q(maintenance_type__name__icontains=search_query)
-            )
+            queryset = filter_by_search(queryset, 'maintenance', search_query)
         
         # Filter by status
         status_filter = self.request.GET.get('status', '')
@@ -39,7 +35,7 @@ class MaintenanceListView(LoginRequiredMixin, ListView):
         if priority_filter:
             queryset = queryset.filter(priority=priority_filter)
         
-        return queryset.order_by('scheduled_date')
+        return queryset.order_by('scheduled_date', 'id')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -0,0 +1,347 @@
+"""
+Full-text search over trips, vehicles, drivers, fuel logs, expenses and maintenance.
+
+Every indexed object has one SearchEntry holding its display title and the
+words it can be found by, copied from related rows too (a trip's entry
+carries its driver's name and its vehicle's plate), so a search never joins
+the source tables. SQLite matches against an FTS5 table that triggers keep
+in step with SearchEntry, MySQL against a FULLTEXT index on it; other
+databases fall back to ``icontains`` on the entry table.
+
+Entries follow ordinary saves and deletes through search.signals. Code that
+writes with bulk_create, bulk_update or update() calls index_objects() or
+index_changed_since() itself.
+"""
+
+import re
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import SearchEntry
+
+FTS_TABLE = 'search_searchentry_fts'
+
+# Relative weight of a match in the title over one in the body (FTS5 ranking)
+TITLE_WEIGHT = 5.0
+
+# Query words used; the rest are ignored
+MAX_QUERY_TERMS = 8
+
+INDEX_BATCH_SIZE = 2000
+
+
+def _words(*values):
+    return ' '.join(str(value) for value in values if value)
+
+
+def _subtitle(*values):
+    return ' · '.join(str(value) for value in values if value)
+
+
+def _name(row, prefix):
+    return _words(row[f'{prefix}first_name'], row[f'{prefix}last_name'])
+
+
+def _trip_document(row):
+    return (
+        row['trip_number'],
+        f"{row['origin']} → {row['destination']}",
+        _words(row['origin'], row['destination'], _name(row, 'driver__'), row['vehicle__name'], row['vehicle__license_plate']),
+    )
+
+
+def _vehicle_document(row):
+    return (
+        f"{row['name']} ({row['license_plate']})",
+        _words(row['make'], row['model']),
+        _words(row['make'], row['model'], row['vin']),
+    )
+
+
+def _driver_document(row):
+    return (
+        _name(row, ''),
+        row['license_number'],
+        _words(row['email'], row['license_number']),
+    )
+
+
+def _fuel_log_document(row):
+    fuel_date = timezone.localtime(row['fuel_date']) if timezone.is_aware(row['fuel_date']) else row['fuel_date']
+    return (
+        f"{row['vehicle__name']} ({row['vehicle__license_plate']})",
+        _subtitle(f"{fuel_date:%Y-%m-%d}", row['fuel_station__name'], f"{row['fuel_liters']} L"),
+        _words(row['fuel_station__name'], _name(row, 'driver__'), row['trip__trip_number']),
+    )
+
+
+def _expense_document(row):
+    return (
+        row['description'],
+        _subtitle(f"{row['expense_date']:%Y-%m-%d}", row['vendor']),
+        _words(row['vendor'], row['vehicle__name'], row['vehicle__license_plate'], _name(row, 'driver__')),
+    )
+
+
+def _maintenance_document(row):
+    return (
+        row['title'],
+        _subtitle(row['vehicle__name'], row['maintenance_type__name']),
+        _words(row['vehicle__name'], row['vehicle__license_plate'], row['maintenance_type__name']),
+    )
+
+
+class SearchSource:
+    """How objects of one model become SearchEntry rows of one kind"""
+
+    def __init__(self, model, fields, document, url_name=None):
+        self.model_label = model
+        self.fields = fields
+        self.document = document
+        self.url_name = url_name
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def rows(self, queryset):
+        return queryset.order_by('pk').values('id', *self.fields)
+
+
+SEARCH_SOURCES = {
+    'trip': SearchSource(
+        'trips.Trip',
+        ['trip_number', 'origin', 'destination', 'driver__first_name', 'driver__last_name', 'vehicle__name', 'vehicle__license_plate'],
+        _trip_document, 'trips:trip_detail',
+    ),
+    'vehicle': SearchSource(
+        'vehicles.Vehicle',
+        ['name', 'license_plate', 'make', 'model', 'vin'],
+        _vehicle_document, 'vehicles:vehicle_detail',
+    ),
+    'driver': SearchSource(
+        'drivers.Driver',
+        ['first_name', 'last_name', 'email', 'license_number'],
+        _driver_document, 'drivers:driver_detail',
+    ),
+    'fuellog': SearchSource(
+        'fuel.FuelLog',
+        ['fuel_date', 'fuel_liters', 'vehicle__name', 'vehicle__license_plate', 'fuel_station__name',
+         'driver__first_name', 'driver__last_name', 'trip__trip_number'],
+        _fuel_log_document,
+    ),
+    'expense': SearchSource(
+        'fuel.Expense',
+        ['description', 'vendor', 'expense_date', 'vehicle__name', 'vehicle__license_plate', 'driver__first_name', 'driver__last_name'],
+        _expense_document,
+    ),
+    'maintenance': SearchSource(
+        'maintenance.MaintenanceSchedule',
+        ['title', 'vehicle__name', 'vehicle__license_plate', 'maintenance_type__name'],
+        _maintenance_document, 'maintenance:maintenance_detail',
+    ),
+}
+
+# Identifier columns list views still match by substring, as they did before
+# the index, so a plate's or trip number's tail finds its rows
+IDENTIFIER_FIELDS = {
+    'trip': ['trip_number', 'vehicle__license_plate'],
+    'vehicle': ['license_plate'],
+    'driver': ['license_number'],
+    'fuellog': ['vehicle__license_plate'],
+    'expense': [],
+    'maintenance': ['vehicle__license_plate'],
+}
+
+# Models whose fields are copied into other kinds' entries:
+# model -> (copied fields, [(kind, foreign key to the model)])
+RELATED_SOURCES = {
+    'vehicles.Vehicle': (['name', 'license_plate'], [('trip', 'vehicle'), ('fuellog', 'vehicle'), ('expense', 'vehicle'), ('maintenance', 'vehicle')]),
+    'drivers.Driver': (['first_name', 'last_name'], [('trip', 'driver'), ('fuellog', 'driver'), ('expense', 'driver')]),
+    'fuel.FuelStation': (['name'], [('fuellog', 'fuel_station')]),
+    'maintenance.MaintenanceType': (['name'], [('maintenance', 'maintenance_type')]),
+}
+
+
+def _entry(kind, row):
+    title, subtitle, body = SEARCH_SOURCES[kind].document(row)
+    return SearchEntry(kind=kind, object_id=row['id'], title=title[:255], subtitle=subtitle[:255], body=body)
+
+
+def _write_entries(kind, ids, rows):
+    """Replace the entries of ``ids`` with entries built from ``rows`` (ids without a row lose theirs)"""
+    with transaction.atomic():
+        SearchEntry.objects.filter(kind=kind, object_id__in=ids).delete()
+        SearchEntry.objects.bulk_create([_entry(kind, row) for row in rows])
+
+
+def index_objects(kind, ids, batch_size=INDEX_BATCH_SIZE):
+    """Re-index the objects of ``kind`` with primary keys ``ids``; deleted ones are dropped"""
+    source = SEARCH_SOURCES[kind]
+    ids = list(ids)
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        _write_entries(kind, chunk, source.rows(source.model.objects.filter(pk__in=chunk)))
+
+
+def index_related(model_label, pk):
+    """Re-index every entry that copies fields of the ``model_label`` object ``pk``"""
+    for kind, field in RELATED_SOURCES[model_label][1]:
+        model = SEARCH_SOURCES[kind].model
+        index_objects(kind, model.objects.filter(**{field: pk}).values_list('pk', flat=True))
+
+
+def index_changed_since(since, kinds=None, batch_size=INDEX_BATCH_SIZE):
+    """Re-index objects saved at or after ``since``; returns {kind: objects indexed}"""
+    counts = {}
+    for kind in kinds or SEARCH_SOURCES:
+        model = SEARCH_SOURCES[kind].model
+        ids = model.objects.filter(updated_at__gte=since).values_list('pk', flat=True)
+        counts[kind] = len(ids)
+        index_objects(kind, ids, batch_size)
+    return counts
+
+
+def rebuild_index(kinds=None, batch_size=INDEX_BATCH_SIZE, progress=None):
+    """Re-create every entry of ``kinds`` (all by default) in primary key order
+
+    Entries are replaced batch by batch, so searches keep working while it
+    runs. ``progress(kind, indexed)`` is called after each batch. Returns
+    {kind: objects indexed}.
+    """
+    counts = {}
+    for kind in kinds or SEARCH_SOURCES:
+        source = SEARCH_SOURCES[kind]
+        SearchEntry.objects.filter(kind=kind).exclude(object_id__in=source.model.objects.values('pk')).delete()
+
+        indexed = 0
+        last_pk = 0
+        while True:
+            rows = list(source.rows(source.model.objects.filter(pk__gt=last_pk))[:batch_size])
+            if not rows:
+                break
+            _write_entries(kind, [row['id'] for row in rows], rows)
+            last_pk = rows[-1]['id']
+            indexed += len(rows)
+            if progress:
+                progress(kind, indexed)
+        counts[kind] = indexed
+    return counts
+
+
+_backends = {}
+
+
+def search_backend():
+    """'fts5', 'mysql' or 'basic', for the default database"""
+    if connection.alias not in _backends:
+        if connection.vendor == 'mysql':
+            _backends[connection.alias] = 'mysql'
+        elif connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+            _backends[connection.alias] = 'fts5'
+        else:
+            _backends[connection.alias] = 'basic'
+    return _backends[connection.alias]
+
+
+def query_terms(query):
+    """The lower-cased words of ``query`` that a search matches as prefixes"""
+    return re.findall(r'[^\W_]+', query.lower())[:MAX_QUERY_TERMS]
+
+
+def _fts5_match(terms, kinds):
+    match = '{title body} : (%s)' % ' '.join(f'"{term}"*' for term in terms)
+    if kinds:
+        match = 'kind : (%s) AND %s' % (' OR '.join(f'"{kind}"' for kind in kinds), match)
+    return match
+
+
+def _mysql_against(terms):
+    return ' '.join(f'+{term}*' for term in terms)
+
+
+def _basic_filter(terms):
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(body__icontains=term)
+    return condition
+
+
+def search(query, kinds=None, limit=20):
+    """Best-ranked SearchEntry rows whose title or body has every word of ``query`` as a word prefix
+
+    Each entry gets a ``score``; higher is better.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    kinds = [kind for kind in kinds or [] if kind in SEARCH_SOURCES]
+    backend = search_backend()
+
+    if backend == 'fts5':
+        return list(SearchEntry.objects.raw(
+            f'SELECT e.*, -bm25({FTS_TABLE}, 0.0, %s, 1.0) AS score '
+            f'FROM {FTS_TABLE} JOIN search_searchentry e ON e.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s ORDER BY score DESC LIMIT %s',
+            [TITLE_WEIGHT, _fts5_match(terms, kinds), limit],
+        ))
+
+    if backend == 'mysql':
+        against = _mysql_against(terms)
+        kind_filter = ''
+        if kinds:
+            kind_filter = 'AND kind IN (%s) ' % ', '.join(['%s'] * len(kinds))
+        return list(SearchEntry.objects.raw(
+            'SELECT *, MATCH(title, body) AGAINST (%s IN BOOLEAN MODE) AS score FROM search_searchentry '
+            'WHERE MATCH(title, body) AGAINST (%s IN BOOLEAN MODE) ' + kind_filter +
+            'ORDER BY score DESC LIMIT %s',
+            [against, against, *kinds, limit],
+        ))
+
+    entries = SearchEntry.objects.filter(_basic_filter(terms))
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    entries = list(entries.order_by('kind', 'title')[:limit])
+    for entry in entries:
+        entry.score = None
+    return entries
+
+
+def filter_by_search(queryset, kind, query):
+    """``queryset`` narrowed to the objects whose ``kind`` entries match ``query``
+
+    A query without any word to search for leaves ``queryset`` unfiltered.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return queryset
+    backend = search_backend()
+
+    if backend == 'fts5':
+        ids = RawSQL(
+            f'SELECT e.object_id FROM {FTS_TABLE} JOIN search_searchentry e ON e.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s',
+            [_fts5_match(terms, [kind])],
+        )
+    elif backend == 'mysql':
+        ids = RawSQL(
+            'SELECT object_id FROM search_searchentry WHERE kind = %s AND MATCH(title, body) AGAINST (%s IN BOOLEAN MODE)',
+            [kind, _mysql_against(terms)],
+        )
+    else:
+        ids = SearchEntry.objects.filter(_basic_filter(terms), kind=kind).values('object_id')
+
+    matches = Q(pk__in=ids)
+    for field in IDENTIFIER_FIELDS[kind]:
+        matches |= Q(**{f'{field}__icontains': query.strip()})
+    return queryset.filter(matches)
+
+
+def entry_url(entry):
+    url_name = SEARCH_SOURCES[entry.kind].url_name
+    return reverse(url_name, args=[entry.object_id]) if url_name else None
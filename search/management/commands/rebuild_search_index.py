@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from search.index import SEARCH_SOURCES, index_changed_since, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index, or re-index rows saved since a given time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f'Kinds to index: {", ".join(SEARCH_SOURCES)} (default all)')
+        parser.add_argument('--since', help='Only re-index rows saved at or after this date/time, e.g. "2024-01-31 02:00"')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        unknown = set(options['kinds']) - SEARCH_SOURCES.keys()
+        if unknown:
+            raise CommandError(f'Unknown kinds: {", ".join(sorted(unknown))}')
+        kinds = options['kinds'] or None
+
+        started = time.perf_counter()
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError(f'Cannot parse --since "{options["since"]}"')
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            counts = index_changed_since(since, kinds, batch_size=options['batch_size'])
+        else:
+            counts = rebuild_index(kinds, batch_size=options['batch_size'], progress=self.progress)
+
+        for kind, indexed in counts.items():
+            self.stdout.write(f'{kind}: {indexed} indexed')
+        self.stdout.write(self.style.SUCCESS(f'Indexed {sum(counts.values())} objects in {time.perf_counter() - started:.1f}s'))
+
+    def progress(self, kind, indexed):
+        if indexed % 100000 == 0:
+            self.stdout.write(f'{kind}: {indexed}...')
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:11
+
+from django.db import migrations, models
+
+# SQLite: an external-content FTS5 table over SearchEntry, kept in step by triggers
+SQLITE_FULLTEXT = [
+    "CREATE VIRTUAL TABLE search_searchentry_fts USING fts5("
+    "kind, title, body, content='search_searchentry', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER search_searchentry_ai AFTER INSERT ON search_searchentry BEGIN "
+    "INSERT INTO search_searchentry_fts(rowid, kind, title, body) VALUES (new.id, new.kind, new.title, new.body); END",
+    "CREATE TRIGGER search_searchentry_ad AFTER DELETE ON search_searchentry BEGIN "
+    "INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, kind, title, body) "
+    "VALUES ('delete', old.id, old.kind, old.title, old.body); END",
+    "CREATE TRIGGER search_searchentry_au AFTER UPDATE ON search_searchentry BEGIN "
+    "INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, kind, title, body) "
+    "VALUES ('delete', old.id, old.kind, old.title, old.body); "
+    "INSERT INTO search_searchentry_fts(rowid, kind, title, body) VALUES (new.id, new.kind, new.title, new.body); END",
+]
+
+SQLITE_DROP_FULLTEXT = [
+    "DROP TRIGGER IF EXISTS search_searchentry_ai",
+    "DROP TRIGGER IF EXISTS search_searchentry_ad",
+    "DROP TRIGGER IF EXISTS search_searchentry_au",
+    "DROP TABLE IF EXISTS search_searchentry_fts",
+]
+
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(option == 'ENABLE_FTS5' for option, in cursor.fetchall())
+
+
+def create_fulltext_index(apps, schema_editor):
+    """FTS5 on SQLite, a FULLTEXT index on MySQL; other databases search without one"""
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite' and _sqlite_has_fts5(connection):
+        for statement in SQLITE_FULLTEXT:
+            schema_editor.execute(statement)
+    elif connection.vendor == 'mysql':
+        schema_editor.execute("CREATE FULLTEXT INDEX search_entry_fulltext ON search_searchentry (title, body)")
+
+
+def drop_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        for statement in SQLITE_DROP_FULLTEXT:
+            schema_editor.execute(statement)
+    elif connection.vendor == 'mysql':
+        schema_editor.execute("DROP INDEX search_entry_fulltext ON search_searchentry")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('trip', 'Trip'), ('vehicle', 'Vehicle'), ('driver', 'Driver'), ('fuellog', 'Fuel Log'), ('expense', 'Expense'), ('maintenance', 'Maintenance')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True, help_text='Further words the object can be found by, including related names')),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_kind_object_uniq'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
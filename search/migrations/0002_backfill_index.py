@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:20
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def backfill_index(apps, schema_editor):
+    """Index the rows that existed before the search app, so list searches work right after deploy"""
+    from search.index import SEARCH_SOURCES
+
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    for kind, source in SEARCH_SOURCES.items():
+        model = apps.get_model(source.model_label)
+        last_pk = 0
+        while True:
+            rows = list(source.rows(model.objects.filter(pk__gt=last_pk))[:BATCH_SIZE])
+            if not rows:
+                break
+            entries = []
+            for row in rows:
+                title, subtitle, body = source.document(row)
+                entries.append(SearchEntry(kind=kind, object_id=row['id'], title=title[:255], subtitle=subtitle[:255], body=body))
+            SearchEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            last_pk = rows[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('trips', '0003_tripnumbersequence'),
+        ('vehicles', '0004_add_query_indexes'),
+        ('drivers', '0004_performancerecompute'),
+        ('fuel', '0002_add_query_indexes'),
+        ('maintenance', '0002_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_index, migrations.RunPython.noop),
+    ]
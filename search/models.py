@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """The searchable text of one trip, vehicle, driver, fuel log, expense or maintenance entry"""
+    KIND_CHOICES = [
+        ('trip', 'Trip'),
+        ('vehicle', 'Vehicle'),
+        ('driver', 'Driver'),
+        ('fuellog', 'Fuel Log'),
+        ('expense', 'Expense'),
+        ('maintenance', 'Maintenance'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True, help_text="Further words the object can be found by, including related names")
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Entry"
+        verbose_name_plural = "Search Entries"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_kind_object_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from .index import RELATED_SOURCES, SEARCH_SOURCES, index_objects, index_related
+from .models import SearchEntry
+
+KINDS_BY_MODEL = {source.model_label: kind for kind, source in SEARCH_SOURCES.items()}
+
+
+def update_entry(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects(KINDS_BY_MODEL[sender._meta.label], [instance.pk])
+
+
+def remove_entry(sender, instance, **kwargs):
+    SearchEntry.objects.filter(kind=KINDS_BY_MODEL[sender._meta.label], object_id=instance.pk).delete()
+
+
+def _copied_values(sender, instance):
+    return tuple(getattr(instance, field) for field in RELATED_SOURCES[sender._meta.label][0])
+
+
+def remember_copied_values(sender, instance, raw=False, **kwargs):
+    """Keep the stored values of fields other entries copy, to compare after the save"""
+    if raw or instance._state.adding:
+        return
+    fields = RELATED_SOURCES[sender._meta.label][0]
+    instance._search_copied_values = sender._default_manager.filter(pk=instance.pk).values_list(*fields).first()
+
+
+def update_related_entries(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    if getattr(instance, '_search_copied_values', None) != _copied_values(sender, instance):
+        index_related(sender._meta.label, instance.pk)
+
+
+for model_label in KINDS_BY_MODEL:
+    post_save.connect(update_entry, sender=model_label, dispatch_uid=f'search_update_{model_label}')
+    post_delete.connect(remove_entry, sender=model_label, dispatch_uid=f'search_remove_{model_label}')
+
+for model_label in RELATED_SOURCES:
+    pre_save.connect(remember_copied_values, sender=model_label, dispatch_uid=f'search_remember_{model_label}')
+    post_save.connect(update_related_entries, sender=model_label, dispatch_uid=f'search_related_{model_label}')
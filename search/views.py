@@ -0,0 +1,29 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from .index import SEARCH_SOURCES, entry_url, search
+
+MAX_RESULTS = 100
+
+
+@login_required
+def search_view(request):
+    """API endpoint returning the best matches across trips, vehicles, drivers, fuel logs, expenses and maintenance"""
+    query = request.GET.get('q', '').strip()
+    kinds = [kind for kind in request.GET.getlist('kind') if kind in SEARCH_SOURCES]
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), MAX_RESULTS))
+    except ValueError:
+        limit = 20
+
+    results = [
+        {
+            'kind': entry.kind,
+            'id': entry.object_id,
+            'title': entry.title,
+            'subtitle': entry.subtitle,
+            'url': entry_url(entry),
+            'score': entry.score,
+        }
+        for entry in search(query, kinds, limit)
+    ]
+    return JsonResponse({'query': query, 'results': results})
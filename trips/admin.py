@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Trip, TripExpense, TripCheckpoint, TripDocument
+from .models import Trip, TripExpense, TripCheckpoint, TripDocument, TripNumberSequence
 
 
 class TripExpenseInline(admin.TabularInline):
@@ -76,3 +76,9 @@ class TripDocumentAdmin(admin.ModelAdmin):
     list_filter = ('document_type', 'created_at')
     search_fields = ('trip__trip_number', 'title')
     readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(TripNumberSequence)
+class TripNumberSequenceAdmin(admin.ModelAdmin):
+    list_display = ('day', 'last_number', 'updated_at')
+    readonly_fields = ('updated_at',)
@@ -0,0 +1,196 @@
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Avg
+from django.utils import timezone
+from scipy.optimize import linear_sum_assignment
+from analytics.versions import bump_version
+from search.index import index_objects
+from .transitions import ACTIVE_TRIP_STATUSES
+import numpy as np
+
+# Cost terms, in currency units, of putting a vehicle on a trip
+DEFAULT_FUEL_EFFICIENCY = 5.0  # km per liter when a vehicle has none recorded
+DEFAULT_FUEL_PRICE = 1.5  # per liter when no fuel logs exist for a fuel type
+RELOCATION_COST = 150.0  # vehicle parked somewhere other than the trip origin
+IDLE_CAPACITY_COST = 50.0  # scaled by the share of the vehicle's capacity left empty
+SAFETY_COST = 2.0  # per point of driver safety score below 100
+
+# Subtracted from every cost of a trip so that, when vehicles or drivers run
+# short, urgent trips are matched before low-priority ones
+PRIORITY_BONUS = {'low': 0.0, 'medium': 500.0, 'high': 1000.0, 'urgent': 2000.0}
+
+# Marks an impossible pairing; the solver only picks one when a trip has no
+# feasible partner left, and such matches are discarded
+INFEASIBLE = 1e12
+
+FUEL_PRICE_WINDOW_DAYS = 90
+
+
+class TripAssignment:
+    """A proposed vehicle and driver for a trip"""
+
+    def __init__(self, trip, vehicle, driver, cost):
+        self.trip = trip
+        self.vehicle = vehicle
+        self.driver = driver
+        self.cost = cost
+
+
+def fuel_prices():
+    """{vehicle fuel type: average recent price per liter} in one query"""
+    from fuel.models import FuelLog
+
+    since = timezone.now() - timedelta(days=FUEL_PRICE_WINDOW_DAYS)
+    rows = FuelLog.objects.filter(fuel_date__gte=since).order_by().values('vehicle__fuel_type').annotate(
+        price=Avg('cost_per_liter'),
+    ).values_list('vehicle__fuel_type', 'price')
+    return {fuel_type: float(price) for fuel_type, price in rows}
+
+
+def _location_codes(trip_origins, vehicle_locations):
+    """Integer codes so origin/location equality can be compared as arrays; blanks never match"""
+    codes = {}
+    origins = np.array([codes.setdefault(name.strip().lower(), len(codes)) for name in trip_origins], dtype=np.int64)
+    locations = np.array([
+        codes.setdefault(name.strip().lower(), len(codes)) if name and name.strip() else -1
+        for name in vehicle_locations
+    ], dtype=np.int64)
+    return origins, locations
+
+
+def vehicle_cost_matrix(trips, vehicles, prices):
+    """(trips x vehicles) cost of running each trip with each vehicle
+
+    Fuel for the estimated distance at the vehicle's efficiency and fuel
+    price, plus relocation and idle-capacity penalties. Vehicles too small
+    for the cargo are INFEASIBLE.
+    """
+    cargo = np.array([float(trip.cargo_weight) for trip in trips])
+    distance = np.array([float(trip.estimated_distance) for trip in trips])
+    bonus = np.array([PRIORITY_BONUS.get(trip.priority, 0.0) for trip in trips])
+    capacity = np.array([float(vehicle.capacity) for vehicle in vehicles])
+    efficiency = np.array([float(vehicle.fuel_efficiency or 0) or DEFAULT_FUEL_EFFICIENCY for vehicle in vehicles])
+    price = np.array([prices.get(vehicle.fuel_type, DEFAULT_FUEL_PRICE) for vehicle in vehicles])
+    origins, locations = _location_codes(
+        [trip.origin for trip in trips], [vehicle.current_location for vehicle in vehicles],
+    )
+
+    cost = distance[:, None] * (price / efficiency)[None, :]
+    cost += np.where(origins[:, None] == locations[None, :], 0.0, RELOCATION_COST)
+    safe_capacity = np.where(capacity > 0, capacity, 1.0)
+    cost += IDLE_CAPACITY_COST * np.clip(1.0 - cargo[:, None] / safe_capacity[None, :], 0.0, 1.0)
+    cost -= bonus[:, None]
+    cost[cargo[:, None] > capacity[None, :]] = INFEASIBLE
+    return cost
+
+
+def driver_cost_matrix(trips, drivers):
+    """(trips x drivers) cost of each driver taking each trip
+
+    Drivers with a lower safety score cost more; a license that expires
+    before the trip is due to end is INFEASIBLE.
+    """
+    now = timezone.now()
+    trip_end = np.array([
+        timezone.localtime(
+            trip.end_date or (trip.start_date or now) + timedelta(hours=trip.estimated_duration)
+        ).date().toordinal()
+        for trip in trips
+    ])
+    bonus = np.array([PRIORITY_BONUS.get(trip.priority, 0.0) for trip in trips])
+    license_expiry = np.array([driver.license_expiry.toordinal() for driver in drivers])
+    safety = np.array([
+        float(driver.performance.safety_score) if hasattr(driver, 'performance') else 100.0
+        for driver in drivers
+    ])
+
+    cost = np.broadcast_to(SAFETY_COST * (100.0 - safety)[None, :], (len(trips), len(drivers))).copy()
+    cost -= bonus[:, None]
+    cost[license_expiry[None, :] <= trip_end[:, None]] = INFEASIBLE
+    return cost
+
+
+def _solve(cost):
+    """Row/column pairs of a minimum-cost matching, dropping infeasible pairs"""
+    if not cost.size:
+        return []
+    rows, columns = linear_sum_assignment(cost)
+    feasible = cost[rows, columns] < INFEASIBLE / 2
+    return list(zip(rows[feasible].tolist(), columns[feasible].tolist()))
+
+
+def available_vehicles():
+    from vehicles.models import Vehicle
+
+    return list(Vehicle.objects.filter(status='available', is_active=True).only(
+        'id', 'license_plate', 'capacity', 'fuel_efficiency', 'fuel_type', 'current_location',
+    ))
+
+
+def available_drivers():
+    """On-duty drivers with a valid license who are not on an active trip"""
+    from drivers.models import Driver
+    from .models import Trip
+
+    busy = Trip.objects.filter(status__in=ACTIVE_TRIP_STATUSES).values('driver_id')
+    return list(Driver.objects.filter(
+        status='on_duty', is_active=True, license_expiry__gt=timezone.now().date(),
+    ).exclude(pk__in=busy).select_related('performance').only(
+        'id', 'first_name', 'last_name', 'license_expiry', 'performance__safety_score',
+    ))
+
+
+def assign_trips(trips, vehicles=None, drivers=None):
+    """Match draft trips to distinct vehicles and drivers at minimum total cost
+
+    Vehicles are matched first on the trip x vehicle cost matrix, then the
+    trips that got a vehicle are matched to drivers. Returns
+    (assignments, unassigned trips). Nothing is saved; see apply_assignments().
+    """
+    trips = list(trips)
+    vehicles = available_vehicles() if vehicles is None else list(vehicles)
+    drivers = available_drivers() if drivers is None else list(drivers)
+
+    vehicle_cost = vehicle_cost_matrix(trips, vehicles, fuel_prices()) if trips and vehicles else np.empty((0, 0))
+    with_vehicle = _solve(vehicle_cost)
+
+    matched_trips = [trips[row] for row, _ in with_vehicle]
+    driver_cost = driver_cost_matrix(matched_trips, drivers) if matched_trips and drivers else np.empty((0, 0))
+    with_driver = dict(_solve(driver_cost))
+
+    assignments = []
+    for index, (row, column) in enumerate(with_vehicle):
+        if index not in with_driver:
+            continue
+        driver_column = with_driver[index]
+        cost = vehicle_cost[row, column] + driver_cost[index, driver_column]
+        # Report the real cost, without the priority bonus counted in both matrices
+        cost += 2 * PRIORITY_BONUS.get(trips[row].priority, 0.0)
+        assignments.append(TripAssignment(trips[row], vehicles[column], drivers[driver_column], float(cost)))
+
+    assigned = {assignment.trip.pk for assignment in assignments}
+    return assignments, [trip for trip in trips if trip.pk not in assigned]
+
+
+def apply_assignments(assignments):
+    """Save the proposed vehicle and driver on each still-draft trip with one bulk_update"""
+    from .models import Trip
+
+    now = timezone.now()
+    trips = []
+    for assignment in assignments:
+        trip = assignment.trip
+        trip.vehicle = assignment.vehicle
+        trip.driver = assignment.driver
+        trip.updated_at = now
+        trips.append(trip)
+
+    with transaction.atomic():
+        drafts = set(Trip.objects.select_for_update().filter(
+            pk__in=[trip.pk for trip in trips], status='draft',
+        ).values_list('pk', flat=True))
+        trips = [trip for trip in trips if trip.pk in drafts]
+        Trip.objects.bulk_update(trips, ['vehicle', 'driver', 'updated_at'], batch_size=500)
+        index_objects('trip', [trip.pk for trip in trips])
+        bump_version('trips')
+    return len(trips)
@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from trips.assignment import apply_assignments, assign_trips
+from trips.models import Trip
+from trips.transitions import draft_trip_ids
+
+
+class Command(BaseCommand):
+    help = 'Propose the cheapest vehicle and driver for draft trips, optionally saving them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('trip_ids', nargs='*', type=int, help='Draft trips to assign')
+        parser.add_argument('--all-drafts', action='store_true', help='Assign every draft trip')
+        parser.add_argument('--apply', action='store_true', help='Save the proposed vehicles and drivers on the trips')
+
+    def handle(self, *args, **options):
+        trip_ids = options['trip_ids']
+        if options['all_drafts']:
+            trip_ids = trip_ids + draft_trip_ids()
+        if not trip_ids:
+            raise CommandError('Give trip ids or --all-drafts')
+
+        trips = Trip.objects.filter(pk__in=trip_ids, status='draft')
+        started = time.perf_counter()
+        assignments, unassigned = assign_trips(trips)
+        elapsed = time.perf_counter() - started
+
+        for assignment in assignments:
+            self.stdout.write(
+                f'{assignment.trip.trip_number}: {assignment.vehicle.license_plate} / '
+                f'{assignment.driver.full_name} (cost {assignment.cost:.2f})'
+            )
+        for trip in unassigned:
+            self.stderr.write(f'{trip.trip_number}: no feasible vehicle and driver left')
+
+        total = sum(assignment.cost for assignment in assignments)
+        self.stdout.write(
+            f'Assigned {len(assignments)} of {len(assignments) + len(unassigned)} trips, '
+            f'total cost {total:.2f}, in {elapsed:.2f}s'
+        )
+        if options['apply']:
+            saved = apply_assignments(assignments)
+            self.stdout.write(self.style.SUCCESS(f'Saved assignments on {saved} trips'))
@@ -0,0 +1,75 @@
+import random
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from analytics.benchmarks import seed_fleet
+from trips.assignment import assign_trips, available_drivers, available_vehicles
+from trips.models import Trip
+from vehicles.models import Vehicle
+
+LOCATIONS = ['Depot North', 'Depot South', 'Harbour', 'Airport', 'City Centre', 'Rail Yard', 'Industrial Park', '']
+
+
+class Command(BaseCommand):
+    help = 'Time the trip assignment optimizer on a large synthetic batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trips', type=int, default=2000, help='Draft trips to assign')
+        parser.add_argument('--vehicles', type=int, default=4000, help='Available vehicles (and drivers) to seed')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic fleet')
+        parser.add_argument('--max-seconds', type=float, default=10.0, help='Fail if assignment takes longer')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        fuel_types = [fuel_type for fuel_type, _ in Vehicle.FUEL_TYPE_CHOICES]
+        priorities = [priority for priority, _ in Trip.PRIORITY_CHOICES]
+
+        # Seed inside a transaction that is always rolled back
+        with transaction.atomic():
+            seed_fleet(options['vehicles'], trips_per_vehicle=0, fuel_logs_per_vehicle=0)
+            vehicles = list(Vehicle.objects.filter(name__startswith=f'BENCH{options["vehicles"]}-'))
+            for vehicle in vehicles:
+                vehicle.capacity = Decimal(rng.choice([1000, 3500, 7500, 12000, 26000]))
+                vehicle.fuel_efficiency = Decimal(rng.randint(25, 150)) / 10
+                vehicle.fuel_type = rng.choice(fuel_types)
+                vehicle.current_location = rng.choice(LOCATIONS)
+            Vehicle.objects.bulk_update(vehicles, ['capacity', 'fuel_efficiency', 'fuel_type', 'current_location'], batch_size=500)
+
+            driver = available_drivers()[0]
+            Trip.objects.bulk_create([
+                Trip(
+                    trip_number=f'BA-{i}', origin=rng.choice(LOCATIONS[:-1]), destination='Anywhere',
+                    driver=driver, vehicle=vehicles[0], cargo_weight=Decimal(rng.randint(100, 25000)),
+                    estimated_distance=Decimal(rng.randint(5, 800)), estimated_duration=rng.randint(1, 12),
+                    priority=rng.choice(priorities),
+                )
+                for i in range(options['trips'])
+            ], batch_size=500)
+
+            started = time.perf_counter()
+            trips = list(Trip.objects.filter(trip_number__startswith='BA-'))
+            candidate_vehicles = available_vehicles()
+            candidate_drivers = available_drivers()
+            loaded = time.perf_counter()
+            assignments, unassigned = assign_trips(trips, candidate_vehicles, candidate_drivers)
+            finished = time.perf_counter()
+            transaction.set_rollback(True)
+
+        total_cost = sum(assignment.cost for assignment in assignments)
+        elapsed = finished - started
+        self.stdout.write(
+            f'trips={len(trips)} vehicles={len(candidate_vehicles)} drivers={len(candidate_drivers)} '
+            f'assigned={len(assignments)} unassigned={len(unassigned)} cost={total_cost:.2f}\n'
+            f'load={loaded - started:.2f}s solve={finished - loaded:.2f}s total={elapsed:.2f}s'
+        )
+        if len({assignment.vehicle.pk for assignment in assignments}) != len(assignments):
+            raise CommandError('A vehicle was assigned to more than one trip')
+        if len({assignment.driver.pk for assignment in assignments}) != len(assignments):
+            raise CommandError('A driver was assigned to more than one trip')
+        if any(assignment.trip.cargo_weight > assignment.vehicle.capacity for assignment in assignments):
+            raise CommandError('A trip was assigned a vehicle below its cargo weight')
+        if elapsed > options['max_seconds']:
+            raise CommandError(f'Assignment took {elapsed:.2f}s, limit is {options["max_seconds"]}s')
+
+        self.stdout.write(self.style.SUCCESS('Assignment benchmark finished'))
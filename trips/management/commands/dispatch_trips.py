@@ -0,0 +1,43 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from trips.transitions import dispatch_trips, draft_trip_ids
+
+
+class Command(BaseCommand):
+    help = 'Dispatch many draft trips in one transaction, printing a result per trip'
+
+    def add_arguments(self, parser):
+        parser.add_argument('trip_ids', nargs='*', type=int, help='Trips to dispatch, in order of preference')
+        parser.add_argument('--all-drafts', action='store_true', help='Dispatch every draft trip, most urgent first')
+        parser.add_argument('--user', help='Username recorded as the dispatcher')
+
+    def handle(self, *args, **options):
+        dispatched_by = None
+        if options['user']:
+            try:
+                dispatched_by = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Unknown user "{options["user"]}"')
+
+        trip_ids = options['trip_ids']
+        if options['all_drafts']:
+            trip_ids = trip_ids + draft_trip_ids()
+        if not trip_ids:
+            raise CommandError('Give trip ids or --all-drafts')
+
+        started = time.perf_counter()
+        results = dispatch_trips(trip_ids, dispatched_by=dispatched_by)
+        elapsed = time.perf_counter() - started
+
+        for result in results:
+            label = result['trip_number'] or f'#{result["trip_id"]}'
+            if result['dispatched']:
+                self.stdout.write(f'{label}: dispatched')
+            else:
+                self.stderr.write(f'{label}: {result["error"]}')
+
+        dispatched = sum(1 for result in results if result['dispatched'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Dispatched {dispatched} of {len(results)} trips in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,116 @@
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.utils import timezone
+from drivers.models import Driver, DriverPerformance
+from trips.models import Trip
+from trips.transitions import TripTransitionError, dispatch_trip
+from vehicles.models import Vehicle
+
+STRESS_PREFIX = 'STRESS-DISPATCH-'
+
+
+def seed_contention(workers):
+    """One available vehicle and ``workers`` draft trips for it, each with its own driver"""
+    today = timezone.now().date()
+    vehicle = Vehicle.objects.create(
+        name=f'{STRESS_PREFIX}V', model='Stress', license_plate=f'{STRESS_PREFIX}V',
+        capacity=Decimal('5000'), fuel_capacity=Decimal('200'),
+    )
+    trips = []
+    for i in range(workers):
+        driver = Driver.objects.create(
+            first_name='Stress', last_name=f'{STRESS_PREFIX}{i}', email=f'{STRESS_PREFIX.lower()}{i}@stress.local',
+            phone='+10000000000', address='-', date_of_birth=today.replace(year=1980),
+            hire_date=today, license_number=f'{STRESS_PREFIX}{i}', license_type='Commercial',
+            license_expiry=today + timedelta(days=365), status='on_duty',
+            emergency_contact='-', emergency_phone='-',
+        )
+        trips.append(Trip.objects.create(
+            origin='A', destination='B', driver=driver, vehicle=vehicle,
+            cargo_weight=Decimal('100'), estimated_distance=Decimal('100'), estimated_duration=2,
+        ))
+    return vehicle, trips
+
+
+def remove_contention(vehicle):
+    drivers = Driver.objects.filter(last_name__startswith=STRESS_PREFIX)
+    Trip.objects.filter(vehicle=vehicle).delete()
+    DriverPerformance.objects.filter(driver__in=drivers).delete()
+    drivers.delete()
+    vehicle.delete()
+
+
+class Command(BaseCommand):
+    help = 'Dispatch many draft trips for one vehicle from parallel threads and check only one wins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent dispatcher threads')
+        parser.add_argument('--rounds', type=int, default=5, help='Times to repeat the race')
+
+    def handle(self, *args, **options):
+        if Vehicle.objects.filter(license_plate__startswith=STRESS_PREFIX).exists():
+            raise CommandError(f'Leftover {STRESS_PREFIX} rows found; remove them before running')
+
+        for round_number in range(1, options['rounds'] + 1):
+            vehicle, trips = seed_contention(options['workers'])
+            try:
+                outcome = self.race(trips)
+                self.verify(round_number, vehicle, outcome)
+            finally:
+                remove_contention(vehicle)
+
+        self.stdout.write(self.style.SUCCESS('Exactly one dispatch won every race'))
+
+    def race(self, trips):
+        """Fire one dispatch per trip at once; returns (dispatched pks, refusals, errors, seconds)"""
+        barrier = threading.Barrier(len(trips))
+        dispatched, refused, errors = [], [], []
+
+        def worker(trip):
+            try:
+                barrier.wait()
+                for attempt in range(50):
+                    try:
+                        dispatch_trip(trip)
+                        dispatched.append(trip.pk)
+                        break
+                    except TripTransitionError as exc:
+                        refused.append(str(exc))
+                        break
+                    except OperationalError:
+                        # SQLite has no row locks and reports write contention as a lock timeout
+                        time.sleep(0.01 * (attempt + 1))
+                else:
+                    errors.append('gave up after repeated lock timeouts')
+            except Exception as exc:
+                errors.append(repr(exc))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(trip,)) for trip in trips]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return dispatched, refused, errors, time.perf_counter() - started
+
+    def verify(self, round_number, vehicle, outcome):
+        dispatched, refused, errors, elapsed = outcome
+        stored = list(Trip.objects.filter(vehicle=vehicle, status='dispatched').values_list('pk', flat=True))
+        vehicle.refresh_from_db()
+
+        self.stdout.write(
+            f'round {round_number}: dispatched={len(dispatched)} refused={len(refused)} '
+            f'errors={len(errors)} vehicle={vehicle.status} time={elapsed:.2f}s'
+        )
+        if errors:
+            raise CommandError(f'{len(errors)} dispatchers failed: {errors[0]}')
+        if len(dispatched) != 1 or stored != dispatched:
+            raise CommandError(f'Expected one dispatched trip, got {dispatched} (stored {stored})')
+        if vehicle.status != 'on_trip':
+            raise CommandError(f'Vehicle left {vehicle.status} after the winning dispatch')
@@ -0,0 +1,75 @@
+import random
+import threading
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from trips.models import TripNumberSequence
+from trips.numbering import allocate_trip_numbers, format_trip_number
+
+
+class Command(BaseCommand):
+    help = 'Allocate trip numbers from many concurrent threads and check they are unique and gap-free'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent writer threads')
+        parser.add_argument('--allocations', type=int, default=200, help='Allocations per worker')
+        parser.add_argument('--max-batch', type=int, default=5, help='Largest bulk allocation')
+        parser.add_argument('--day', default='2000-01-01', help='Throwaway sequence day (its counter is deleted afterwards)')
+
+    def handle(self, *args, **options):
+        day = date.fromisoformat(options['day'])
+        if TripNumberSequence.objects.filter(day=day).exists():
+            raise CommandError(f'A trip number sequence already exists for {day}; pick another --day')
+
+        allocated = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            numbers = []
+            try:
+                for _ in range(options['allocations']):
+                    count = random.randint(1, options['max_batch'])
+                    for attempt in range(20):
+                        try:
+                            numbers.extend(allocate_trip_numbers(count, day=day))
+                            break
+                        except OperationalError:
+                            # SQLite serialises writers and may time out under contention
+                            time.sleep(0.01 * (attempt + 1))
+                    else:
+                        raise CommandError('Gave up after repeated lock timeouts')
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+            with lock:
+                allocated.extend(numbers)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['workers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        last_number = TripNumberSequence.objects.get(day=day).last_number
+        TripNumberSequence.objects.filter(day=day).delete()
+
+        if errors:
+            raise CommandError(f'{len(errors)} workers failed: {errors[0]}')
+
+        duplicates = len(allocated) - len(set(allocated))
+        expected = {format_trip_number(day, number) for number in range(1, last_number + 1)}
+        self.stdout.write(
+            f'workers={options["workers"]} numbers={len(allocated)} last={last_number} '
+            f'time={elapsed:.2f}s ({len(allocated) / elapsed:.0f} numbers/s)'
+        )
+        if duplicates:
+            raise CommandError(f'{duplicates} duplicate trip numbers allocated')
+        if set(allocated) != expected:
+            raise CommandError('Allocated numbers do not form a contiguous sequence')
+
+        self.stdout.write(self.style.SUCCESS('All trip numbers unique and contiguous'))
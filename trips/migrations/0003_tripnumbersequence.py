@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0002_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripNumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Trip Number Sequence',
+                'verbose_name_plural': 'Trip Number Sequences',
+                'ordering': ['-day'],
+            },
+        ),
+    ]
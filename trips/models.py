@@ -2,7 +2,8 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from decimal import Decimal
+from .numbering import allocate_trip_numbers
+from . import transitions
 
 User = get_user_model()
 
@@ -75,22 +76,19 @@ class Trip(models.Model):
         verbose_name = "Trip"
         verbose_name_plural = "Trips"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='trip_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='trip_status_created_idx'),
+            models.Index(fields=['status', 'start_date'], name='trip_status_start_idx'),
+            models.Index(fields=['vehicle', '-created_at'], name='trip_vehicle_created_idx'),
+        ]
     
     def __str__(self):
         return f"Trip {self.trip_number} - {self.origin} to {self.destination}"
     
     def save(self, *args, **kwargs):
         if not self.trip_number:
-            # Generate unique trip number
-            from datetime import datetime
-            today = datetime.now().strftime('%Y%m%d')
-            last_trip = Trip.objects.filter(trip_number__startswith=f'TR{today}').order_by('-trip_number').first()
-            if last_trip:
-                last_number = int(last_trip.trip_number[10:])
-                new_number = last_number + 1
-            else:
-                new_number = 1
-            self.trip_number = f"TR{today}{new_number:04d}"
+            self.trip_number = allocate_trip_numbers()[0]
         
         super().save(*args, **kwargs)
     
@@ -121,87 +119,35 @@ class Trip(models.Model):
     
     def can_dispatch(self):
         """Check if trip can be dispatched"""
-        return (
-            self.status == 'draft' and
-            self.driver.is_available and
-            self.vehicle.is_available and
-            float(self.cargo_weight) <= float(self.vehicle.capacity)
-        )
+        return self.status == 'draft' and transitions.dispatch_problem(self) is None
     
     def dispatch(self, dispatched_by=None):
         """Dispatch the trip"""
-        if self.can_dispatch():
-            self.status = 'dispatched'
-            self.dispatched_by = dispatched_by
-            self.start_date = timezone.now()
-            
-            # Update vehicle and driver status
-            self.vehicle.status = 'on_trip'
-            self.vehicle.save()
-            
-            self.save()
-            return True
-        return False
+        return self._transition(transitions.dispatch_trip, dispatched_by=dispatched_by)
     
     def start_trip(self):
         """Mark trip as in progress"""
-        if self.status == 'dispatched':
-            self.status = 'in_progress'
-            self.actual_start_time = timezone.now()
-            self.save()
-            return True
-        return False
+        return self._transition(transitions.start_trip)
     
     def complete_trip(self, actual_distance=None, actual_duration=None):
         """Complete the trip"""
-        if self.status == 'in_progress':
-            self.status = 'completed'
-            self.actual_end_time = timezone.now()
-            self.end_date = timezone.now()
-            
-            if actual_distance is not None:
-                self.actual_distance = actual_distance
-            if actual_duration is not None:
-                self.actual_duration = actual_duration
-            
-            # Update vehicle status
-            self.vehicle.status = 'available'
-            self.vehicle.odometer += Decimal(str(actual_distance or 0))
-            self.vehicle.save()
-            
-            # Update driver performance
-            from drivers.models import DriverPerformance
-            performance, created = DriverPerformance.objects.get_or_create(driver=self.driver)
-            performance.update_performance(
-                trip_completed=True,
-                distance=actual_distance or 0,
-                fuel_consumed=0  # Will be updated from fuel logs
-            )
-            
-            self.save()
-            return True
-        return False
+        return self._transition(
+            transitions.complete_trip,
+            actual_distance=actual_distance,
+            actual_duration=actual_duration
+        )
     
     def cancel_trip(self, reason=''):
         """Cancel the trip"""
-        if self.status in ['draft', 'dispatched']:
-            self.status = 'cancelled'
-            self.cancellation_reason = reason
-            self.end_date = timezone.now()
-            
-            # Update vehicle status if it was on trip
-            if self.vehicle.status == 'on_trip':
-                self.vehicle.status = 'available'
-                self.vehicle.save()
-            
-            # Update driver performance
-            from drivers.models import DriverPerformance
-            performance, created = DriverPerformance.objects.get_or_create(driver=self.driver)
-            performance.update_performance(trip_completed=False)
-            
-            self.save()
-            return True
-        return False
+        return self._transition(transitions.cancel_trip, reason=reason)
+    
+    def _transition(self, apply, **kwargs):
+        """Run a locked transition from trips.transitions, returning whether it happened"""
+        try:
+            apply(self, **kwargs)
+        except transitions.TripTransitionError:
+            return False
+        return True
 
 
 class TripExpense(models.Model):
@@ -280,3 +226,18 @@ class TripDocument(models.Model):
     
     def __str__(self):
         return f"{self.trip.trip_number} - {self.title}"
+
+
+class TripNumberSequence(models.Model):
+    """Last trip number handed out for each day (see trips.numbering)"""
+    day = models.DateField(unique=True)
+    last_number = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Trip Number Sequence"
+        verbose_name_plural = "Trip Number Sequences"
+        ordering = ['-day']
+    
+    def __str__(self):
+        return f"{self.day}: {self.last_number}"
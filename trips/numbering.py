@@ -0,0 +1,45 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+TRIP_NUMBER_PREFIX = 'TR'
+
+
+def format_trip_number(day, number):
+    return f"{TRIP_NUMBER_PREFIX}{day:%Y%m%d}{number:04d}"
+
+
+def _highest_existing_number(day):
+    """Highest number already used on ``day`` by trips created before the sequence existed"""
+    from .models import Trip
+    
+    prefix = f"{TRIP_NUMBER_PREFIX}{day:%Y%m%d}"
+    numbers = Trip.objects.filter(trip_number__startswith=prefix).values_list('trip_number', flat=True)
+    return max((int(number[len(prefix):]) for number in numbers), default=0)
+
+
+def allocate_trip_numbers(count=1, day=None):
+    """Reserve ``count`` consecutive trip numbers for ``day`` and return them
+    
+    The per-day counter is bumped with a single ``UPDATE ... SET last_number =
+    last_number + count``, so concurrent callers never see the same value and
+    no trips are scanned. The first allocation of a day creates the counter row.
+    """
+    from .models import TripNumberSequence
+    
+    day = day or timezone.localdate()
+    sequences = TripNumberSequence.objects.filter(day=day)
+    
+    with transaction.atomic():
+        if not sequences.update(last_number=F('last_number') + count):
+            try:
+                with transaction.atomic():
+                    TripNumberSequence.objects.create(day=day, last_number=_highest_existing_number(day) + count)
+            except IntegrityError:
+                # Another writer created today's row first
+                sequences.update(last_number=F('last_number') + count)
+        
+        last_number = sequences.values_list('last_number', flat=True).get()
+    
+    first_number = last_number - count + 1
+    return [format_trip_number(day, number) for number in range(first_number, last_number + 1)]
@@ -0,0 +1,247 @@
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from decimal import Decimal
+from analytics.versions import bump_version
+from live.broker import publish_on_commit
+from live.events import driver_event, publish_trip_change, trip_event, vehicle_event
+
+# Statuses a trip may move to from each status
+TRIP_TRANSITIONS = {
+    'draft': {'dispatched', 'cancelled'},
+    'dispatched': {'in_progress', 'cancelled'},
+    'in_progress': {'completed'},
+}
+
+ACTIVE_TRIP_STATUSES = ['dispatched', 'in_progress']
+
+
+class TripTransitionError(Exception):
+    """A trip cannot make the requested status change"""
+
+
+def dispatch_problem(trip, vehicle=None, driver=None):
+    """Why ``trip`` cannot be dispatched with its vehicle and driver, or None"""
+    vehicle = vehicle or trip.vehicle
+    driver = driver or trip.driver
+
+    if not driver.is_available:
+        return f'Driver {driver.full_name} is not available.'
+    if not vehicle.is_available:
+        return f'Vehicle {vehicle.license_plate} is not available.'
+    if trip.cargo_weight > vehicle.capacity:
+        return f'Cargo weight exceeds the capacity of {vehicle.license_plate}.'
+    return None
+
+
+def _lock(trip):
+    """Re-read ``trip`` with its vehicle and driver, locking all three rows
+
+    A single ``SELECT ... FOR UPDATE`` over the joined rows takes the locks in
+    one round-trip. Callers wait here for any transition already running on
+    the same trip, vehicle or driver and then validate against committed data.
+    """
+    from .models import Trip
+
+    return Trip.objects.select_for_update().select_related('vehicle', 'driver').get(pk=trip.pk)
+
+
+def _check_transition(locked, target):
+    if target not in TRIP_TRANSITIONS.get(locked.status, ()):
+        raise TripTransitionError(
+            f'Trip {locked.trip_number} is {locked.get_status_display().lower()} and cannot be {target.replace("_", " ")}.'
+        )
+
+
+def _write_trip(trip, now, **fields):
+    """UPDATE the trip row and mirror the change on the caller's instance"""
+    from .models import Trip
+
+    Trip.objects.filter(pk=trip.pk).update(updated_at=now, **fields)
+    bump_version('trips')
+    for name, value in fields.items():
+        setattr(trip, name, value)
+    trip.updated_at = now
+
+
+def _write_vehicle(trip, vehicle_id, now, status, distance=None):
+    from vehicles.models import Vehicle
+
+    fields = {'status': status, 'updated_at': now}
+    if distance:
+        fields['odometer'] = F('odometer') + distance
+    Vehicle.objects.filter(pk=vehicle_id).update(**fields)
+    bump_version('vehicles')
+
+    # Keep an already loaded vehicle in step without another query
+    if 'vehicle' in trip._state.fields_cache:
+        trip.vehicle.status = status
+        trip.vehicle.updated_at = now
+        if distance:
+            trip.vehicle.odometer += distance
+
+
+def _recompute_performance(driver_id):
+    """Rebuild the driver's counters from trip history, so a repeated transition cannot double-count"""
+    from drivers.performance import recompute_performance
+
+    recompute_performance([driver_id])
+
+
+def dispatch_trip(trip, dispatched_by=None):
+    """Move a draft trip to dispatched and put its vehicle on the trip"""
+    from .models import Trip
+
+    with transaction.atomic():
+        locked = _lock(trip)
+        _check_transition(locked, 'dispatched')
+        problem = dispatch_problem(locked, locked.vehicle, locked.driver)
+        if problem:
+            raise TripTransitionError(problem)
+
+        # The driver row lock serialises dispatches of the same driver
+        busy = Trip.objects.filter(driver_id=locked.driver_id, status__in=ACTIVE_TRIP_STATUSES)
+        if busy.exclude(pk=locked.pk).exists():
+            raise TripTransitionError(f'Driver {locked.driver.full_name} is already on an active trip.')
+
+        now = timezone.now()
+        _write_trip(trip, now, status='dispatched', dispatched_by=dispatched_by, start_date=now)
+        _write_vehicle(trip, locked.vehicle_id, now, 'on_trip')
+        publish_trip_change(trip, locked.status, vehicle_status='on_trip', driver_on_trip=True)
+    return trip
+
+
+def start_trip(trip):
+    """Move a dispatched trip to in progress"""
+    with transaction.atomic():
+        locked = _lock(trip)
+        _check_transition(locked, 'in_progress')
+
+        now = timezone.now()
+        _write_trip(trip, now, status='in_progress', actual_start_time=now)
+        publish_trip_change(trip, locked.status)
+    return trip
+
+
+def complete_trip(trip, actual_distance=None, actual_duration=None):
+    """Complete an in-progress trip, release its vehicle and credit the driver"""
+    with transaction.atomic():
+        locked = _lock(trip)
+        _check_transition(locked, 'completed')
+
+        now = timezone.now()
+        distance = Decimal(str(actual_distance or 0))
+        fields = {'status': 'completed', 'actual_end_time': now, 'end_date': now}
+        if actual_distance is not None:
+            fields['actual_distance'] = distance
+        if actual_duration is not None:
+            fields['actual_duration'] = actual_duration
+
+        _write_trip(trip, now, **fields)
+        _write_vehicle(trip, locked.vehicle_id, now, 'available', distance)
+        _recompute_performance(locked.driver_id)
+        publish_trip_change(trip, locked.status, vehicle_status='available', driver_on_trip=False)
+    return trip
+
+
+def cancel_trip(trip, reason=''):
+    """Cancel a draft or dispatched trip, releasing the vehicle if the trip held it"""
+    with transaction.atomic():
+        locked = _lock(trip)
+        _check_transition(locked, 'cancelled')
+
+        now = timezone.now()
+        _write_trip(trip, now, status='cancelled', cancellation_reason=reason, end_date=now)
+        # A draft trip never took the vehicle, which may be out on another trip
+        released = locked.status == 'dispatched' and locked.vehicle.status == 'on_trip'
+        if released:
+            _write_vehicle(trip, locked.vehicle_id, now, 'available')
+        _recompute_performance(locked.driver_id)
+        publish_trip_change(
+            trip, locked.status,
+            vehicle_status='available' if released else None,
+            driver_on_trip=False if locked.status == 'dispatched' else None,
+        )
+    return trip
+
+
+def draft_trip_ids():
+    """Every draft trip, most urgent and then oldest first"""
+    from .models import Trip
+
+    rank = Case(
+        *[When(priority=priority, then=Value(position)) for position, (priority, _) in enumerate(reversed(Trip.PRIORITY_CHOICES))],
+        output_field=IntegerField(),
+    )
+    return list(Trip.objects.filter(status='draft').order_by(rank, 'created_at').values_list('pk', flat=True))
+
+
+def dispatch_trips(trip_ids, dispatched_by=None):
+    """Dispatch many draft trips in one transaction and return a result per requested id
+
+    All candidates are locked and loaded with their vehicles and drivers in one
+    query and validated in memory, in the order given, so two trips competing
+    for a vehicle or driver are settled in favour of the first. The winners
+    are written with two UPDATE statements whatever their number.
+    """
+    from .models import Trip
+    from vehicles.models import Vehicle
+
+    trip_ids = list(dict.fromkeys(int(pk) for pk in trip_ids))
+    results = []
+
+    with transaction.atomic():
+        trips = Trip.objects.select_for_update().select_related('vehicle', 'driver').filter(pk__in=trip_ids).order_by('pk')
+        trips = {trip.pk: trip for trip in trips}
+
+        # Share one vehicle/driver object between trips so claims are seen in memory
+        vehicles = {}
+        drivers = {}
+        for trip in trips.values():
+            trip.vehicle = vehicles.setdefault(trip.vehicle_id, trip.vehicle)
+            trip.driver = drivers.setdefault(trip.driver_id, trip.driver)
+
+        busy_drivers = set(Trip.objects.filter(
+            driver_id__in=drivers, status__in=ACTIVE_TRIP_STATUSES
+        ).values_list('driver_id', flat=True))
+
+        dispatched = []
+        for pk in trip_ids:
+            trip = trips.get(pk)
+            if trip is None:
+                results.append({'trip_id': pk, 'trip_number': None, 'dispatched': False, 'error': 'Trip not found.'})
+                continue
+
+            try:
+                _check_transition(trip, 'dispatched')
+                problem = dispatch_problem(trip)
+                if problem is None and trip.driver_id in busy_drivers:
+                    problem = f'Driver {trip.driver.full_name} is already on an active trip.'
+                if problem:
+                    raise TripTransitionError(problem)
+            except TripTransitionError as exc:
+                results.append({'trip_id': pk, 'trip_number': trip.trip_number, 'dispatched': False, 'error': str(exc)})
+                continue
+
+            trip.vehicle.status = 'on_trip'
+            busy_drivers.add(trip.driver_id)
+            dispatched.append(trip)
+            results.append({'trip_id': pk, 'trip_number': trip.trip_number, 'dispatched': True, 'error': None})
+
+        if dispatched:
+            now = timezone.now()
+            Trip.objects.filter(pk__in=[trip.pk for trip in dispatched]).update(
+                status='dispatched', dispatched_by=dispatched_by, start_date=now, updated_at=now
+            )
+            Vehicle.objects.filter(pk__in={trip.vehicle_id for trip in dispatched}).update(
+                status='on_trip', updated_at=now
+            )
+            bump_version('trips', 'vehicles')
+
+            events = []
+            for trip in dispatched:
+                trip.status = 'dispatched'
+                events += [trip_event(trip, 'draft'), vehicle_event(trip.vehicle_id, 'on_trip'), driver_event(trip.driver_id, True)]
+            publish_on_commit(events)
+
+    return results
@@ -6,6 +6,7 @@ app_name = 'trips'
 urlpatterns = [
     path('', views.TripListView.as_view(), name='trip_list'),
     path('create/', views.TripCreateView.as_view(), name='trip_create'),
+    path('export/', views.TripExportView.as_view(), name='trip_export'),
     path('<int:pk>/edit/', views.TripUpdateView.as_view(), name='trip_edit'),
     path('<int:pk>/delete/', views.TripDeleteView.as_view(), name='trip_delete'),
     path('<int:pk>/', views.trip_detail_view, name='trip_detail'),
@@ -19,4 +20,5 @@ urlpatterns = [
     path('<int:pk>/documents/', views.trip_documents_view, name='trip_documents'),
     path('dashboard/', views.trip_dashboard, name='dashboard'),
     path('api/stats/', views.get_trip_stats, name='api_stats'),
+    path('api/dispatch/', views.trip_bulk_dispatch_view, name='api_bulk_dispatch'),
 ]
@@ -4,35 +4,36 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Count, Sum, Avg
 from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from django.utils import timezone
+from datetime import timedelta
 from django.core.paginator import Paginator
 from .models import Trip, TripExpense, TripCheckpoint, TripDocument
+from .transitions import TripTransitionError, cancel_trip, complete_trip, dispatch_trip, dispatch_trips, start_trip
 from .forms import TripForm, TripExpenseForm, TripCheckpointForm, TripDocumentForm
+from analytics.periods import day_start, parse_day
+from analytics.versions import conditional_on
+from analytics.exports import TRIP_EXPORT_COLUMNS, csv_response, queryset_rows
+from fleetflow.pagination import KeysetPaginationMixin
+from search.index import filter_by_search
+import json
 
 
-class TripListView(LoginRequiredMixin, ListView):
+class TripListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Trip
     template_name = 'trips/trip_list.html'
     context_object_name = 'trips'
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = Trip.objects.all()
+        queryset = Trip.objects.select_related('vehicle', 'driver')
         
         # Search functionality
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(trip_number__icontains=search_query) |
-                Q(origin__icontains=search_query) |
-                Q(destination__icontains=search_query) |
-                Q(driver__first_name__icontains=search_query) |
-                Q(driver__last_name__icontains=search_query) |
-                Q(vehicle__name__icontains=search_query) |
-                Q(vehicle__license_plate__icontains=search_query)
-            )
+            queryset = filter_by_search(queryset, 'trip', search_query)
         
         # Filter by status
         status_filter = self.request.GET.get('status', '')
@@ -45,14 +46,14 @@ class TripListView(LoginRequiredMixin, ListView):
             queryset = queryset.filter(priority=priority_filter)
         
         # Filter by date range
-        start_date = self.request.GET.get('start_date')
-        end_date = self.request.GET.get('end_date')
+        start_date = parse_day(self.request.GET.get('start_date'))
+        end_date = parse_day(self.request.GET.get('end_date'))
         if start_date:
-            queryset = queryset.filter(start_date__date__gte=start_date)
+            queryset = queryset.filter(start_date__gte=day_start(start_date))
         if end_date:
-            queryset = queryset.filter(start_date__date__lte=end_date)
+            queryset = queryset.filter(start_date__lt=day_start(end_date + timedelta(days=1)))
         
-        return queryset.order_by('-created_at')
+        return queryset.order_by('-created_at', '-id')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -61,6 +62,13 @@ class TripListView(LoginRequiredMixin, ListView):
         return context
 
 
+class TripExportView(TripListView):
+    """Stream the filtered trip list as CSV"""
+    
+    def get(self, request, *args, **kwargs):
+        return csv_response(queryset_rows(self.get_queryset(), TRIP_EXPORT_COLUMNS), 'trips.csv')
+
+
 class TripCreateView(LoginRequiredMixin, CreateView):
     model = Trip
     form_class = TripForm
@@ -127,13 +135,11 @@ def trip_detail_view(request, pk):
 def trip_dispatch_view(request, pk):
     trip = get_object_or_404(Trip, pk=pk)
     
-    if trip.can_dispatch():
-        if trip.dispatch(dispatched_by=request.user):
-            messages.success(request, f'Trip "{trip.trip_number}" has been dispatched successfully!')
-        else:
-            messages.error(request, 'Failed to dispatch trip. Please check vehicle and driver availability.')
-    else:
-        messages.error(request, 'This trip cannot be dispatched. Please check all requirements.')
+    try:
+        dispatch_trip(trip, dispatched_by=request.user)
+        messages.success(request, f'Trip "{trip.trip_number}" has been dispatched successfully!')
+    except TripTransitionError as exc:
+        messages.error(request, f'Failed to dispatch trip. {exc}')
     
     return redirect('trips:trip_detail', pk=trip.pk)
 
@@ -142,10 +148,11 @@ def trip_dispatch_view(request, pk):
 def trip_start_view(request, pk):
     trip = get_object_or_404(Trip, pk=pk)
     
-    if trip.start_trip():
+    try:
+        start_trip(trip)
         messages.success(request, f'Trip "{trip.trip_number}" has been started!')
-    else:
-        messages.error(request, 'Failed to start trip.')
+    except TripTransitionError as exc:
+        messages.error(request, f'Failed to start trip. {exc}')
     
     return redirect('trips:trip_detail', pk=trip.pk)
 
@@ -158,14 +165,16 @@ def trip_complete_view(request, pk):
         actual_distance = request.POST.get('actual_distance')
         actual_duration = request.POST.get('actual_duration')
         
-        if trip.complete_trip(
-            actual_distance=float(actual_distance) if actual_distance else None,
-            actual_duration=int(actual_duration) if actual_duration else None
-        ):
+        try:
+            complete_trip(
+                trip,
+                actual_distance=float(actual_distance) if actual_distance else None,
+                actual_duration=int(actual_duration) if actual_duration else None
+            )
             messages.success(request, f'Trip "{trip.trip_number}" has been completed!')
             return redirect('trips:trip_list')  # Redirect to trips list after completion
-        else:
-            messages.error(request, 'Failed to complete trip.')
+        except TripTransitionError as exc:
+            messages.error(request, f'Failed to complete trip. {exc}')
     
     return redirect('trips:trip_detail', pk=trip.pk)
 
@@ -177,10 +186,11 @@ def trip_cancel_view(request, pk):
     if request.method == 'POST':
         reason = request.POST.get('cancellation_reason', '')
         
-        if trip.cancel_trip(reason=reason):
+        try:
+            cancel_trip(trip, reason=reason)
             messages.success(request, f'Trip "{trip.trip_number}" has been cancelled.')
-        else:
-            messages.error(request, 'Failed to cancel trip.')
+        except TripTransitionError as exc:
+            messages.error(request, f'Failed to cancel trip. {exc}')
     
     return redirect('trips:trip_detail', pk=trip.pk)
 
@@ -292,19 +302,49 @@ def trip_dashboard(request):
 
 
 @login_required
+@conditional_on('trips')
 def get_trip_stats(request):
     """API endpoint to get trip statistics for dashboard"""
-    stats = {
-        'total': Trip.objects.count(),
-        'draft': Trip.objects.filter(status='draft').count(),
-        'dispatched': Trip.objects.filter(status='dispatched').count(),
-        'in_progress': Trip.objects.filter(status='in_progress').count(),
-        'completed': Trip.objects.filter(status='completed').count(),
-        'cancelled': Trip.objects.filter(status='cancelled').count(),
-    }
+    counts = dict(Trip.objects.order_by().values_list('status').annotate(count=Count('id')))
+    stats = {'total': sum(counts.values())}
+    for status in ['draft', 'dispatched', 'in_progress', 'completed', 'cancelled']:
+        stats[status] = counts.get(status, 0)
     return JsonResponse(stats)
 
 
+@login_required
+@require_POST
+def trip_bulk_dispatch_view(request):
+    """API endpoint to dispatch many draft trips at once
+    
+    Accepts ``trip_ids`` as a JSON list or repeated form fields and returns
+    one result per trip.
+    """
+    if request.content_type == 'application/json':
+        try:
+            trip_ids = json.loads(request.body).get('trip_ids', [])
+        except (ValueError, AttributeError):
+            return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    else:
+        trip_ids = request.POST.getlist('trip_ids')
+    
+    # A string would be split into one id per character
+    if not isinstance(trip_ids, list):
+        return JsonResponse({'error': 'trip_ids must be a list of trip ids.'}, status=400)
+    try:
+        trip_ids = [int(pk) for pk in trip_ids]
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'trip_ids must be a list of trip ids.'}, status=400)
+    if not trip_ids:
+        return JsonResponse({'error': 'No trip_ids given.'}, status=400)
+    
+    results = dispatch_trips(trip_ids, dispatched_by=request.user)
+    return JsonResponse({
+        'dispatched': sum(1 for result in results if result['dispatched']),
+        'results': results,
+    })
+
+
 @login_required
 def trip_expense_create_view(request, pk):
     """Create a new expense for a specific trip"""
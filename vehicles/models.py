@@ -133,6 +133,10 @@ class Vehicle(models.Model):
         verbose_name = "Vehicle"
         verbose_name_plural = "Vehicles"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'is_active'], name='vehicle_created_active_idx'),
+            models.Index(fields=['status', 'is_active'], name='vehicle_status_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.license_plate})"
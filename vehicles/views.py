@@ -4,10 +4,11 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q
 from django.http import JsonResponse
 from .models import Vehicle, VehicleType, VehicleDocument
 from .forms import VehicleForm, VehicleDocumentForm
+from analytics.versions import conditional_on
+from search.index import filter_by_search
 
 
 class VehicleListView(LoginRequiredMixin, ListView):
@@ -17,16 +18,12 @@ class VehicleListView(LoginRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = Vehicle.objects.filter(is_active=True)
+        queryset = Vehicle.objects.filter(is_active=True).select_related('vehicle_type')
         
         # Search functionality
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(license_plate__icontains=search_query) |
-                Q(model__icontains=search_query)
-            )
+            queryset = filter_by_search(queryset, 'vehicle', search_query)
         
         # Filter by status
         status_filter = self.request.GET.get('status', '')
@@ -143,6 +140,7 @@ def vehicle_document_delete_view(request, document_id):
 
 
 @login_required
+@conditional_on('vehicles')
 def get_available_vehicles(request):
     """API endpoint to get available vehicles for trip assignment"""
     vehicles = Vehicle.objects.filter(